@@ -0,0 +1,56 @@
+# Core Library modules
+import logging
+from pathlib import Path
+from typing import Any
+
+# Third party modules
+import pytest
+
+# First party modules
+from piptools_sync import piptools_sync
+
+# Local modules
+from .synthetic import (
+    TREE_FILES,
+    write_catalog,
+    write_precommit_config,
+    write_requirements,
+)
+
+pytest_plugins = ["piptools_sync.testing"]
+
+
+@pytest.fixture(autouse=True)
+def quiet_logger(monkeypatch: Any) -> None:
+    """Keep the per-repo mismatch lines of the runs off the console."""
+    monkeypatch.setattr(piptools_sync.logger, "level", logging.WARNING)
+    monkeypatch.setattr(piptools_sync.logger, "disabled", False)
+
+
+@pytest.fixture(scope="session")
+def synthetic_project(tmp_path_factory: Any) -> Path:
+    """Return a project with a 1,000 repo config and a 20k line requirements chain.
+
+    The tree also holds ``TREE_FILES`` unrelated files for the file index.
+    """
+    root = tmp_path_factory.mktemp("project")
+    write_precommit_config(root / piptools_sync.PRECOMMIT_CONFIG_FILE)
+    (root / "requirements").mkdir()
+    (root / "requirements.txt").write_text("-r development.txt\n", encoding="utf-8")
+    write_requirements(root / "requirements" / "development.txt")
+    for number in range(TREE_FILES):
+        package = root / "src" / f"package_{number % 50}"
+        package.mkdir(parents=True, exist_ok=True)
+        (package / f"module_{number}.py").write_text("", encoding="utf-8")
+    write_catalog(root / "all-hooks.json")
+    return root
+
+
+@pytest.fixture
+def project(monkeypatch: Any, synthetic_project: Path) -> Path:
+    monkeypatch.setattr(piptools_sync, "ROOT_DIR", synthetic_project)
+    monkeypatch.setattr(
+        piptools_sync, "ROOT_REQUIREMENT", synthetic_project / "requirements.txt"
+    )
+    piptools_sync.get_file_index.cache_clear()
+    return synthetic_project
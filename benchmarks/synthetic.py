@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Synthetic catalogs, configs and requirements files for the benchmarks."""
+
+# Core Library modules
+import hashlib
+from pathlib import Path
+
+# First party modules
+from piptools_sync import fakeserver
+
+CATALOG_REPOS = 10_000
+CONFIG_REPOS = 1_000
+REQUIREMENT_LINES = 20_000
+TREE_FILES = 2_000
+
+
+def write_catalog(path: Path, repos: int = CATALOG_REPOS) -> Path:
+    """Write an all-hooks.json catalog of python hook repositories."""
+    path.write_bytes(fakeserver.build_catalog(repos))
+    return path
+
+
+def write_precommit_config(path: Path, repos: int = CONFIG_REPOS) -> Path:
+    """Write a .pre-commit-config.yaml using the first repos of the catalog."""
+    lines = ["repos:"]
+    for number in range(repos):
+        name = fakeserver.project_name(number)
+        lines += [
+            f"  - repo: https://github.com/{fakeserver.FAKE_OWNER}/{name}",
+            f"    rev: v0.{number}.0",
+            "    hooks:",
+            f"      - id: {name}",
+            "        stages: [commit]",
+        ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def write_requirements(path: Path, lines: int = REQUIREMENT_LINES) -> Path:
+    """Write a hash-pinned pip-compile output of about ``lines`` lines.
+
+    Each package takes four lines: the pin, two hashes and a 'via' comment.
+    """
+    text = [
+        "#",
+        "# This file is autogenerated by pip-compile with Python 3.11",
+        "# by the following command:",
+        "#",
+        "#    pip-compile --generate-hashes requirements/development.in",
+        "#",
+    ]
+    for number in range((lines - len(text)) // 4):
+        name = fakeserver.project_name(number)
+        digest = hashlib.sha256(name.encode("utf-8")).hexdigest()
+        text += [
+            f"{name}==1.0.{number} \\",
+            f"    --hash=sha256:{digest} \\",
+            f"    --hash=sha256:{digest[::-1]}",
+            "    # via -r requirements/development.in",
+        ]
+    path.write_text("\n".join(text) + "\n", encoding="utf-8")
+    return path
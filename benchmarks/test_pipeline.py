@@ -0,0 +1,116 @@
+# Core Library modules
+import shutil
+from pathlib import Path
+from typing import Any
+
+# Third party modules
+import pytest
+
+# First party modules
+from piptools_sync import fakeserver, piptools_sync
+
+# Local modules
+from .synthetic import CATALOG_REPOS, CONFIG_REPOS
+
+
+@pytest.fixture
+def mocked_fetchers(monkeypatch: Any, project: Path) -> None:
+    catalog = (project / "all-hooks.json").read_bytes()
+    monkeypatch.setattr(piptools_sync, "_revalidate", lambda url: catalog)
+
+    def mock_get_latestpypirepoversion(name: str) -> Any:
+        return 0 if name.endswith("7") else "1.0.0"
+
+    monkeypatch.setattr(
+        piptools_sync, "get_latest_pypi_repo_version", mock_get_latestpypirepoversion
+    )
+
+
+def test_generate_db(benchmark: Any, mocked_fetchers: None) -> None:
+    result = benchmark(piptools_sync.generate_db, force=1, incremental=False)
+    assert len(result) == CATALOG_REPOS
+
+
+def test_generate_db_incremental(benchmark: Any, mocked_fetchers: None) -> None:
+    piptools_sync.generate_db(force=1)
+    result = benchmark(piptools_sync.generate_db, force=1)
+    assert len(result) == CATALOG_REPOS
+
+
+def test_generate_db_fake_server(benchmark: Any, monkeypatch: Any) -> None:
+    server = fakeserver.start_server(repos=CONFIG_REPOS)
+    base_url = fakeserver.server_url(server)
+    monkeypatch.setattr(
+        piptools_sync, "PRECOMMIT_REPOS_URL", f"{base_url}/all-hooks.json"
+    )
+    monkeypatch.setattr(piptools_sync, "PYPI_INDEX_URL", base_url)
+    try:
+        result = benchmark.pedantic(
+            piptools_sync.generate_db,
+            kwargs={"force": 1, "incremental": False},
+            rounds=3,
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert len(result) == CONFIG_REPOS
+
+
+def test_yaml_to_dict(benchmark: Any, project: Path) -> None:
+    config_file = project / piptools_sync.PRECOMMIT_CONFIG_FILE
+    result = benchmark(piptools_sync.yaml_to_dict, config_file)
+    assert len(result) == CONFIG_REPOS
+
+
+def test_update_yaml(benchmark: Any, project: Path, tmp_path: Path) -> None:
+    config_file = tmp_path / piptools_sync.PRECOMMIT_CONFIG_FILE
+    shutil.copy(project / piptools_sync.PRECOMMIT_CONFIG_FILE, config_file)
+    repo = f"https://github.com/{fakeserver.FAKE_OWNER}/project-500"
+    benchmark(piptools_sync.update_yaml, config_file, repo, "2.0.0")
+    assert piptools_sync.yaml_to_dict(config_file)[repo] == "2.0.0"
+
+
+def test_update_yaml_batch(benchmark: Any, project: Path, tmp_path: Path) -> None:
+    config_file = tmp_path / piptools_sync.PRECOMMIT_CONFIG_FILE
+    shutil.copy(project / piptools_sync.PRECOMMIT_CONFIG_FILE, config_file)
+    updates = {
+        f"https://github.com/{fakeserver.FAKE_OWNER}/project-{number}": "2.0.0"
+        for number in range(CONFIG_REPOS)
+    }
+    benchmark(piptools_sync.update_yaml_batch, config_file, updates)
+    assert set(piptools_sync.yaml_to_dict(config_file).values()) == {"2.0.0"}
+
+
+def test_get_requirement_versions(benchmark: Any, project: Path) -> None:
+    req_file = project / "requirements" / "development.txt"
+    packages = [fakeserver.project_name(number) for number in range(CONFIG_REPOS)]
+
+    def get_requirement_versions() -> dict:
+        piptools_sync._read_text_version.cache_clear()
+        return piptools_sync.get_requirement_versions(req_file, packages)
+
+    result = benchmark(get_requirement_versions)
+    assert len(result) == CONFIG_REPOS
+
+
+def test_find_requirements_file(benchmark: Any, project: Path) -> None:
+    def find_requirements_file() -> Path:
+        piptools_sync.get_file_index.cache_clear()
+        return piptools_sync.find_requirements_file()
+
+    result = benchmark(find_requirements_file)
+    assert result == project / "requirements" / "development.txt"
+
+
+def test_main(benchmark: Any, monkeypatch: Any, project: Path) -> None:
+    monkeypatch.setattr(piptools_sync, "RESULT_CACHE", False)
+    monkeypatch.setattr(piptools_sync, "UPDATE_PC_YAML_FILE", False)
+    piptools_sync._write_mapping(
+        {
+            f"https://github.com/{fakeserver.FAKE_OWNER}/{name}": (
+                piptools_sync._mapping_entry(name, "pypi")
+            )
+            for name in map(fakeserver.project_name, range(CONFIG_REPOS))
+        }
+    )
+    assert benchmark(piptools_sync.main, []) == 1
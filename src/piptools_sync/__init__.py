@@ -2,14 +2,23 @@
 """Top-level package for piptools_sync."""
 
 # Core Library modules
-import logging.config
-from importlib.resources import as_file, files
+import atexit
+import logging
+import os
+import queue
+import sys
+from importlib.resources import files
+from itertools import zip_longest
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from typing import Any, Iterable, Iterator, Union
 
-# Third party modules
-import git
-import toml
-import yaml
+if sys.version_info >= (3, 11):
+    # Core Library modules
+    import tomllib
+else:
+    # Third party modules
+    import toml as tomllib
 
 __title__ = "piptools-sync"
 __version__ = "1.0.4"
@@ -20,51 +29,129 @@
 __copyright__ = "Copyright 2022 Stephen R A King"
 
 
-ROOT_DIR = Path(git.Repo(".", search_parent_directories=True).working_tree_dir)
-
-LOGGING_CONFIG = """
-version: 1
-disable_existing_loggers: False
-handlers:
-  console:
-    class: logging.StreamHandler
-    level: INFO
-    stream: ext://sys.stdout
-    formatter: basic
-  file:
-    class: logging.FileHandler
-    level: DEBUG
-    filename: piptools_sync.log
-    encoding: utf-8
-    formatter: timestamp
-
-formatters:
-  basic:
-    style: "{"
-    format: "{message:s}"
-  timestamp:
-    style: "{"
-    format: "{asctime} - {levelname} - {name} - {message}"
-
-loggers:
-  init:
-    handlers: [console, file]
-    level: DEBUG
-    propagate: False
-"""
-
-logging.config.dictConfig(yaml.safe_load(LOGGING_CONFIG))
-logger = logging.getLogger("init")
-
-
-source_json = files("piptools_sync").joinpath("mapping.json")
-if not source_json.is_file():
-    with as_file(source_json) as _json_file:
-        _json_file.write_text("{}")
-MAPPING_FILE = source_json
-
-
-source = files("piptools_sync").joinpath("config.toml")
-with as_file(source) as _toml_path:
-    _toml_text = _toml_path.read_text()
-    toml_config = toml.loads(_toml_text)
+def _find_root_dir(start: Path) -> Path:
+    """Return the closest directory at or above start containing a '.git' entry.
+
+    '.git' is a directory in a normal clone and a file in worktrees and
+    submodules. If no repository is found the start directory is returned.
+    """
+    for directory in (start, *start.parents):
+        if (directory / ".git").exists():
+            return directory
+    return start
+
+
+ROOT_DIR = _find_root_dir(Path.cwd().resolve())
+
+
+toml_config = tomllib.loads(
+    files("piptools_sync").joinpath("config.toml").read_text(encoding="utf-8")
+)
+
+
+def _setting(section: str, key: str) -> Any:
+    """Return a config.toml setting, overridden by a PIPTOOLS_SYNC_<KEY> variable.
+
+    Parameters
+    ----------
+    section : str
+        The config.toml table e.g. 'NETWORK'.
+    key : str
+        The key within the table e.g. 'PYPI_INDEX_URL'.
+
+    Returns
+    -------
+    value : Any
+        The environment value as a string if set, else the config value.
+    """
+    return os.environ.get(f"PIPTOOLS_SYNC_{key}", toml_config[section][key])
+
+
+def _zip_strict(*iterables: Iterable[Any]) -> Iterator[tuple]:
+    """Zip iterables, raising ValueError if their lengths differ.
+
+    ``zip(..., strict=True)`` needs Python 3.10.
+    """
+    missing = object()
+    for values in zip_longest(*iterables, fillvalue=missing):
+        if any(value is missing for value in values):
+            raise ValueError("_zip_strict() arguments have different lengths")
+        yield values
+
+
+def _flag(section: str, key: str) -> bool:
+    """Return a boolean ``_setting``, where '1', 'true', 'yes' and 'on' are true."""
+    return str(_setting(section, key)).strip().lower() in ("1", "true", "yes", "on")
+
+
+_listener: Union[QueueListener, None] = None
+
+
+def _stop_logging() -> None:
+    """Write the records still queued for the log file and close it."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def configure_logging(
+    level: Union[str, None] = None, log_file: Union[str, None] = None
+) -> logging.Logger:
+    """Configure the 'init' logger, replacing any earlier configuration.
+
+    Records at ``level`` and above go to the console. If a log file is set,
+    records at LOG_FILE_LEVEL and above are also handed through a queue to a
+    QueueListener thread, which does the file I/O off the calling thread.
+    The logger level is the lowest level in use, so debug calls cost a single
+    level check when no handler wants them.
+
+    Parameters
+    ----------
+    level : str
+        The console level e.g. 'DEBUG', defaults to LOG_LEVEL.
+    log_file : str
+        The log file path, defaults to LOG_FILE. An empty string disables the
+        log file.
+
+    Returns
+    -------
+    logger : logging.Logger
+        The configured 'init' logger.
+    """
+    global _listener
+    _stop_logging()
+    level = (level or str(_setting("LOGGING", "LOG_LEVEL"))).upper()
+    if log_file is None:
+        log_file = str(_setting("LOGGING", "LOG_FILE"))
+    console = logging.StreamHandler(sys.stdout)
+    console.setLevel(level)
+    console.setFormatter(logging.Formatter("{message:s}", style="{"))
+    handlers: list[logging.Handler] = [console]
+    if log_file:
+        file_level = str(_setting("LOGGING", "LOG_FILE_LEVEL")).upper()
+        file = logging.FileHandler(log_file, encoding="utf-8", delay=True)
+        file.setLevel(file_level)
+        file.setFormatter(
+            logging.Formatter("{asctime} - {levelname} - {name} - {message}", style="{")
+        )
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        queued = QueueHandler(log_queue)
+        queued.setLevel(file_level)
+        handlers.append(queued)
+        _listener = QueueListener(log_queue, file, respect_handler_level=True)
+        _listener.start()
+    init_logger = logging.getLogger("init")
+    init_logger.handlers = handlers
+    init_logger.setLevel(min(handler.level for handler in handlers))
+    init_logger.propagate = False
+    return init_logger
+
+
+atexit.register(_stop_logging)
+logger = configure_logging()
+
+
+MAPPING_FILE = files("piptools_sync").joinpath("mapping.json")
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""An indexed, serializable copy of the pre-commit.com hook catalog.
+
+``HookCatalog.from_catalog`` reads the all-hooks.json document once into a
+``HookRepo`` record per repository, holding the id, name, language and entry
+of each of its hooks. The catalog is indexed by normalized repository URL, by
+language and by hook id so lookups do not rescan the document, and it can be
+saved to and reloaded from a gzip compressed JSON file.
+"""
+
+# Core Library modules
+import gzip
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Iterable, Iterator, Union
+
+# Local modules
+from . import _zip_strict
+
+CATALOG_FORMAT = 1
+
+
+def normalize_url(url: str) -> str:
+    """Return a repository URL lower-cased, without a trailing '/' or '.git'.
+
+    e.g. 'https://github.com/PyCQA/flake8.git/' gives
+    'https://github.com/pycqa/flake8'.
+    """
+    url = url.strip().lower().rstrip("/")
+    if url.endswith(".git"):
+        url = url[: -len(".git")]
+    return url
+
+
+class HookRepo:
+    """The hooks of one catalog repository.
+
+    The hook fields are kept as parallel tuples, the i-th hook being
+    ``hook_ids[i]``, ``names[i]``, ``languages[i]`` and ``entries[i]``.
+    """
+
+    __slots__ = ("url", "hook_ids", "names", "languages", "entries")
+
+    def __init__(
+        self,
+        url: str,
+        hook_ids: tuple[str, ...],
+        names: tuple[str, ...],
+        languages: tuple[str, ...],
+        entries: tuple[str, ...],
+    ) -> None:
+        self.url = url
+        self.hook_ids = hook_ids
+        self.names = names
+        self.languages = languages
+        self.entries = entries
+
+    def __repr__(self) -> str:
+        """Return the URL and hook ids of the repository."""
+        return f"HookRepo({self.url!r}, hook_ids={self.hook_ids!r})"
+
+    def __eq__(self, other: object) -> bool:
+        """Return whether other is a HookRepo with the same URL and hooks."""
+        if not isinstance(other, HookRepo):
+            return NotImplemented
+        return all(
+            getattr(self, field) == getattr(other, field) for field in self.__slots__
+        )
+
+    def hook_names(self, languages: Iterable[str]) -> list[str]:
+        """Return the names of the hooks written in one of the languages."""
+        wanted = set(languages)
+        return [
+            name
+            for name, language in _zip_strict(self.names, self.languages)
+            if language in wanted
+        ]
+
+
+class HookCatalog:
+    """The repositories of a hook catalog with indexes for constant time lookups.
+
+    Parameters
+    ----------
+    repos : Iterable[HookRepo]
+        The repositories in catalog order.
+    source : str
+        An identifier of the document the catalog was built from, e.g. its
+        HTTP validators, kept when the catalog is saved.
+    """
+
+    __slots__ = ("repos", "source", "_by_url", "_by_language", "_by_hook_id")
+
+    def __init__(self, repos: Iterable[HookRepo], source: str = "") -> None:
+        self.repos = tuple(repos)
+        self.source = source
+        self._by_url: dict[str, int] = {}
+        self._by_language: dict[str, list[int]] = {}
+        self._by_hook_id: dict[str, list[int]] = {}
+        for index, repo in enumerate(self.repos):
+            self._by_url.setdefault(normalize_url(repo.url), index)
+            for language in dict.fromkeys(repo.languages):
+                self._by_language.setdefault(language, []).append(index)
+            for hook_id in dict.fromkeys(repo.hook_ids):
+                self._by_hook_id.setdefault(hook_id, []).append(index)
+
+    @classmethod
+    def from_catalog(cls, data: dict, source: str = "") -> "HookCatalog":
+        """Build the catalog from a decoded all-hooks.json document.
+
+        Parameters
+        ----------
+        data : dict
+            Dictionary of repository URL to its list of hook definitions.
+        source : str
+            An identifier of the document, see ``HookCatalog``.
+
+        Returns
+        -------
+        catalog : HookCatalog
+            The indexed catalog.
+        """
+        repos = []
+        for url, hooks in data.items():
+            repos.append(
+                HookRepo(
+                    url,
+                    tuple(hook.get("id", "") for hook in hooks),
+                    tuple(hook.get("name", "") for hook in hooks),
+                    tuple(hook.get("language", "") for hook in hooks),
+                    tuple(hook.get("entry", "") for hook in hooks),
+                )
+            )
+        return cls(repos, source)
+
+    def __len__(self) -> int:
+        """Return the number of repositories."""
+        return len(self.repos)
+
+    def __iter__(self) -> Iterator[HookRepo]:
+        """Iterate over the repositories in catalog order."""
+        return iter(self.repos)
+
+    def __contains__(self, url: object) -> bool:
+        """Return whether the catalog lists the URL, compared normalized."""
+        return isinstance(url, str) and normalize_url(url) in self._by_url
+
+    def get(self, url: str) -> Union[HookRepo, None]:
+        """Return the repository with the URL, compared normalized, or None.
+
+        If the catalog lists the URL more than once the first is returned.
+        """
+        index = self._by_url.get(normalize_url(url))
+        return None if index is None else self.repos[index]
+
+    def with_language(self, *languages: str) -> list[HookRepo]:
+        """Return the repositories with a hook in one of the languages.
+
+        The repositories are returned once each, in catalog order.
+        """
+        indexes: set[int] = set()
+        for language in languages:
+            indexes.update(self._by_language.get(language, ()))
+        return [self.repos[index] for index in sorted(indexes)]
+
+    def with_hook_id(self, hook_id: str) -> list[HookRepo]:
+        """Return the repositories defining a hook id, in catalog order."""
+        return [self.repos[index] for index in self._by_hook_id.get(hook_id, ())]
+
+    def pyrepos(self, languages: Iterable[str]) -> list[list]:
+        """Return the repositories with hooks in the languages and their names.
+
+        Returns
+        -------
+        pyrepos : list[list]
+            e.g. [['https://github.com/pre-commit/mirrors-mypy', 'mypy']]
+        """
+        languages = tuple(languages)
+        return [
+            [repo.url, *repo.hook_names(languages)]
+            for repo in self.with_language(*languages)
+        ]
+
+    def project_names(self, languages: Iterable[str]) -> dict[str, str]:
+        """Guess the project of each repository with hooks in the languages.
+
+        A repository with a single hook is named after the hook id, others
+        after the last part of the URL.
+
+        Returns
+        -------
+        projects : dict
+            e.g. {'https://github.com/pre-commit/mirrors-mypy': 'mypy', ...}
+        """
+        return {
+            repo.url: (
+                repo.hook_ids[0]
+                if len(repo.hook_ids) == 1
+                else repo.url.rstrip("/").rsplit("/", 1)[-1]
+            )
+            for repo in self.with_language(*languages)
+        }
+
+    def dump(self, path: Path) -> None:
+        """Save the catalog to a gzip compressed JSON file, replacing it atomically."""
+        document = {
+            "format": CATALOG_FORMAT,
+            "source": self.source,
+            "repos": [
+                [repo.url, repo.hook_ids, repo.names, repo.languages, repo.entries]
+                for repo in self.repos
+            ],
+        }
+        body = json.dumps(document, separators=(",", ":")).encode("utf-8")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_bytes(gzip.compress(body, compresslevel=6))
+        os.replace(tmp_file, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Union["HookCatalog", None]:
+        """Load a catalog saved by ``dump``.
+
+        Returns
+        -------
+        catalog : HookCatalog
+            The catalog, or None if the file is missing, unreadable or of
+            another format.
+        """
+        try:
+            document = json.loads(gzip.decompress(path.read_bytes()))
+        except (OSError, EOFError, ValueError, zlib.error):
+            return None
+        if not isinstance(document, dict) or document.get("format") != CATALOG_FORMAT:
+            return None
+        repos = (
+            HookRepo(url, tuple(ids), tuple(names), tuple(languages), tuple(entries))
+            for url, ids, names, languages, entries in document["repos"]
+        )
+        return cls(repos, document.get("source", ""))
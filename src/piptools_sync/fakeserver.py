@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""A local stand-in for pre-commit.com, PyPI and the GitHub API.
+
+The server answers the requests made by piptools_sync with synthetic data so
+``generate_db`` can be exercised and benchmarked without network access:
+
+* ``/all-hooks.json`` - a catalog of ``repos`` python hook repositories,
+  served with an ETag so conditional GETs are answered with 304.
+* ``/pypi/<name>/json`` - the PyPI JSON API, padded with ``releases`` entries.
+* ``/simple/<name>/`` - the JSON Simple API (PEP 691).
+* ``/repos/<owner>/<repo>/releases/latest`` - the GitHub releases API,
+  limited to ``rate_limit`` requests per ``rate_window`` seconds with the
+  X-RateLimit headers and 403 responses of the real API.
+* ``POST /graphql`` - the GitHub GraphQL API, answering the aliased
+  ``r<n>: repository(owner: $o<n>, name: $n<n>)`` fields of the release
+  query with the latest release of each synthetic project and null for
+  other repos. Anonymous queries are answered with 401, and each query
+  counts against the same rate limit as the releases API.
+
+Every ``miss_every``-th project is unknown to PyPI and answered with 404. Each
+response is delayed by ``latency`` seconds.
+
+Start it from the command line::
+
+    python -m piptools_sync.fakeserver --repos 1000 --latency 0.02
+
+and point piptools_sync at it through the environment variables it prints.
+"""
+
+# Core Library modules
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Union
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_REPOS = 500
+DEFAULT_RELEASES = 50
+DEFAULT_LATENCY = 0.0
+DEFAULT_MISS_EVERY = 4
+DEFAULT_RATE_LIMIT = 5000
+DEFAULT_RATE_WINDOW = 3600
+FAKE_OWNER = "fake-owner"
+FAKE_VERSION = "1.0.0"
+PYPI_JSON_PATH = re.compile(r"^/pypi/(?P<name>[^/]+)/json$")
+SIMPLE_PATH = re.compile(r"^/simple/(?P<name>[^/]+)/$")
+GITHUB_RELEASE_PATH = re.compile(r"^/repos/[^/]+/(?P<name>[^/]+)/releases/latest$")
+PROJECT_NAME = re.compile(r"^project-(?P<number>\d+)$")
+
+
+def project_name(number: int) -> str:
+    """Return the synthetic project name for a repository number."""
+    return f"project-{number}"
+
+
+def _project_number(name: str, repos: int) -> Union[int, None]:
+    """Return the number of a synthetic project, None if it is not served."""
+    match = PROJECT_NAME.match(name.lower())
+    if not match or int(match.group("number")) >= repos:
+        return None
+    return int(match.group("number"))
+
+
+@lru_cache(maxsize=8)
+def build_catalog(repos: int) -> bytes:
+    """Return a synthetic pre-commit.com all-hooks.json document.
+
+    Parameters
+    ----------
+    repos : int
+        The number of hook repositories in the catalog.
+
+    Returns
+    -------
+    body : bytes
+        The JSON encoded catalog.
+    """
+    catalog = {}
+    for number in range(repos):
+        name = project_name(number)
+        catalog[f"https://github.com/{FAKE_OWNER}/{name}"] = [
+            {
+                "id": name,
+                "name": name,
+                "entry": name,
+                "language": "python",
+                "files": r"\.py$",
+            }
+        ]
+    return json.dumps(catalog).encode("utf-8")
+
+
+def build_pypi_json(name: str, releases: int) -> bytes:
+    """Return a PyPI JSON API document with ``releases`` padding releases.
+
+    As on PyPI the 'info' member comes first, followed by the release listing
+    which makes up the bulk of the document.
+    """
+    files = [{"filename": f"{name}-{FAKE_VERSION}.tar.gz", "yanked": False}]
+    listing = {f"0.{number}.0": files for number in range(releases)}
+    listing[FAKE_VERSION] = files
+    document = {
+        "info": {
+            "name": name,
+            "summary": f"The {name} project",
+            "version": FAKE_VERSION,
+        },
+        "releases": listing,
+        "urls": files,
+    }
+    return json.dumps(document).encode("utf-8")
+
+
+def build_simple_json(name: str, releases: int) -> bytes:
+    """Return a JSON Simple API (PEP 691/700) project page."""
+    versions = [f"0.{number}.0" for number in range(releases)] + [FAKE_VERSION]
+    document = {
+        "meta": {"api-version": "1.1"},
+        "name": name,
+        "versions": versions,
+        "files": [
+            {"filename": f"{name}-{version}.tar.gz", "yanked": False}
+            for version in versions
+        ],
+    }
+    return json.dumps(document).encode("utf-8")
+
+
+def build_github_release(name: str) -> bytes:
+    """Return a GitHub latest release document."""
+    return json.dumps(
+        {"name": f"v{FAKE_VERSION}", "tag_name": f"v{FAKE_VERSION}"}
+    ).encode("utf-8")
+
+
+def build_graphql_releases(variables: dict, repos: int) -> dict:
+    """Return the 'data' members of a GraphQL latest release query.
+
+    Each repository field r<n> is named by the variables o<n> and n<n>, and
+    is null unless it names a synthetic project.
+    """
+    release = {"name": f"v{FAKE_VERSION}", "tagName": f"v{FAKE_VERSION}"}
+    data: dict[str, Union[dict, None]] = {}
+    index = 0
+    while f"n{index}" in variables:
+        name = variables[f"n{index}"]
+        found = variables.get(f"o{index}") == FAKE_OWNER
+        if found and _project_number(name, repos) is not None:
+            data[f"r{index}"] = {
+                "latestRelease": release,
+                "refs": {"nodes": [{"name": release["tagName"]}]},
+            }
+        else:
+            data[f"r{index}"] = None
+        index += 1
+    return data
+
+
+class FakeHandler(BaseHTTPRequestHandler):
+    """Answer GET and POST requests from the settings held by the server."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Silence the per-request log written to stderr."""
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Dispatch a GET request to the matching synthetic endpoint."""
+        settings = self.server.settings  # type: ignore[attr-defined]
+        if settings["latency"]:
+            time.sleep(settings["latency"])
+        path = self.path.split("?", 1)[0]
+        if path == "/all-hooks.json":
+            body = build_catalog(settings["repos"])
+            etag = '"{}"'.format(hashlib.sha256(body).hexdigest()[:16])
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, b"", {"ETag": etag})
+            else:
+                self._send(200, body, {"ETag": etag})
+            return
+        for pattern, builder in (
+            (PYPI_JSON_PATH, build_pypi_json),
+            (SIMPLE_PATH, build_simple_json),
+        ):
+            match = pattern.match(path)
+            if match:
+                name = match.group("name")
+                number = _project_number(name, settings["repos"])
+                if number is None or number % settings["miss_every"] == 0:
+                    self._send(404, b'{"message": "Not Found"}')
+                else:
+                    self._send(200, builder(name, settings["releases"]))
+                return
+        match = GITHUB_RELEASE_PATH.match(path)
+        if match:
+            allowed, headers = self._take_rate_limit()
+            if allowed:
+                self._send(200, build_github_release(match.group("name")), headers)
+            else:
+                self._send(403, b'{"message": "API rate limit exceeded"}', headers)
+            return
+        self._send(404, b'{"message": "Not Found"}')
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Answer a GitHub GraphQL query, the only POST endpoint."""
+        settings = self.server.settings  # type: ignore[attr-defined]
+        if settings["latency"]:
+            time.sleep(settings["latency"])
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path.split("?", 1)[0] != "/graphql":
+            self._send(404, b'{"message": "Not Found"}')
+            return
+        if not self.headers.get("Authorization"):
+            self._send(
+                401, b'{"message": "This endpoint requires you to be authenticated."}'
+            )
+            return
+        allowed, headers = self._take_rate_limit()
+        if not allowed:
+            self._send(403, b'{"message": "API rate limit exceeded"}', headers)
+            return
+        try:
+            variables = json.loads(body).get("variables") or {}
+        except ValueError:
+            self._send(400, b'{"message": "Problems parsing JSON"}')
+            return
+        data = build_graphql_releases(variables, settings["repos"])
+        reset = int(headers["X-RateLimit-Reset"])
+        data["rateLimit"] = {
+            "cost": 1,
+            "remaining": int(headers["X-RateLimit-Remaining"]),
+            "resetAt": datetime.fromtimestamp(reset, timezone.utc).strftime(
+                "%Y-%m-%dT%H:%M:%SZ"
+            ),
+        }
+        self._send(200, json.dumps({"data": data}).encode("utf-8"), headers)
+
+    def _take_rate_limit(self) -> tuple[bool, dict]:
+        """Count a GitHub API request against the rate limit window.
+
+        Returns
+        -------
+        allowed : bool
+            False if the window's budget is already spent.
+        headers : dict
+            The X-RateLimit headers to send with the response.
+        """
+        settings = self.server.settings  # type: ignore[attr-defined]
+        state = self.server.rate_state  # type: ignore[attr-defined]
+        with self.server.rate_lock:  # type: ignore[attr-defined]
+            now = time.time()
+            if now >= state["reset"]:
+                state["reset"] = int(now) + settings["rate_window"]
+                state["used"] = 0
+            allowed = state["used"] < settings["rate_limit"]
+            state["used"] += allowed
+            headers = {
+                "X-RateLimit-Limit": str(settings["rate_limit"]),
+                "X-RateLimit-Remaining": str(settings["rate_limit"] - state["used"]),
+                "X-RateLimit-Reset": str(state["reset"]),
+            }
+        return allowed, headers
+
+    def _send(
+        self, status: int, body: bytes, headers: Union[dict, None] = None
+    ) -> None:
+        """Write a JSON response with a Content-Length header."""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if body:
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                # Streaming clients close the connection once they have read
+                # what they need.
+                self.close_connection = True
+
+
+def start_server(
+    host: str = DEFAULT_HOST,
+    port: int = 0,
+    repos: int = DEFAULT_REPOS,
+    releases: int = DEFAULT_RELEASES,
+    latency: float = DEFAULT_LATENCY,
+    miss_every: int = DEFAULT_MISS_EVERY,
+    rate_limit: int = DEFAULT_RATE_LIMIT,
+    rate_window: int = DEFAULT_RATE_WINDOW,
+) -> ThreadingHTTPServer:
+    """Start the fake server on a background daemon thread.
+
+    Parameters
+    ----------
+    host : str
+        The interface to bind.
+    port : int
+        The port to bind, 0 picks a free port.
+    repos : int
+        The number of repositories in the synthetic catalog.
+    releases : int
+        The number of padding releases in each PyPI document, which sets the
+        response size.
+    latency : float
+        Seconds to wait before answering each request.
+    miss_every : int
+        Every n-th project is not found on PyPI.
+    rate_limit : int
+        The number of GitHub API requests allowed per window.
+    rate_window : int
+        The length of the GitHub rate limit window in seconds.
+
+    Returns
+    -------
+    server : ThreadingHTTPServer
+        The running server, stop it with ``server.shutdown()``.
+    """
+    server = ThreadingHTTPServer((host, port), FakeHandler)
+    server.daemon_threads = True
+    server.settings = {  # type: ignore[attr-defined]
+        "repos": repos,
+        "releases": releases,
+        "latency": latency,
+        "miss_every": max(1, miss_every),
+        "rate_limit": rate_limit,
+        "rate_window": max(1, rate_window),
+    }
+    server.rate_state = {"reset": 0, "used": 0}  # type: ignore[attr-defined]
+    server.rate_lock = threading.Lock()  # type: ignore[attr-defined]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def server_url(server: ThreadingHTTPServer) -> str:
+    """Return the base URL of a running fake server."""
+    host, port = server.server_address[:2]
+    if isinstance(host, bytes):
+        host = host.decode("ascii")
+    return f"http://{host}:{port}"
+
+
+def environment(server: ThreadingHTTPServer) -> dict[str, str]:
+    """Return the environment variables pointing piptools_sync at the server."""
+    base_url = server_url(server)
+    return {
+        "PIPTOOLS_SYNC_PRECOMMIT_REPOS_URL": f"{base_url}/all-hooks.json",
+        "PIPTOOLS_SYNC_PYPI_INDEX_URL": base_url,
+        "PIPTOOLS_SYNC_GITHUB_API_URL": base_url,
+        "PIPTOOLS_SYNC_GITHUB_GRAPHQL_URL": f"{base_url}/graphql",
+    }
+
+
+def main() -> int:
+    """Run the fake server in the foreground until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--repos", type=int, default=DEFAULT_REPOS)
+    parser.add_argument("--releases", type=int, default=DEFAULT_RELEASES)
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY)
+    parser.add_argument("--miss-every", type=int, default=DEFAULT_MISS_EVERY)
+    parser.add_argument("--rate-limit", type=int, default=DEFAULT_RATE_LIMIT)
+    parser.add_argument("--rate-window", type=int, default=DEFAULT_RATE_WINDOW)
+    args = parser.parse_args()
+    server = start_server(
+        args.host,
+        args.port,
+        args.repos,
+        args.releases,
+        args.latency,
+        args.miss_every,
+        args.rate_limit,
+        args.rate_window,
+    )
+    for key, value in environment(server).items():
+        print(f"export {key}={value}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""Export the statistics of a run for fleet-wide monitoring.
+
+Two sinks are supported:
+
+* 'prometheus' - a node-exporter textfile collector file, rewritten
+  atomically at the end of every run. Counter and histogram samples are
+  added to those of the file being replaced, so they keep growing across
+  runs as ``rate()`` and ``increase()`` expect; the gauges describe the last
+  run. Concurrent runs take turns through a lock on a hidden sidecar file
+  where ``fcntl`` is available (POSIX), so no run's samples are lost.
+* 'jsonl' - one JSON document per run appended to a JSON-lines file.
+
+The sink and its path are set by METRICS_FORMAT and METRICS_PATH in the
+METRICS table of config.toml, or the PIPTOOLS_SYNC_METRICS_FORMAT and
+PIPTOOLS_SYNC_METRICS_PATH environment variables.
+"""
+
+# Core Library modules
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Union
+
+try:
+    # Core Library modules
+    import fcntl
+except ImportError:  # pragma: no cover - not POSIX
+    fcntl = None  # type: ignore[assignment]
+
+# Local modules
+from . import _zip_strict, stats
+
+PREFIX = "piptools_sync"
+CUMULATIVE = ("counter", "histogram")
+
+
+def _labels(**labels: Any) -> str:
+    """Return a Prometheus label set, escaping the values."""
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels.items():
+        text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        pairs.append('{}="{}"'.format(key, text.replace("\n", "\\n")))
+    return "{" + ",".join(pairs) + "}"
+
+
+def _number(value: float) -> str:
+    """Return a sample value, without a fraction if it is a whole number."""
+    if isinstance(value, float) and not value.is_integer():
+        return str(round(value, 6))
+    return str(int(value))
+
+
+def read_totals(path: Path) -> dict[str, float]:
+    """Return the counter and histogram samples of a textfile.
+
+    Parameters
+    ----------
+    path : Path
+        A textfile written by ``write_metrics``.
+
+    Returns
+    -------
+    totals : dict
+        Dictionary of sample name with its labels to value, in file order,
+        e.g. {'piptools_sync_yaml_rewrites_total': 3}. Empty if the file is
+        missing.
+    """
+    try:
+        text = path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return {}
+    totals: dict[str, float] = {}
+    kind = ""
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            kind = line.split()[-1]
+        elif line and not line.startswith("#") and kind in CUMULATIVE:
+            sample, _, value = line.rpartition(" ")
+            try:
+                totals[sample] = float(value)
+            except ValueError:
+                continue
+    return totals
+
+
+def render_prometheus(
+    report: dict[str, Any], previous: Union[dict[str, float], None] = None
+) -> str:
+    """Return a run report in the Prometheus text exposition format.
+
+    Parameters
+    ----------
+    report : dict
+        A statistics snapshot with the 'exit_code' of the run, as built by
+        ``run_report``.
+    previous : dict
+        The totals of earlier runs, as returned by ``read_totals``. They are
+        added to the counter and histogram samples of the run, and samples
+        only found in earlier runs are kept.
+
+    Returns
+    -------
+    text : str
+        The metrics, one HELP and TYPE header per family.
+    """
+    lines = []
+    previous = previous or {}
+
+    def family(name: str, kind: str, text: str, samples: list[tuple]) -> None:
+        metric = f"{PREFIX}_{name}"
+        lines.append(f"# HELP {metric} {text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        values = {
+            f"{metric}{suffix}{_labels(**labels)}": value
+            for suffix, labels, value in samples
+        }
+        if kind in CUMULATIVE:
+            names = {metric, f"{metric}_bucket", f"{metric}_sum", f"{metric}_count"}
+            for sample, total in previous.items():
+                if sample.split("{", 1)[0] in names:
+                    values[sample] = values.get(sample, 0) + total
+        lines.extend(f"{sample} {_number(value)}" for sample, value in values.items())
+
+    hosts = report["http"]["hosts"]
+    family(
+        "http_requests_total",
+        "counter",
+        "HTTP responses received, by host and status code.",
+        [
+            ("", {"host": host, "status": status}, count)
+            for host, host_stats in sorted(hosts.items())
+            for status, count in sorted(host_stats["status"].items())
+        ],
+    )
+    family(
+        "http_response_bytes_total",
+        "counter",
+        "HTTP response body bytes read, by host.",
+        [("", {"host": host}, hosts[host]["bytes"]) for host in sorted(hosts)],
+    )
+    samples = []
+    for name, histogram in sorted(report["histograms"].items()):
+        cumulative = 0
+        bounds = [*map(str, stats.LATENCY_BUCKETS), "+Inf"]
+        for bound, count in _zip_strict(bounds, histogram["buckets"]):
+            cumulative += count
+            samples.append(("_bucket", {"lookup": name, "le": bound}, cumulative))
+        samples.append(("_sum", {"lookup": name}, histogram["sum"]))
+        samples.append(("_count", {"lookup": name}, histogram["count"]))
+    family(
+        "lookup_duration_seconds",
+        "histogram",
+        "Duration of PyPI and GitHub version lookups.",
+        samples,
+    )
+    caches = report["cache"]
+    for outcome in ("hits", "misses"):
+        family(
+            f"cache_{outcome}_total",
+            "counter",
+            f"Cache {outcome}, by cache.",
+            [
+                ("", {"cache": cache}, caches[cache][outcome])
+                for cache in sorted(caches)
+            ],
+        )
+    counters = report["counters"]
+    family(
+        "mapping_regenerations_total",
+        "counter",
+        "Regenerations of the mapping from the pre-commit catalog.",
+        [("", {}, counters.get("mapping_regenerations", 0))],
+    )
+    family(
+        "yaml_rewrites_total",
+        "counter",
+        "Rewrites of the pre-commit config file.",
+        [("", {}, counters.get("yaml_rewrites", 0))],
+    )
+    family(
+        "run_duration_seconds",
+        "gauge",
+        "Duration of the last run.",
+        [("", {}, report["duration"])],
+    )
+    family(
+        "run_exit_code",
+        "gauge",
+        "Exit code of the last run.",
+        [("", {}, report["exit_code"])],
+    )
+    family(
+        "last_run_timestamp_seconds",
+        "gauge",
+        "Unix time the last run ended.",
+        [("", {}, int(report["ended"]))],
+    )
+    return "\n".join(lines) + "\n"
+
+
+def run_report(exit_code: int) -> dict[str, Any]:
+    """Return the statistics snapshot of the run with its outcome."""
+    report = stats.snapshot()
+    report["exit_code"] = exit_code
+    report["ended"] = time.time()
+    return report
+
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on the hidden '.<name>.lock' file next to path.
+
+    Without ``fcntl`` nothing is locked.
+    """
+    if fcntl is None:  # pragma: no cover - not POSIX
+        yield
+        return
+    fd = os.open(path.with_name(f".{path.name}.lock"), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def write_metrics(sink: str, path: Path, exit_code: int) -> None:
+    """Write the metrics of the run to a sink.
+
+    Parameters
+    ----------
+    sink : str
+        'prometheus' or 'jsonl'.
+    path : Path
+        The textfile or JSON-lines file to write.
+    exit_code : int
+        The exit code of the run.
+
+    Raises
+    ------
+    ValueError :
+        If the sink is unknown.
+    """
+    report = run_report(exit_code)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if sink == "prometheus":
+        tmp_file = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with _locked(path):
+            text = render_prometheus(report, read_totals(path))
+            tmp_file.write_text(text, encoding="utf-8")
+            os.replace(tmp_file, path)
+    elif sink == "jsonl":
+        line = json.dumps(report, sort_keys=True) + "\n"
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode("utf-8"))
+        finally:
+            os.close(fd)
+    else:
+        raise ValueError(f"Unknown metrics sink {sink!r}")
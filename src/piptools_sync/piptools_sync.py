@@ -1,29 +1,167 @@
 #!/usr/bin/env python3
-"""A pre-commit plugin to sync versions from pip-tools to pre-commit."""
+"""A pre-commit plugin to sync versions from pip-tools to pre-commit.
+
+Third party modules (aiohttp, requests, tqdm and yaml) and asyncio are
+imported by the functions that use them, so importing this module stays cheap
+for short-circuited runs.
+
+The network lookups exist in two flavours: the synchronous functions built on
+requests, and their ``*_async`` counterparts built on aiohttp for use from an
+event loop. The command line runs the asyncio pipeline ``main_async``.
+"""
+from __future__ import annotations
 
 # Core Library modules
+import gzip
+import hashlib
 import json
+import logging
 import os
+import re
+import subprocess  # nosec
+import sys
+import threading
 import time
-from importlib.metadata import PackageNotFoundError, version as ver
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from fnmatch import fnmatch
+from functools import lru_cache
 from importlib.resources import as_file
 from pathlib import Path
-from typing import Any, Union
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable, TypeVar, Union
 
-# Third party modules
-import requests
-import yaml
-from tqdm import tqdm
+if TYPE_CHECKING:
+    # Core Library modules
+    import argparse
+    import asyncio
+    import sqlite3
+
+    # Third party modules
+    import aiohttp
+    import requests
+    import yaml
+    from tqdm import tqdm
 
 # Local modules
-from . import MAPPING_FILE, ROOT_DIR, logger, toml_config
+from . import (
+    MAPPING_FILE,
+    ROOT_DIR,
+    __version__,
+    _flag,
+    _setting,
+    _zip_strict,
+    configure_logging,
+    logger,
+    stats,
+    toml_config,
+)
+from .catalog import HookCatalog, HookRepo, normalize_url
+
+
+T = TypeVar("T")
 
 PRECOMMIT_CONFIG_FILE = ".pre-commit-config.yaml"
-PRECOMMIT_REPOS_URL = "https://pre-commit.com/all-hooks.json"
+PRECOMMIT_REPOS_URL = str(_setting("NETWORK", "PRECOMMIT_REPOS_URL"))
 ROOT_REQUIREMENT = ROOT_DIR / "requirements.txt"
 REGEN_PERIOD = 15724800  # 6 months
+MISS_TTL = 2592000  # 30 days
+TTL_JITTER = 0.1
 UPDATE_PC_YAML_FILE = True
+INCREMENTAL_REGEN = True
+LAZY_RESOLUTION = _flag("RESOLUTION", "LAZY_RESOLUTION")
+RESULT_CACHE = True
+REQUIREMENTS_ENV = str(_setting("RESOLUTION", "REQUIREMENTS_ENV")) or None
+REQUIREMENTS_GLOBS = ["requirements*.txt", "requirements/*.txt"]
+PIP_COMPILE_MARKER = "autogenerated by pip-compile"
+INDEX_SOURCE = str(toml_config["INDEX"]["SOURCE"])
+INDEX_EXCLUDE = list(toml_config["INDEX"]["EXCLUDE"])
+REQUIREMENT_INCLUDE = re.compile(
+    r"\s*(?:-[rc]\s*=?|--(?:requirement|constraint)(?:\s*=|\s))\s*([^\s#]+)"
+)
+REQUIREMENT_PIN = re.compile(
+    r"([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*===?\s*([^\s;,#\\]+)"
+)
 PRECOMMIT_FILTERS = ["python", "toml"]
+MAX_WORKERS = int(_setting("NETWORK", "WORKERS"))
+HTTP_TIMEOUT = float(_setting("NETWORK", "TIMEOUT"))
+HTTP_RETRIES = int(_setting("NETWORK", "RETRIES"))
+HTTP_BACKOFF = float(_setting("NETWORK", "BACKOFF"))
+HTTP_RETRY_STATUSES = (500, 502, 503, 504)
+PYPI_INDEX_URL = str(_setting("NETWORK", "PYPI_INDEX_URL")).rstrip("/")
+PYPI_FETCH_MODE = str(_setting("NETWORK", "PYPI_FETCH_MODE"))
+METRICS_FORMAT = str(_setting("METRICS", "METRICS_FORMAT"))
+METRICS_PATH = Path(str(_setting("METRICS", "METRICS_PATH"))).expanduser()
+GITHUB_URL = str(_setting("NETWORK", "GITHUB_URL")).rstrip("/")
+GITHUB_API_URL = str(_setting("NETWORK", "GITHUB_API_URL")).rstrip("/")
+GITHUB_TOKENS = [
+    token.strip()
+    for token in os.environ.get(
+        "PIPTOOLS_SYNC_GITHUB_TOKEN", os.environ.get("GITHUB_TOKEN", "")
+    ).split(",")
+    if token.strip()
+]
+GITHUB_GRAPHQL_URL = str(_setting("NETWORK", "GITHUB_GRAPHQL_URL"))
+GITHUB_FETCH_MODE = str(_setting("NETWORK", "GITHUB_FETCH_MODE"))
+GITHUB_BATCH_SIZE = 100
+GITHUB_WORKERS = int(_setting("NETWORK", "GITHUB_WORKERS"))
+GITHUB_RESERVE = int(_setting("NETWORK", "GITHUB_RESERVE"))
+GITHUB_LIMITS = {"token": 5000, "anonymous": 60}
+GITHUB_PACE_BELOW = 100
+GITHUB_ATTEMPTS = 5
+GITHUB_RESET_SKEW = 1.0
+GITHUB_VERSION_TTL = 86400  # 1 day
+PYPI_STREAM_CHUNK = 8192
+PYPI_DRAIN_LIMIT = 65536
+PYPI_INFO_VERSION = re.compile(rb'"version"\s*:\s*"((?:[^"\\]|\\.)*)"')
+PRE_RELEASE = re.compile(r"\d[._-]?(a|b|c|rc|alpha|beta|pre|preview|dev)", re.I)
+DIST_SUFFIX = re.compile(r"\.(tar\.gz|tar\.bz2|tgz|zip|egg|exe|msi)$")
+CACHE_DIR = Path(
+    os.environ.get(
+        "PIPTOOLS_SYNC_CACHE_DIR",
+        Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+        / "piptools_sync",
+    )
+)
+RESULT_CACHE_FILE = CACHE_DIR / "last_runs.json"
+RUN_CACHE_SETTINGS = (
+    "GITHUB_FETCH_MODE",
+    "LAZY_RESOLUTION",
+    "PYPI_FETCH_MODE",
+    "PYPI_INDEX_URL",
+    "REQUIREMENTS_ENV",
+    "UPDATE_PC_YAML_FILE",
+)
+STORE_FILE = CACHE_DIR / "piptools_sync.db"
+CATALOG_SNAPSHOTS = 5
+HOOK_CATALOG_FILE = "hook_catalog.json.gz"
+STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mapping (
+    repo_url TEXT PRIMARY KEY,
+    project TEXT NOT NULL,
+    result TEXT NOT NULL,
+    source TEXT NOT NULL,
+    resolved INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS mapping_project ON mapping (project);
+CREATE TABLE IF NOT EXISTS latest_versions (
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    version TEXT NOT NULL,
+    fetched INTEGER NOT NULL,
+    PRIMARY KEY (kind, name)
+);
+CREATE TABLE IF NOT EXISTS catalog_snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    fetched INTEGER NOT NULL,
+    repo_count INTEGER NOT NULL,
+    repos TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
 MANUAL_MAPPING = {
     "https://github.com/pre-commit/mirrors-autopep8": "autopep8",
     "https://github.com/pre-commit/mirrors-mypy": "mypy",
@@ -39,11 +177,137 @@ def load_settings() -> None:
         logger.disabled = True
 
 
+def _git_files(root: Path) -> Union[list[str], None]:
+    """Return the files git tracks or would track below root, or None.
+
+    Untracked files are included, files ignored by .gitignore are not.
+    """
+    try:
+        result = subprocess.run(  # nosec
+            ["git", "ls-files", "--cached", "--others", "--exclude-standard", "-z"],
+            cwd=root,
+            capture_output=True,
+            check=False,
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return [name for name in result.stdout.decode("utf-8").split("\0") if name]
+
+
+def _scan_files(root: Path) -> list[str]:
+    """Return the files below root, skipping names matched by the root .gitignore.
+
+    Only simple .gitignore patterns are honoured: negations are ignored and
+    every pattern is matched against both the name and the relative path.
+    """
+    patterns = []
+    gitignore = root / ".gitignore"
+    if gitignore.is_file():
+        for line in gitignore.read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if line and not line.startswith(("#", "!")):
+                patterns.append(line.strip("/"))
+
+    def ignored(rel_path: str, name: str) -> bool:
+        return any(
+            fnmatch(name, pattern) or fnmatch(rel_path, pattern) for pattern in patterns
+        )
+
+    files: list[str] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = Path(dirpath).relative_to(root).as_posix()
+        rel_dir = "" if rel_dir == "." else f"{rel_dir}/"
+        dirnames[:] = [
+            name
+            for name in dirnames
+            if name != ".git" and not ignored(f"{rel_dir}{name}", name)
+        ]
+        files.extend(
+            f"{rel_dir}{name}"
+            for name in filenames
+            if not ignored(f"{rel_dir}{name}", name)
+        )
+    return files
+
+
+@lru_cache(maxsize=4)
+def get_file_index(root: Path) -> dict[str, list[Path]]:
+    """Index the project files by every trailing part of their relative path.
+
+    The file list comes from ``git ls-files`` or a directory scan according to
+    ``INDEX_SOURCE`` ('auto', 'git' or 'scan'). Files below a directory named
+    in ``INDEX_EXCLUDE`` are left out. The index is built once per root; call
+    ``get_file_index.cache_clear()`` to rebuild it.
+
+    Parameters
+    ----------
+    root : Path
+        The directory to index, normally ``ROOT_DIR``.
+
+    Returns
+    -------
+    index : dict
+        e.g. {'dev.txt': [Path('/root/tests/reqs/dev.txt')],
+        'reqs/dev.txt': [...], 'tests/reqs/dev.txt': [...], ...}
+    """
+    logger.debug("starting **** get_file_index ****")
+    names = _git_files(root) if INDEX_SOURCE in ("auto", "git") else None
+    if names is None:
+        if INDEX_SOURCE == "git":
+            raise FileNotFoundError(f"Cannot list the git files of {root}")
+        names = _scan_files(root)
+    excluded = set(INDEX_EXCLUDE)
+    index: dict[str, list[Path]] = {}
+    for name in sorted(names):
+        parts = name.split("/")
+        if excluded.intersection(parts[:-1]):
+            continue
+        for start in range(len(parts)):
+            index.setdefault("/".join(parts[start:]), []).append(root / name)
+    logger.debug("indexed %s files", len(names))
+    return index
+
+
+def find_file_candidates(partial_path: str) -> list[Path]:
+    """Return every project file whose relative path ends with the partial path.
+
+    Plain partial paths are a single index lookup. Paths containing glob
+    characters are matched against the indexed path suffixes.
+
+    Parameters
+    ----------
+    partial_path : str
+        A string representing the trailing part of a path. Either separator
+        may be used.
+
+    Returns
+    -------
+    candidates : list[Path]
+        The matching files, sorted.
+    """
+    index = get_file_index(ROOT_DIR)
+    key = partial_path.replace("\\", "/").strip()
+    while key.startswith("./"):
+        key = key[2:]
+    if not any(char in key for char in "*?["):
+        return list(index.get(key, []))
+    return sorted(
+        {
+            path
+            for suffix, paths in index.items()
+            if fnmatch(suffix, key)
+            for path in paths
+        }
+    )
+
+
 def _utility_find_file_path(partial_path: str) -> Union[Path, int]:
     """Given a partial file path, find the absolute file path for the file.
 
-    Do a search from the project root matching a full absolute path containing
-    the partial path as a substring.
+    Look up the partial path in the project file index, matching a full path
+    ending with the partial path.
 
     Parameters
     ----------
@@ -58,10 +322,11 @@ def _utility_find_file_path(partial_path: str) -> Union[Path, int]:
         Error condition indicates that no match was found.
     1 :
         Error condition indicates more than 1 match was found and is ambiguous.
+        ``find_file_candidates`` returns the candidates.
     """
     logger.debug("starting **** _utility_find_file_path ****")
     logger.debug("attempting to find: %s", partial_path)
-    result_list = sorted(Path(ROOT_DIR).glob(partial_path))
+    result_list = find_file_candidates(partial_path)
     logger.debug("result_list: %s", result_list)
     if len(result_list) == 0:
         logger.debug("Error - no files found: %s", result_list)
@@ -99,60 +364,488 @@ def _utility_remove_vee(version: str) -> str:
     return version
 
 
+@lru_cache(maxsize=1)
+def get_session() -> requests.Session:
+    """Return the HTTP session shared by all network functions.
+
+    The session keeps connections alive and pools them per host, so a mapping
+    rebuild reuses a few warm connections. Each host pool holds as many
+    connections as there are workers in ``generate_db``. Connection errors and
+    5xx responses are retried with exponential backoff.
+
+    Returns
+    -------
+    session : requests.Session
+        The shared session object.
+    """
+    # Third party modules
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=4, pool_maxsize=max(1, MAX_WORKERS), max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _http_get(url: str, **kwargs: Any) -> requests.Response:
+    """Perform a GET request through the shared session and timeout policy.
+
+    Parameters
+    ----------
+    url : str
+        The URL to request.
+    **kwargs : Any
+        Extra keyword arguments passed on to ``requests.Session.get``.
+
+    Returns
+    -------
+    response : requests.Response
+        The response object.
+    """
+    kwargs.setdefault("timeout", HTTP_TIMEOUT)
+    r = get_session().get(url, **kwargs)
+    _record_response(url, r, kwargs.get("stream", False))
+    return r
+
+
+def _record_response(url: str, r: requests.Response, stream: bool) -> None:
+    """Count a response in the run statistics, with its body unless streamed."""
+    stats.record_request(url, r.status_code, r.elapsed.total_seconds())
+    if not stream:
+        stats.record_bytes(url, len(r.content))
+
+
+def _conditional_get(url: str) -> bytes:
+    """Return the body of a URL using an on-disk conditional-GET cache.
+
+    The body is stored gzip compressed in ``CACHE_DIR`` alongside a small
+    metadata file holding the ETag and Last-Modified response headers. These
+    are sent back as If-None-Match and If-Modified-Since so an unchanged
+    document costs a 304 response instead of a full download.
+
+    Parameters
+    ----------
+    url : str
+        The URL to request.
+
+    Returns
+    -------
+    body : bytes
+        The (possibly cached) response body.
+
+    Raises
+    ------
+    requests.HTTPError :
+        If the server responds with an error status.
+    """
+    logger.debug("starting **** _conditional_get ****")
+    body = _revalidate(url)
+    return _read_cached(url) if body is None else body
+
+
+def _revalidate(url: str) -> Union[bytes, None]:
+    """Revalidate the cached copy of a URL, downloading it if it changed.
+
+    Returns
+    -------
+    body : bytes
+        The new body, already cached, or None if the cached copy is current.
+
+    Raises
+    ------
+    requests.HTTPError :
+        If the server responds with an error status.
+    """
+    headers = _cache_validators(url)
+    r = _http_get(url, headers=headers)
+    if r.status_code == 304 and headers:
+        logger.debug("not modified - using cached copy of %s", url)
+        stats.record_cache("http", hits=1)
+        return None
+    r.raise_for_status()
+    stats.record_cache("http", misses=1)
+    _write_cached(url, r.content, r.headers)
+    return r.content
+
+
+def _cache_files(url: str) -> tuple[Path, Path]:
+    """Return the cached body and metadata files of a URL."""
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+    return CACHE_DIR / f"{key}.gz", CACHE_DIR / f"{key}.json"
+
+
+def _cache_validators(url: str) -> dict[str, str]:
+    """Return the conditional request headers for a cached URL, if any."""
+    body_file, meta_file = _cache_files(url)
+    headers = {}
+    if body_file.is_file() and meta_file.is_file():
+        meta = json.loads(meta_file.read_text(encoding="utf-8"))
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def _read_cached(url: str) -> bytes:
+    """Return the cached body of a URL."""
+    body_file, _ = _cache_files(url)
+    return gzip.decompress(body_file.read_bytes())
+
+
+def _write_cached(url: str, body: bytes, headers: Any) -> None:
+    """Cache the body of a URL with the validators of its response headers."""
+    body_file, meta_file = _cache_files(url)
+    meta = {
+        "url": url,
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+    }
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_file = body_file.with_suffix(f".{os.getpid()}.tmp")
+    tmp_file.write_bytes(gzip.compress(body))
+    os.replace(tmp_file, body_file)
+    meta_file.write_text(json.dumps(meta), encoding="utf-8")
+    logger.debug("cached %s bytes for %s", len(body), url)
+
+
 def get_precommit_repos() -> list[list]:
     """Get a list of repos from pre-commit.com using the selected filters.
 
-    # TODO: possibly refactor data structure to dictionary at later stage with the
-        following structure dict{key: value and key: [list]} :
-
     Returns
     -------
     pyrepos : list[list]
         data structure: [['html repo name': 'str'], ['html repo name': 'str'], ... ]
         e.g. [['https://github.com/pre-commit/mirrors-mypy', 'mypy']]
     """
-    pyrepos = []
-    r = requests.get(PRECOMMIT_REPOS_URL, timeout=15)
-    data = r.json()
-    for repo in data:
-        sublist = [repo]
-        for _, subrepo in enumerate(data[repo]):
-            if subrepo["language"] in PRECOMMIT_FILTERS:
-                sublist.append(subrepo["name"])
-        if len(sublist) > 1:
-            pyrepos.append(sublist)
+    pyrepos = get_hook_catalog().pyrepos(PRECOMMIT_FILTERS)
     logger.debug("Number of pre-commit hooks found: %s", len(pyrepos))
     return pyrepos
 
 
 def get_precommit_repos_2() -> dict:
-    """Get a list of repos from pre-commit.com using the selected filters.
+    """Get the repos from pre-commit.com using the selected filters.
+
+    Each repo is mapped to the id of its hook if it has a single hook, else
+    to the last part of its URL.
 
     Returns
     -------
     pyrepos : dict
-        data structure: [['html repo name': 'str'], ['html repo name': 'str'], ... ]
         e.g. {'https://github.com/pre-commit/mirrors-mypy': 'mypy', ...}
     """
-    pyrepos = {}
-    r = requests.get(PRECOMMIT_REPOS_URL, timeout=15)
-    data = r.json()
-    for repo in data:
-        language = data[repo][0]["language"]
-        subrepos = len(data[repo])
-        if language in PRECOMMIT_FILTERS and subrepos > 1:
-            *_, url_path = repo.split("/")
-            pyrepos[repo] = url_path
-        elif language in PRECOMMIT_FILTERS and subrepos == 1:
-            pyrepos[repo] = data[repo][0]["id"]
-
+    pyrepos = get_hook_catalog().project_names(PRECOMMIT_FILTERS)
     logger.debug("Number of pre-commit hooks found: %s", len(pyrepos))
     return pyrepos
 
 
+def get_hook_catalog() -> HookCatalog:
+    """Return the indexed pre-commit.com hook catalog.
+
+    The catalog is revalidated through the conditional-GET cache and rebuilt
+    only when the document changes, see ``_hook_catalog``.
+
+    Returns
+    -------
+    catalog : HookCatalog
+        Every repo of the catalog with its hooks, indexed by language.
+    """
+    return _hook_catalog(_revalidate(PRECOMMIT_REPOS_URL))
+
+
+def _hook_catalog(body: Union[bytes, None]) -> HookCatalog:
+    """Return the catalog of all-hooks.json, reusing the saved catalog.
+
+    The catalog is saved to ``CACHE_DIR`` with the ETag and Last-Modified
+    validators of the document it was built from. When the document is not
+    modified the saved catalog is loaded without reading the cached document.
+
+    Parameters
+    ----------
+    body : bytes
+        The downloaded document, or None if the cached copy is current.
+    """
+    source = json.dumps(_cache_validators(PRECOMMIT_REPOS_URL), sort_keys=True)
+    catalog_file = CACHE_DIR / HOOK_CATALOG_FILE
+    if body is None:
+        catalog = HookCatalog.load(catalog_file)
+        if catalog is not None and catalog.source == source:
+            stats.record_cache("hook_catalog", hits=1)
+            return catalog
+        body = _read_cached(PRECOMMIT_REPOS_URL)
+    stats.record_cache("hook_catalog", misses=1)
+    catalog = HookCatalog.from_catalog(json.loads(body), source)
+    catalog.dump(catalog_file)
+    logger.debug("indexed %s catalog repos", len(catalog))
+    return catalog
+
+
+def _saved_hook_catalog() -> HookCatalog:
+    """Return the catalog saved by ``get_hook_catalog``, empty if there is none.
+
+    Nothing is downloaded, and the file is only read again once it changes.
+    """
+    catalog_file = CACHE_DIR / HOOK_CATALOG_FILE
+    try:
+        stat = catalog_file.stat()
+    except OSError:
+        return HookCatalog(())
+    return _load_hook_catalog(catalog_file, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=1)
+def _load_hook_catalog(path: Path, mtime_ns: int, size: int) -> HookCatalog:
+    """Load a saved catalog, cached on the modification time and size of the file."""
+    return HookCatalog.load(path) or HookCatalog(())
+
+
+class GitHubScheduler:
+    """Share the GitHub REST API rate limit between worker threads.
+
+    A budget is kept per token, the empty token standing for anonymous
+    access, and updated from the X-RateLimit-Limit, X-RateLimit-Remaining and
+    X-RateLimit-Reset headers of every response. ``acquire`` hands out the
+    token with the most requests left and never lets more requests be in
+    flight than the budget allows, so concurrency shrinks as the budget runs
+    down. ``reserve`` requests are always left unused for other tools.
+
+    Once fewer than ``GITHUB_PACE_BELOW`` requests are left, request starts
+    are spread evenly over the time remaining until the reset. A spent budget
+    or a Retry-After header blocks the token until the reset instead of
+    failing the lookups waiting for it.
+
+    Parameters
+    ----------
+    tokens : list[str]
+        GitHub tokens to spread the requests over. Empty for anonymous access.
+    reserve : int
+        The number of requests per budget to leave unused.
+    """
+
+    def __init__(self, tokens: list[str], reserve: int = GITHUB_RESERVE) -> None:
+        self.reserve = reserve
+        self.condition = threading.Condition()
+        self.budgets = {
+            token: {
+                "limit": GITHUB_LIMITS["token" if token else "anonymous"],
+                "remaining": GITHUB_LIMITS["token" if token else "anonymous"],
+                "reset": 0.0,
+                "in_flight": 0,
+                "next_start": 0.0,
+                "blocked_until": 0.0,
+            }
+            for token in tokens or [""]
+        }
+
+    def _wait_time(self, budget: dict, now: float) -> Union[float, None]:
+        """Return the seconds before a request may start on a budget.
+
+        0 means the request may start now and None that it has to wait for a
+        request in flight to complete.
+        """
+        if budget["blocked_until"] > now:
+            return budget["blocked_until"] - now
+        if budget["reset"] and now >= budget["reset"] + GITHUB_RESET_SKEW:
+            budget["remaining"] = budget["limit"]
+            budget["reset"] = 0.0
+        usable = budget["remaining"] - budget["in_flight"] - self.reserve
+        if usable <= 0:
+            if budget["in_flight"]:
+                return None
+            return max(budget["reset"] + GITHUB_RESET_SKEW - now, 0.0)
+        return max(budget["next_start"] - now, 0.0)
+
+    def acquire(self) -> str:
+        """Wait until a request may be sent and return the token to send it with.
+
+        Returns
+        -------
+        token : str
+            The token to authenticate with, empty for anonymous access.
+        """
+        with self.condition:
+            while True:
+                now = time.time()
+                waits = {
+                    token: self._wait_time(budget, now)
+                    for token, budget in self.budgets.items()
+                }
+                ready = [token for token, wait in waits.items() if wait == 0]
+                if ready:
+                    break
+                timed = [wait for wait in waits.values() if wait is not None]
+                logger.debug("GitHub budget exhausted, waiting %s", timed)
+                self.condition.wait(min(timed) if timed else None)
+            token = max(ready, key=lambda token: self.budgets[token]["remaining"])
+            budget = self.budgets[token]
+            budget["in_flight"] += 1
+            left = budget["remaining"] - budget["in_flight"] - self.reserve
+            if budget["reset"] > now and left < GITHUB_PACE_BELOW:
+                interval = (budget["reset"] - now) / max(left + 1, 1)
+                budget["next_start"] = max(now, budget["next_start"]) + interval
+            return token
+
+    def release(
+        self, token: str, response: Union[requests.Response, SimpleNamespace, None]
+    ) -> bool:
+        """Record the response to a request sent with an acquired token.
+
+        Parameters
+        ----------
+        token : str
+            The token returned by ``acquire``.
+        response : requests.Response
+            The response received, None if the request failed. Any object
+            with ``status_code`` and ``headers`` attributes will do, such as a
+            SimpleNamespace describing an aiohttp response.
+
+        Returns
+        -------
+        retry : bool
+            True if the request was rejected by the rate limit and should be
+            sent again.
+        """
+        with self.condition:
+            budget = self.budgets[token]
+            budget["in_flight"] -= 1
+            retry = False
+            if response is not None:
+                headers = response.headers
+                now = time.time()
+                if "X-RateLimit-Remaining" in headers:
+                    reset = float(headers.get("X-RateLimit-Reset", 0))
+                    remaining = int(headers["X-RateLimit-Remaining"])
+                    if reset != budget["reset"]:
+                        budget["remaining"] = remaining
+                    else:
+                        budget["remaining"] = min(budget["remaining"], remaining)
+                    budget["limit"] = int(
+                        headers.get("X-RateLimit-Limit", budget["limit"])
+                    )
+                    budget["reset"] = reset
+                if response.status_code in (403, 429):
+                    if "Retry-After" in headers:
+                        wait = float(headers["Retry-After"])
+                        budget["blocked_until"] = now + wait
+                        retry = True
+                    elif headers.get("X-RateLimit-Remaining") == "0":
+                        budget["blocked_until"] = budget["reset"] + GITHUB_RESET_SKEW
+                        retry = True
+            self.condition.notify_all()
+        return retry
+
+
+@lru_cache(maxsize=2)
+def get_github_scheduler(resource: str = "core") -> GitHubScheduler:
+    """Return the rate limit scheduler shared by all GitHub lookups.
+
+    The REST ('core') and the GraphQL ('graphql') APIs have separate rate
+    limits and so separate schedulers.
+    """
+    return GitHubScheduler(GITHUB_TOKENS, GITHUB_RESERVE)
+
+
+def _github_headers(url: str, token: Union[str, None]) -> dict[str, str]:
+    """Return the headers of a GitHub API request.
+
+    The token is only sent to the hosts of ``GITHUB_API_URL`` and
+    ``GITHUB_GRAPHQL_URL``, never to another host.
+    """
+    # Core Library modules
+    from urllib.parse import urlsplit
+
+    headers = {"Accept": "application/vnd.github+json"}
+    api_hosts = {
+        urlsplit(api_url)[:2] for api_url in (GITHUB_API_URL, GITHUB_GRAPHQL_URL)
+    }
+    if token and urlsplit(url)[:2] in api_hosts:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+def _github_release_url(url_src: str) -> Union[str, None]:
+    """Return the latest release API URL of a GitHub repo, None for other hosts."""
+    owner_name = _github_owner_name(url_src)
+    if owner_name is None:
+        return None
+    owner, name = owner_name
+    return f"{GITHUB_API_URL}/repos/{owner}/{name}/releases/latest"
+
+
+def _github_request(
+    method: str, url: str, resource: str = "core", **kwargs: Any
+) -> requests.Response:
+    """Send a GitHub API request through the rate limit scheduler.
+
+    Requests rejected by the rate limit are sent again once the scheduler
+    allows it, up to ``GITHUB_ATTEMPTS`` times. The token is only attached
+    for the GitHub API hosts, see ``_github_headers``.
+
+    Parameters
+    ----------
+    method : str
+        The HTTP method, 'GET' or 'POST'.
+    url : str
+        The API URL.
+    resource : str
+        The rate limit resource, 'core' or 'graphql'.
+    **kwargs : Any
+        Extra keyword arguments passed on to ``requests.Session.request``.
+
+    Returns
+    -------
+    response : requests.Response
+        The response accepted by the rate limit.
+
+    Raises
+    ------
+    requests.HTTPError :
+        If the rate limit still rejects the request after ``GITHUB_ATTEMPTS``
+        attempts.
+    """
+    # Third party modules
+    import requests
+
+    scheduler = get_github_scheduler(resource)
+    kwargs.setdefault("timeout", HTTP_TIMEOUT)
+    for attempt in range(1, GITHUB_ATTEMPTS + 1):
+        token = scheduler.acquire()
+        headers = _github_headers(url, token)
+        r = None
+        try:
+            r = get_session().request(method, url, headers=headers, **kwargs)
+            _record_response(url, r, kwargs.get("stream", False))
+        finally:
+            retry = scheduler.release(token, r)
+        if not retry:
+            return r
+        logger.debug("rate limited on %s - attempt %s", url, attempt)
+    raise requests.HTTPError(
+        f"GitHub rate limit exceeded after {GITHUB_ATTEMPTS} attempts: {url}",
+        response=r,
+    )
+
+
 def get_latest_github_repo_version(url_src: str) -> Union[str, int]:
     """Given a repo URL, return the latest version from GitHub utilizing API.
 
+    Requests go through the shared ``GitHubScheduler``, so they are spread
+    over the configured tokens and wait for the rate limit to reset rather
+    than fail. Requests rejected by the rate limit are retried up to
+    ``GITHUB_ATTEMPTS`` times.
+
     Parameters
     ----------
     url_src : str
@@ -161,36 +854,273 @@ def get_latest_github_repo_version(url_src: str) -> Union[str, int]:
     Returns
     -------
     version : str
-        the latest repository version extracted from the API.
+        The name of the latest release, or its tag if the release is unnamed.
     0 :
-        If the version cannot be found.
+        If the repository has no release or is not a GitHub repository, in
+        which case no request is sent.
 
     Raises
     ------
-    SystemExit:
-        if requests.get() operations fails for any reason.
+    requests.RequestException:
+        If the request fails, including when the rate limit still rejects it
+        after ``GITHUB_ATTEMPTS`` attempts.
     """
     logger.debug("starting **** get_latest_github_repo_version ****")
-    url_int = url_src.replace("https://github.com/", "https://api.github.com/repos/")
-    dst_url = "".join([url_int, "/releases/latest"])
-    headers = {"Accept": "application/vnd.github+json"}
+    dst_url = _github_release_url(url_src)
+    if dst_url is None:
+        logger.debug("0 - for %s, not a GitHub repository", url_src)
+        return 0
+    with stats.timed("github"):
+        r = _github_request("GET", dst_url)
+    if r.status_code == 404:
+        logger.debug("0 - for %s", url_src)
+        return 0
+    r.raise_for_status()
+    data = r.json()
+    version = data.get("name") or data.get("tag_name") or 0
+    logger.debug("%s - for %s", version, url_src)
+    return version
+
+
+def get_latest_github_versions(
+    repo_urls: list[str], workers: int = GITHUB_WORKERS
+) -> dict[str, Union[str, int]]:
+    """Return the latest GitHub release of many repos, using the store as cache.
+
+    Versions fetched less than ``GITHUB_VERSION_TTL`` seconds ago are read
+    from the store, the others are looked up concurrently and written back.
+    ``GITHUB_FETCH_MODE`` selects the lookup: 'rest' makes a releases API
+    request per repo, 'graphql' asks for up to ``GITHUB_BATCH_SIZE`` repos per
+    GraphQL query, and 'auto' uses GraphQL when a token is configured, as the
+    GraphQL API does not allow anonymous access.
+
+    Parameters
+    ----------
+    repo_urls : list[str]
+        The URLs of the GitHub repositories.
+    workers : int
+        The maximum number of concurrent lookups. The scheduler lowers the
+        effective concurrency as the rate limit budget runs down.
+
+    Returns
+    -------
+    versions : dict
+        Dictionary of repo URL to latest release, 0 if it has no release.
+    """
+    logger.debug("starting **** get_latest_github_versions ****")
+    cached = _load_latest_versions("github", repo_urls, GITHUB_VERSION_TTL)
+    pending = [repo_url for repo_url in repo_urls if repo_url not in cached]
+    stats.record_cache("github_versions", len(repo_urls) - len(pending), len(pending))
+    fetched: dict[str, Union[str, int]] = {}
+    graphql = GITHUB_FETCH_MODE == "graphql" or (
+        GITHUB_FETCH_MODE == "auto" and bool(GITHUB_TOKENS)
+    )
+    if pending:
+        logger.debug("GitHub repos to look up: %s", len(pending))
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            if graphql:
+                batches = [
+                    pending[start : start + GITHUB_BATCH_SIZE]
+                    for start in range(0, len(pending), GITHUB_BATCH_SIZE)
+                ]
+                for batch in executor.map(_graphql_latest_versions, batches):
+                    fetched.update(batch)
+            else:
+                fetched = dict(
+                    _zip_strict(
+                        pending, executor.map(get_latest_github_repo_version, pending)
+                    )
+                )
+        _write_latest_versions("github", fetched)
+    return {
+        repo_url: (cached[repo_url] if repo_url in cached else fetched[repo_url])
+        for repo_url in repo_urls
+    }
+
+
+def _github_owner_name(url_src: str) -> Union[tuple[str, str], None]:
+    """Return the owner and name of a GitHub repo URL, None for other hosts."""
+    if not url_src.lower().startswith(f"{GITHUB_URL.lower()}/"):
+        return None
+    parts = url_src[len(GITHUB_URL) + 1 :].strip("/").split("/")
+    if len(parts) != 2:
+        return None
+    owner, name = parts
+    return owner, name[:-4] if name.endswith(".git") else name
+
+
+def _graphql_release_query(count: int) -> str:
+    """Return a GraphQL query for the latest release and tag of count repos.
+
+    Each repository is an aliased field r<n> taking the variables o<n> and
+    n<n>, so one query serves any batch of that size.
+    """
+    variables = ", ".join(f"$o{i}: String!, $n{i}: String!" for i in range(count))
+    fields = " ".join(
+        f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...release }}"
+        for i in range(count)
+    )
+    return (
+        f"query({variables}) {{ {fields} rateLimit {{ cost remaining resetAt }} }} "
+        "fragment release on Repository { latestRelease { name tagName } "
+        'refs(refPrefix: "refs/tags/", first: 1, '
+        "orderBy: {field: TAG_COMMIT_DATE, direction: DESC}) { nodes { name } } }"
+    )
+
+
+def _graphql_latest_versions(repo_urls: list[str]) -> dict[str, Union[str, int]]:
+    """Return the latest release of a batch of GitHub repos from one query.
+
+    The release name is used, then its tag, then the most recent tag for
+    repos without a release. Repos that are not on GitHub, do not exist or
+    have neither get 0.
+
+    Parameters
+    ----------
+    repo_urls : list[str]
+        At most ``GITHUB_BATCH_SIZE`` GitHub repo URLs.
+
+    Returns
+    -------
+    versions : dict
+        Dictionary of repo URL to latest version, 0 if there is none.
+
+    Raises
+    ------
+    requests.RequestException:
+        If the request fails or the response does not hold a field for every
+        GitHub repo of the batch.
+    """
+    # Third party modules
+    import requests
+
+    versions: dict[str, Union[str, int]] = dict.fromkeys(repo_urls, 0)
+    repos = {
+        repo_url: owner_name
+        for repo_url in repo_urls
+        if (owner_name := _github_owner_name(repo_url))
+    }
+    if not repos:
+        return versions
+    variables = {}
+    for i, (owner, name) in enumerate(repos.values()):
+        variables[f"o{i}"] = owner
+        variables[f"n{i}"] = name
+    query = {"query": _graphql_release_query(len(repos)), "variables": variables}
+    with stats.timed("github_graphql"):
+        r = _github_request("POST", GITHUB_GRAPHQL_URL, "graphql", json=query)
+    r.raise_for_status()
+    document = r.json()
+    data = document.get("data")
+    if not data:
+        raise requests.HTTPError(f"GraphQL query failed: {document}", response=r)
+    missing = [f"r{i}" for i in range(len(repos)) if f"r{i}" not in data]
+    if missing:
+        raise requests.HTTPError(
+            f"GraphQL response lacks {len(missing)} of {len(repos)} repos: {missing}",
+            response=r,
+        )
+    logger.debug("GraphQL rate limit: %s", data.get("rateLimit"))
+    for i, repo_url in enumerate(repos):
+        repository = data.get(f"r{i}") or {}
+        release = repository.get("latestRelease") or {}
+        tags = (repository.get("refs") or {}).get("nodes") or [{}]
+        version = release.get("name") or release.get("tagName") or tags[0].get("name")
+        versions[repo_url] = version or 0
+    return versions
+
+
+def _pypi_json_version(name: str) -> Union[str, int]:
+    """Return info.version from the PyPI JSON API, reading the whole document."""
+    dst_url = f"{PYPI_INDEX_URL}/pypi/{name}/json"
+    r = _http_get(dst_url, headers={"Accept": "application/json"})
+    if r.status_code == 404:
+        return 0
+    r.raise_for_status()
+    return r.json()["info"]["version"]
+
+
+def _pypi_stream_version(name: str) -> Union[str, int]:
+    """Return info.version from the PyPI JSON API, stopping once it is read.
+
+    'info' is the first member of the document, so the response is streamed
+    and closed as soon as its 'version' value has been seen, leaving the
+    release and file listings undownloaded. Escaped quotes inside strings
+    such as the description cannot match the pattern. Bodies no larger than
+    ``PYPI_DRAIN_LIMIT`` are read to the end so the connection can be reused.
+    """
+    dst_url = f"{PYPI_INDEX_URL}/pypi/{name}/json"
+    r = _http_get(dst_url, headers={"Accept": "application/json"}, stream=True)
     try:
-        r = requests.get(dst_url, headers=headers, timeout=15)
-        data = r.json()
-        version = data.get("name", 0)
-        if not version:
-            logger.debug("0 - for %s", url_src)
+        if r.status_code == 404:
             return 0
-        else:
-            logger.debug("%s - for %s", version, url_src)
-            return version
-    except requests.exceptions.RequestException as e:
-        raise SystemExit(e) from None
+        r.raise_for_status()
+        buffer = b""
+        for chunk in r.iter_content(chunk_size=PYPI_STREAM_CHUNK):
+            buffer += chunk
+            match = PYPI_INFO_VERSION.search(buffer)
+            if match:
+                logger.debug("read %s bytes for %s", len(buffer), name)
+                length = r.headers.get("Content-Length")
+                if length and int(length) <= PYPI_DRAIN_LIMIT:
+                    for chunk in r.iter_content(chunk_size=PYPI_STREAM_CHUNK):
+                        buffer += chunk
+                stats.record_bytes(dst_url, len(buffer))
+                return json.loads(b'"' + match.group(1) + b'"')
+        stats.record_bytes(dst_url, len(buffer))
+        return json.loads(buffer)["info"]["version"]
+    finally:
+        r.close()
+
+
+def _pypi_simple_version(name: str) -> Union[str, int]:
+    """Return the latest final release from the JSON Simple API (PEP 691/700).
+
+    The 'versions' list of the project page is used, skipping pre-releases,
+    development releases and versions whose files are all yanked.
+    """
+    dst_url = f"{PYPI_INDEX_URL}/simple/{_normalize_name(name)}/"
+    r = _http_get(dst_url, headers={"Accept": "application/vnd.pypi.simple.v1+json"})
+    if r.status_code == 404:
+        return 0
+    r.raise_for_status()
+    return _simple_latest_version(r.json())
+
+
+def _simple_latest_version(data: dict) -> Union[str, int]:
+    """Return the latest live final release of a JSON Simple API project page."""
+    files = data.get("files", [])
+    live = {_dist_version(file["filename"]) for file in files if not file.get("yanked")}
+    versions = [
+        version
+        for version in data.get("versions", [])
+        if not PRE_RELEASE.search(version) and (not files or version in live)
+    ]
+    if not versions:
+        return 0
+    return max(versions, key=_version_key)
+
+
+def _dist_version(filename: str) -> str:
+    """Return the version part of a wheel or sdist file name."""
+    if filename.endswith(".whl"):
+        return filename.split("-")[1]
+    return DIST_SUFFIX.sub("", filename).rsplit("-", 1)[-1]
+
+
+def _version_key(version: str) -> tuple:
+    """Return a sort key ordering release versions numerically."""
+    return tuple(int(part) for part in re.findall(r"\d+", version))
 
 
 def get_latest_pypi_repo_version(name: str) -> Union[str, int]:
     """Given a repository name , find the latest version utilizing PyPI API.
 
+    The lookup method is chosen by ``PYPI_FETCH_MODE``:
+    'stream' reads the JSON API only up to info.version, 'simple' uses the
+    JSON Simple API versions list and 'json' downloads the full JSON API
+    document. The index is ``PYPI_INDEX_URL``.
+
     Parameters
     ----------
     name : str
@@ -207,133 +1137,652 @@ def get_latest_pypi_repo_version(name: str) -> Union[str, int]:
     Raises
     ------
     SystemExit:
-        if requests.get() operations fails for any reason.
+        if the GET request fails for any reason, including an error status
+        other than 404.
     """
-    logger.debug("starting **** get_precommit_repos ****")
-    int_url = "https://pypi.org/pypi/<project>/json"
-    dst_url = int_url.replace("<project>", name)
-    headers = {"Accept": "application/json"}
+    logger.debug("starting **** get_latest_pypi_repo_version ****")
+    # Third party modules
+    import requests
+
+    fetchers = {
+        "json": _pypi_json_version,
+        "simple": _pypi_simple_version,
+        "stream": _pypi_stream_version,
+    }
     try:
-        r = requests.get(dst_url, headers=headers, timeout=15)
-        data = r.json()
-        if data.get("message", 0) == "Not Found":
-            logger.debug("0 - for %s", name)
-            return 0
-        else:
-            version = data["info"]["version"]
-            logger.debug("%s - for %s", version, name)
-            return version
+        with stats.timed("pypi"):
+            version = fetchers[PYPI_FETCH_MODE](name)
     except requests.exceptions.RequestException as e:
         raise SystemExit(e) from None
+    logger.debug("%s - for %s", version, name)
+    return version
 
 
-def generate_db(force: int = 0) -> dict[str, str]:
-    """Generate a mapping from pre-commit repo to PyPI repo.
-
-    Generates a dictionary data structure:
-    key : pre-commit URL
-    value : PyPi project name
-    e.g. {"https://github.com/pre-commit/pre-commit-hooks": "pre-commit-hooks",}
+def _resolve_pypi_project(repo_url: str) -> tuple[str, str]:
+    """Return the PyPI project name mapped to a pre-commit repo URL.
 
     Parameters
     ----------
-    force : int
-        When set to 1 will force the generation of a new mapping
+    repo_url : str
+        The lower-cased URL of the pre-commit repository.
 
     Returns
     -------
-    mapping : dict
-        the mapping dictionary
+    project : str
+        The PyPI project name, or an empty string if there is no PyPI project.
+    version : str
+        The latest version found on PyPI, or an empty string if not probed.
     """
-    logger.debug("starting **** generate_db ****")
+    if repo_url in MANUAL_MAPPING:
+        logger.debug("adding value from manual mapping dict")
+        return MANUAL_MAPPING[repo_url], ""
+    *_, project = normalize_url(repo_url).split("/")
+    result = get_latest_pypi_repo_version(project)
+    if result != 0:
+        logger.debug("project found on PyPI...mapping value to key")
+        return project, str(result)
+    return "", ""
 
-    def generate_file() -> dict:
-        """Create the mapping dictionary if it does not exist or is out of date."""
-        mapping_db = {}
-        pyrepos = get_precommit_repos()
-        logger.debug("List of precommit repositories: %s", pyrepos)
-        for repo in tqdm(pyrepos):
-            inta_repo, *_ = repo
-            inta_repo = inta_repo.lower()
-            mapping_db[inta_repo] = ""
-            if inta_repo in MANUAL_MAPPING:
-                logger.debug("adding value from manual mapping dict")
-                mapping_db[inta_repo] = MANUAL_MAPPING[inta_repo]
-            else:
-                *_, project = inta_repo.split("/")
-                result = get_latest_pypi_repo_version(project)
-                if result != 0:
-                    logger.debug("project found on PyPI...mapping value to key")
-                    mapping_db[inta_repo] = project
-        with as_file(MAPPING_FILE) as mapping_path:
-            mapping_path.write_text(json.dumps(mapping_db), encoding="utf-8")
-        return mapping_db
-
-    with as_file(MAPPING_FILE) as mapping_file:
-        if not mapping_file.exists() or force == 1 or mapping_file.stat().st_size < 5:
-            logger.debug("Generating new mapping")
-            mapping = generate_file()
-        elif int(time.time() - os.path.getmtime(mapping_file)) > REGEN_PERIOD:
-            logger.debug("mapping expired... Generating a new mapping")
-            mapping = generate_file()
-        else:
-            logger.debug("Reusing mapping")
-            mapping = json.loads(MAPPING_FILE.read_text(encoding="utf-8"))
-    return mapping
 
+def _mapping_entry(project: str, source: str, resolved: int = 0) -> dict:
+    """Return a mapping store entry for a resolved pre-commit repo.
 
-def find_yaml_config_file() -> Path:
-    """Find the '.pre-commit-config.yaml' config file in the project directory.
+    Parameters
+    ----------
+    project : str
+        The PyPI project name, an empty string records a miss.
+    source : str
+        How the value was resolved: 'manual', 'pypi' or 'heuristic'.
+    resolved : int
+        Epoch seconds of the resolution, defaults to now.
 
     Returns
     -------
-    pc_file : Path
-        Path object for the configuration file.
+    entry : dict
+        e.g. {"project": "mypy", "result": "hit", "source": "manual",
+        "resolved": 1700000000}
+    """
+    return {
+        "project": project,
+        "result": "hit" if project else "miss",
+        "source": source,
+        "resolved": resolved or int(time.time()),
+    }
 
-    Raises
-    ------
-    FileNotFoundError :
-        If the config file cannot be found.
+
+def _entry_expired(repo_url: str, entry: dict, now: float) -> bool:
+    """Return True if a mapping store entry has outlived its TTL.
+
+    Hits live for ``REGEN_PERIOD`` and misses for ``MISS_TTL``. Each TTL is
+    shortened by up to ``TTL_JITTER`` using a hash of the URL, so entries
+    resolved together expire over a window rather than all at once.
     """
-    logger.debug("starting **** find_yaml_config_file ****")
-    file_list_text = list(ROOT_DIR.iterdir())
-    file_list_path = [Path(i) for i in file_list_text]
-    for filepath in file_list_path:
-        if filepath.name == PRECOMMIT_CONFIG_FILE:
-            pc_file = filepath
-            logger.debug("found file: %s", pc_file)
-            return pc_file
-    raise FileNotFoundError(f"Cannot locate {PRECOMMIT_CONFIG_FILE!r}")
+    ttl = REGEN_PERIOD if entry["result"] == "hit" else MISS_TTL
+    jitter = (zlib.crc32(repo_url.encode("utf-8")) % 1000) / 1000 * TTL_JITTER
+    return now - entry["resolved"] > ttl * (1 - jitter)
 
 
-def yaml_to_dict(yaml_file: Path) -> dict:
-    """Get a list of repositories from the pre-commit config file.
+def _read_mapping_file(mapping_path: Path) -> dict[str, dict]:
+    """Read a mapping.json file, upgrading the legacy flat format.
 
-    yaml data structure in python is {"repos": [ { }, { }, { } ] }
-    so to get an individual repo & rev:
-    1st repo - data["repos"][0]["repo"]
-    1st rev - data["repos"][0]["rev"]
+    Legacy files map the URL straight to the project name. Their entries are
+    given the file modification time and the 'heuristic' source.
 
     Parameters
     ----------
-    yaml_file : Path
-        Pathlib.Path object to configuration file.
+    mapping_path : Path
+        The path to the mapping file.
 
     Returns
     -------
-    repos : dict
-        Dictionary object mapping repository name to version.
+    entries : dict
+        Dictionary of pre-commit URL to mapping store entry.
     """
-    logger.debug("starting **** yaml_to_dict ****")
-    with open(yaml_file) as f:
-        yaml_contents = yaml.safe_load(f)
-    repos = {}
-    for _, repo in enumerate(yaml_contents["repos"]):
-        if repo["repo"] in ("local", "meta"):
-            continue
-        version = repo["rev"]
-        version = _utility_remove_vee(version)
-        repos[repo["repo"].strip().lower()] = version.strip()
+    data = json.loads(mapping_path.read_text(encoding="utf-8"))
+    mtime = int(os.path.getmtime(mapping_path))
+    return {
+        repo_url: (
+            _mapping_entry(entry, "heuristic", mtime)
+            if isinstance(entry, str)
+            else entry
+        )
+        for repo_url, entry in data.items()
+    }
+
+
+def _upsert_entries(connection: sqlite3.Connection, entries: dict[str, dict]) -> None:
+    """Insert or update mapping store entries, recording any latest versions."""
+    connection.executemany(
+        "INSERT INTO mapping (repo_url, project, result, source, resolved) "
+        "VALUES (?, ?, ?, ?, ?) ON CONFLICT (repo_url) DO UPDATE SET "
+        "project = excluded.project, result = excluded.result, "
+        "source = excluded.source, resolved = excluded.resolved",
+        [
+            (url, e["project"], e["result"], e["source"], e["resolved"])
+            for url, e in entries.items()
+        ],
+    )
+    versions = {
+        e["project"]: e["version"] for e in entries.values() if e.get("version")
+    }
+    _upsert_latest_versions(connection, "pypi", versions)
+    connection.execute(
+        "INSERT INTO meta (key, value) VALUES ('version', '1') ON CONFLICT (key) "
+        "DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+    )
+
+
+def _upsert_latest_versions(
+    connection: sqlite3.Connection, kind: str, versions: dict[str, str]
+) -> None:
+    """Insert or update fetched latest versions of one kind."""
+    now = int(time.time())
+    connection.executemany(
+        "INSERT INTO latest_versions (kind, name, version, fetched) "
+        "VALUES (?, ?, ?, ?) ON CONFLICT (kind, name) DO UPDATE SET "
+        "version = excluded.version, fetched = excluded.fetched",
+        [(kind, name, version, now) for name, version in versions.items()],
+    )
+
+
+def _load_latest_versions(
+    kind: str, names: list[str], max_age: int
+) -> dict[str, Union[str, int]]:
+    """Return stored latest versions of one kind fetched within max_age seconds.
+
+    A stored empty version records a lookup that found no version and is
+    returned as 0.
+    """
+    oldest = int(time.time()) - max_age
+    connection = _connect_store()
+    try:
+        rows = [
+            row
+            for name in names
+            for row in connection.execute(
+                "SELECT name, version FROM latest_versions "
+                "WHERE kind = ? AND name = ? AND fetched >= ?",
+                (kind, name, oldest),
+            )
+        ]
+    finally:
+        connection.close()
+    return {name: version or 0 for name, version in rows}
+
+
+def _write_latest_versions(kind: str, versions: dict[str, Union[str, int]]) -> None:
+    """Write latest versions of one kind, 0 being stored as an empty version."""
+    connection = _connect_store()
+    try:
+        with connection:
+            _upsert_latest_versions(
+                connection,
+                kind,
+                {name: str(version or "") for name, version in versions.items()},
+            )
+    finally:
+        connection.close()
+
+
+def _connect_store() -> sqlite3.Connection:
+    """Open the SQLite metadata store in ``STORE_FILE``.
+
+    The database runs in WAL mode so concurrent pre-commit processes can read
+    while one writes. On first use the entries of ``MAPPING_FILE`` are
+    imported once.
+
+    Returns
+    -------
+    connection : sqlite3.Connection
+        An open connection, to be closed by the caller.
+    """
+    # Core Library modules
+    import sqlite3
+
+    STORE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(STORE_FILE, timeout=30)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(STORE_SCHEMA)
+    if connection.execute("SELECT 1 FROM meta WHERE key = 'imported'").fetchone():
+        return connection
+    with connection:
+        connection.execute("BEGIN IMMEDIATE")
+        if not connection.execute(
+            "SELECT 1 FROM meta WHERE key = 'imported'"
+        ).fetchone():
+            with as_file(MAPPING_FILE) as mapping_path:
+                if mapping_path.is_file() and mapping_path.stat().st_size >= 5:
+                    logger.debug("importing %s into the store", mapping_path)
+                    _upsert_entries(connection, _read_mapping_file(mapping_path))
+            connection.execute("INSERT INTO meta (key, value) VALUES ('imported', '1')")
+    return connection
+
+
+def import_mapping_file(mapping_path: Path) -> int:
+    """Import the entries of a mapping.json file into the metadata store.
+
+    Parameters
+    ----------
+    mapping_path : Path
+        The path to a mapping file, in the flat or the per-entry format.
+
+    Returns
+    -------
+    count : int
+        The number of entries imported.
+    """
+    entries = _read_mapping_file(Path(mapping_path))
+    connection = _connect_store()
+    try:
+        with connection:
+            _upsert_entries(connection, entries)
+    finally:
+        connection.close()
+    return len(entries)
+
+
+def _load_mapping(repo_urls: Union[list[str], None] = None) -> dict[str, dict]:
+    """Load mapping store entries, all of them or only the given repos.
+
+    Parameters
+    ----------
+    repo_urls : list[str]
+        Optional lower-cased repo URLs to look up.
+
+    Returns
+    -------
+    entries : dict
+        Dictionary of pre-commit URL to mapping store entry, in insertion
+        order.
+    """
+    query = "SELECT repo_url, project, result, source, resolved FROM mapping"
+    connection = _connect_store()
+    try:
+        if repo_urls is None:
+            rows = connection.execute(f"{query} ORDER BY rowid").fetchall()
+        else:
+            rows = [
+                row
+                for repo_url in repo_urls
+                for row in connection.execute(
+                    f"{query} WHERE repo_url = ?", (repo_url,)
+                )
+            ]
+    finally:
+        connection.close()
+    return {
+        url: {"project": project, "result": result, "source": source, "resolved": ts}
+        for url, project, result, source, ts in rows
+    }
+
+
+def _write_mapping(entries: dict[str, dict], replace: bool = False) -> None:
+    """Write mapping store entries in a single transaction.
+
+    Parameters
+    ----------
+    entries : dict
+        Dictionary of pre-commit URL to mapping store entry.
+    replace : bool
+        When True every other entry is removed, and the entries are stored in
+        the given order.
+    """
+    connection = _connect_store()
+    try:
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            if replace:
+                connection.execute("DELETE FROM mapping")
+            _upsert_entries(connection, entries)
+    finally:
+        connection.close()
+
+
+def _store_catalog_snapshot(pyrepos: list[list]) -> None:
+    """Record the filtered pre-commit catalog, keeping the latest snapshots."""
+    connection = _connect_store()
+    try:
+        with connection:
+            connection.execute(
+                "INSERT INTO catalog_snapshots (fetched, repo_count, repos) "
+                "VALUES (?, ?, ?)",
+                (int(time.time()), len(pyrepos), json.dumps(pyrepos)),
+            )
+            connection.execute(
+                "DELETE FROM catalog_snapshots WHERE id NOT IN (SELECT id FROM "
+                "catalog_snapshots ORDER BY id DESC LIMIT ?)",
+                (CATALOG_SNAPSHOTS,),
+            )
+    finally:
+        connection.close()
+
+
+def _store_version() -> int:
+    """Return a counter incremented by every write to the mapping store."""
+    if not STORE_FILE.is_file():
+        return 0
+    connection = _connect_store()
+    try:
+        row = connection.execute("SELECT value FROM meta WHERE key = 'version'")
+        version = row.fetchone()
+    finally:
+        connection.close()
+    return int(version[0]) if version else 0
+
+
+def _probe_repos(
+    repo_urls: list[str], workers: int, progress: Union[tqdm, None] = None
+) -> dict[str, dict]:
+    """Resolve pre-commit repos to mapping store entries concurrently.
+
+    Manual mappings are applied first, the remaining repositories are probed
+    on PyPI by a bounded thread pool.
+
+    Parameters
+    ----------
+    repo_urls : list[str]
+        The lower-cased URLs of the repos to resolve.
+    workers : int
+        The maximum number of concurrent PyPI lookups. 1 probes serially.
+    progress : tqdm
+        Optional progress bar updated once per resolved repo.
+
+    Returns
+    -------
+    entries : dict
+        Dictionary of pre-commit URL to mapping store entry, in the order of
+        ``repo_urls``. Entries probed on PyPI also carry the latest 'version'.
+    """
+    entries, pending = _manual_entries(repo_urls)
+    if progress is not None:
+        progress.update(len(entries) - len(pending))
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {
+            executor.submit(_resolve_pypi_project, repo_url): repo_url
+            for repo_url in pending
+        }
+        for future in as_completed(futures):
+            entries[futures[future]] = _probed_entry(*future.result())
+            if progress is not None:
+                progress.update()
+    return entries
+
+
+def _manual_entries(repo_urls: list[str]) -> tuple[dict[str, dict], list[str]]:
+    """Return the entries for repos in ``repo_urls`` order, and the repos to probe.
+
+    Repos in ``MANUAL_MAPPING`` get their entry, the others an empty
+    placeholder and are listed as pending.
+    """
+    entries: dict[str, dict] = dict.fromkeys(repo_urls, {})
+    pending = []
+    for repo_url in entries:
+        if repo_url in MANUAL_MAPPING:
+            entries[repo_url] = _mapping_entry(MANUAL_MAPPING[repo_url], "manual")
+        else:
+            pending.append(repo_url)
+    logger.debug("repos to probe on PyPI: %s", len(pending))
+    return entries, pending
+
+
+def _probed_entry(project: str, version: str) -> dict:
+    """Return the mapping store entry of a repo probed on PyPI."""
+    entry = _mapping_entry(project, "pypi")
+    if version:
+        entry["version"] = version
+    return entry
+
+
+def generate_db(
+    force: int = 0, workers: int = MAX_WORKERS, incremental: bool = INCREMENTAL_REGEN
+) -> dict[str, str]:
+    """Generate a mapping from pre-commit repo to PyPI repo.
+
+    Generates a dictionary data structure:
+    key : pre-commit URL
+    value : PyPi project name
+    e.g. {"https://github.com/pre-commit/pre-commit-hooks": "pre-commit-hooks",}
+
+    The mapping is kept in the SQLite store (``STORE_FILE``) with an entry per
+    repo holding the resolution time, the result (hit or miss) and the source
+    (manual, pypi or heuristic). Once any entry has expired the catalog is
+    refreshed and only expired, new or unknown repos are probed.
+
+    Parameters
+    ----------
+    force : int
+        When set to 1 the catalog is fetched again and the mapping
+        regenerated even if no entry has expired. With ``incremental`` the
+        unexpired entries are carried over, so only new and expired repos
+        are probed; pass ``incremental=False`` to probe every repo again.
+    workers : int
+        The maximum number of concurrent PyPI lookups. 1 probes serially.
+    incremental : bool
+        When True a regeneration reuses the unexpired entries of the existing
+        mapping. When False every repo is probed again.
+
+    Returns
+    -------
+    mapping : dict
+        the mapping dictionary
+    """
+    logger.debug("starting **** generate_db ****")
+    # Third party modules
+    from tqdm import tqdm
+
+    entries = _load_mapping()
+    previous = _regeneration_base(entries, force, incremental)
+    if previous is not None:
+        stats.increment("mapping_regenerations")
+        pyrepos = get_precommit_repos()
+        logger.debug("List of precommit repositories: %s", pyrepos)
+        plan, pending = _plan_regeneration(previous, pyrepos)
+        stats.record_cache("mapping", len(plan) - len(pending), len(pending))
+        with tqdm(total=len(plan)) as progress:
+            progress.update(len(plan) - len(pending))
+            entries = _merge_plan(plan, _probe_repos(pending, workers, progress))
+        _write_mapping(entries, replace=True)
+    return {repo_url: entry["project"] for repo_url, entry in entries.items()}
+
+
+def _regeneration_base(
+    entries: dict[str, dict], force: int, incremental: bool
+) -> Union[dict[str, dict], None]:
+    """Decide whether the mapping store has to be regenerated.
+
+    Returns
+    -------
+    previous : dict
+        The entries to carry over into the new mapping, empty for a full
+        regeneration, or None if the stored mapping can be reused.
+    """
+    if not entries:
+        logger.debug("Generating new mapping")
+        return {}
+    now = time.time()
+    expired = sum(
+        _entry_expired(repo_url, entry, now) for repo_url, entry in entries.items()
+    )
+    if force == 1:
+        logger.debug("Forced regeneration of mapping")
+    elif expired:
+        logger.debug("%s mapping entries expired... refreshing", expired)
+    else:
+        logger.debug("Reusing mapping")
+        stats.record_cache("mapping", hits=len(entries))
+        return None
+    return entries if incremental else {}
+
+
+def _plan_regeneration(
+    previous: dict[str, dict], pyrepos: list[list]
+) -> tuple[dict[str, Union[dict, None]], list[str]]:
+    """Lay out a regenerated mapping from the catalog and the previous mapping.
+
+    The dictionary keeps the catalog order so the mapping is identical
+    regardless of the number of workers. Unexpired entries of the previous
+    mapping are carried over and repos no longer in the catalog are dropped.
+
+    Returns
+    -------
+    mapping_db : dict
+        Dictionary of repo URL to carried over entry, None for repos to probe.
+    pending : list[str]
+        The repos to probe.
+    """
+    _store_catalog_snapshot(pyrepos)
+    repo_urls = [repo[0].lower() for repo in pyrepos]
+    now = time.time()
+    mapping_db = {
+        repo_url: (
+            previous[repo_url]
+            if repo_url in previous
+            and repo_url not in MANUAL_MAPPING
+            and not _entry_expired(repo_url, previous[repo_url], now)
+            else None
+        )
+        for repo_url in repo_urls
+    }
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "repos removed from catalog: %s",
+            len(previous.keys() - mapping_db.keys()),
+        )
+    pending = [repo_url for repo_url, entry in mapping_db.items() if not entry]
+    return mapping_db, pending
+
+
+def _merge_plan(
+    plan: dict[str, Union[dict, None]], probed: dict[str, dict]
+) -> dict[str, dict]:
+    """Fill the repos left to probe in a regeneration plan with their entries."""
+    return {repo_url: entry or probed[repo_url] for repo_url, entry in plan.items()}
+
+
+def resolve_repos(repo_urls: list[str], workers: int = MAX_WORKERS) -> dict[str, str]:
+    """Resolve only the given pre-commit repos to PyPI projects.
+
+    This is the lazy alternative to ``generate_db``: the pre-commit.com catalog
+    is not downloaded and only the repos used by the pre-commit config are
+    looked up in the store, under the keys given by ``_mapping_keys``.
+    Unexpired entries are reused, the others are resolved concurrently and
+    upserted into the store.
+
+    Parameters
+    ----------
+    repo_urls : list[str]
+        The URLs of the repos to resolve e.g. the keys from ``yaml_to_dict``.
+    workers : int
+        The maximum number of concurrent PyPI lookups. 1 probes serially.
+
+    Returns
+    -------
+    mapping : dict
+        The mapping dictionary for the requested repos only.
+    """
+    logger.debug("starting **** resolve_repos ****")
+    keys = _mapping_keys(repo_urls)
+    store_urls = list(dict.fromkeys(keys.values()))
+    entries = _load_mapping(store_urls)
+    pending = _stale_repos(store_urls, entries)
+    stats.record_cache("mapping", len(store_urls) - len(pending), len(pending))
+    if pending:
+        logger.debug("resolving %s repos on demand", len(pending))
+        resolved = _probe_repos(pending, workers)
+        _write_mapping(resolved)
+        entries.update(resolved)
+    return {repo_url: entries[key]["project"] for repo_url, key in keys.items()}
+
+
+def _mapping_keys(repo_urls: list[str]) -> dict[str, str]:
+    """Return the mapping store key of each pre-commit repo URL.
+
+    A URL the saved hook catalog finds with ``HookCatalog.get`` is keyed on
+    the catalog URL, as ``generate_db`` keys it, so e.g.
+    'https://github.com/PSF/black.git/' shares the entry of
+    'https://github.com/psf/black'. Other URLs are keyed once normalized by
+    ``normalize_url``. The catalog is never downloaded here.
+
+    Returns
+    -------
+    keys : dict
+        Dictionary of lower-cased repo URL to its store key.
+    """
+    catalog = _saved_hook_catalog()
+    keys = {}
+    for repo_url in repo_urls:
+        repo = catalog.get(normalize_url(repo_url))
+        key = repo.url.lower() if repo is not None else normalize_url(repo_url)
+        keys[repo_url.lower()] = key
+    return keys
+
+
+def _stale_repos(repo_urls: list[str], entries: dict[str, dict]) -> list[str]:
+    """Return the repos without a stored entry or whose entry has expired."""
+    now = time.time()
+    return [
+        repo_url
+        for repo_url in repo_urls
+        if repo_url not in entries or _entry_expired(repo_url, entries[repo_url], now)
+    ]
+
+
+def find_yaml_config_file() -> Path:
+    """Find the '.pre-commit-config.yaml' config file in the project directory.
+
+    Returns
+    -------
+    pc_file : Path
+        Path object for the configuration file.
+
+    Raises
+    ------
+    FileNotFoundError :
+        If the config file cannot be found.
+    """
+    logger.debug("starting **** find_yaml_config_file ****")
+    file_list_text = list(ROOT_DIR.iterdir())
+    file_list_path = [Path(i) for i in file_list_text]
+    for filepath in file_list_path:
+        if filepath.name == PRECOMMIT_CONFIG_FILE:
+            pc_file = filepath
+            logger.debug("found file: %s", pc_file)
+            return pc_file
+    raise FileNotFoundError(f"Cannot locate {PRECOMMIT_CONFIG_FILE!r}")
+
+
+def yaml_to_dict(yaml_file: Path) -> dict:
+    """Get a list of repositories from the pre-commit config file.
+
+    yaml data structure in python is {"repos": [ { }, { }, { } ] }
+    so to get an individual repo & rev:
+    1st repo - data["repos"][0]["repo"]
+    1st rev - data["repos"][0]["rev"]
+
+    Parameters
+    ----------
+    yaml_file : Path
+        Pathlib.Path object to configuration file.
+
+    Returns
+    -------
+    repos : dict
+        Dictionary object mapping repository name to version.
+    """
+    logger.debug("starting **** yaml_to_dict ****")
+    # Third party modules
+    import yaml
+
+    with open(yaml_file) as f:
+        yaml_contents = yaml.safe_load(f)
+    repos = {}
+    for _, repo in enumerate(yaml_contents["repos"]):
+        if repo["repo"] in ("local", "meta"):
+            continue
+        version = repo["rev"]
+        version = _utility_remove_vee(version)
+        repos[repo["repo"].strip().lower()] = version.strip()
     logger.debug("%s", repos)
     return repos
 
@@ -351,21 +1800,120 @@ def update_yaml(yaml_file: Path, repo: str, version: str) -> None:
         String representation of the version to apply.
     """
     logger.debug("starting **** update_yaml ****")
-    found_index = -1
-    version = _utility_remove_vee(version)
-    repo_list = yaml_to_dict(yaml_file)
-    for index, file_repo in enumerate(repo_list):
-        if repo in file_repo:
-            found_index = index
-            break
-    if found_index == -1:
-        raise NameError(f"Repository {repo} not found in 'pre-commit-config' file")
-    with open(yaml_file) as f:
-        yaml_contents = yaml.safe_load(f)
-        yaml_contents["repos"][found_index]["rev"] = version
-    with open(yaml_file, mode="w", encoding="utf-8") as file:
-        yaml.dump(yaml_contents, file, sort_keys=False, indent=4)
+    update_yaml_batch(yaml_file, {repo: version})
+
+
+def _locate_yaml_revs(yaml_text: str) -> list[tuple[str, yaml.ScalarNode]]:
+    """Return the repo URL and the 'rev' scalar node of each configured repo.
+
+    The text is composed into a node graph rather than loaded, so each node
+    carries the start and end marks of its position in the text.
+
+    Parameters
+    ----------
+    yaml_text : str
+        The contents of the pre-commit config file.
+
+    Returns
+    -------
+    revs : list[tuple]
+        e.g. [('https://github.com/psf/black', ScalarNode(...)), ...], the URLs
+        normalized by ``normalize_url``.
+    """
+    # Third party modules
+    import yaml
+
+    root = yaml.compose(yaml_text, Loader=yaml.SafeLoader)
+    revs: list[tuple[str, yaml.ScalarNode]] = []
+    if root is None:
+        return revs
+    for key, value in root.value:
+        if key.value != "repos":
+            continue
+        for repo_node in value.value:
+            fields = {field.value: node for field, node in repo_node.value}
+            if "repo" in fields and "rev" in fields:
+                revs.append((normalize_url(fields["repo"].value), fields["rev"]))
+    return revs
+
+
+def _format_yaml_scalar(version: str, node: yaml.ScalarNode) -> str:
+    """Render a version string in the quoting style of the scalar it replaces.
+
+    A plain scalar stays plain unless it would no longer load as the same
+    string (e.g. '23.0' loads as a float), in which case it is single-quoted.
+    """
+    if node.style == "'":
+        return "'{}'".format(version.replace("'", "''"))
+    if node.style == '"':
+        return json.dumps(version)
+    # Third party modules
+    import yaml
+
+    if yaml.safe_load(version) != version:
+        return "'{}'".format(version.replace("'", "''"))
+    return version
+
+
+def update_yaml_batch(yaml_file: Path, updates: dict[str, str]) -> None:
+    """Update several repos in the '.pre-commit-config.yaml' file in one pass.
+
+    The file is parsed once and each 'rev' value is located by its offset in
+    the text. Only the version strings are spliced in, so comments, ordering
+    and formatting of the rest of the file stay byte-identical. The result is
+    written once to a temporary file that atomically replaces the original.
+    Repository URLs are compared exactly once normalized by ``normalize_url``,
+    and every 'rev' of a repository listed more than once is updated.
+
+    Parameters
+    ----------
+    yaml_file : Path
+        pathlib.Path object to the pre-commit config file.
+    updates : dict
+        Dictionary mapping the repository URL to the version to apply.
+        e.g. {'https://github.com/psf/black': '23.0.0'}
+
+    Raises
+    ------
+    NameError :
+        If a repository is not found in the config file.
+    ValueError :
+        If two updates give different versions to the same repository.
+    """
+    logger.debug("starting **** update_yaml_batch ****")
+    if not updates:
+        return
+    with open(yaml_file, encoding="utf-8", newline="") as f:
+        yaml_text = f.read()
+    rev_nodes: dict[str, list[yaml.ScalarNode]] = {}
+    for file_repo, node in _locate_yaml_revs(yaml_text):
+        rev_nodes.setdefault(file_repo, []).append(node)
+    configured = HookCatalog(HookRepo(url, (), (), (), ()) for url in rev_nodes)
+    splices: dict[int, tuple[int, str, str]] = {}
+    for repo, version in updates.items():
+        found = configured.get(normalize_url(repo))
+        if found is None:
+            raise NameError(f"Repository {repo} not found in 'pre-commit-config' file")
+        version = _utility_remove_vee(version)
+        for rev_node in rev_nodes[found.url]:
+            start = rev_node.start_mark.index
+            if start in splices and splices[start][2] != version:
+                raise ValueError(
+                    f"Conflicting versions for {repo}: {splices[start][2]}, {version}"
+                )
+            splices[start] = (
+                rev_node.end_mark.index,
+                _format_yaml_scalar(version, rev_node),
+                version,
+            )
         logger.debug("%s updated to version %s", repo, version)
+    for start, (end, text, _) in sorted(splices.items(), reverse=True):
+        yaml_text = "".join([yaml_text[:start], text, yaml_text[end:]])
+    tmp_file = yaml_file.with_name(f"{yaml_file.name}.{os.getpid()}.tmp")
+    with open(tmp_file, mode="w", encoding="utf-8", newline="") as file:
+        file.write(yaml_text)
+    os.replace(tmp_file, yaml_file)
+    stats.increment("yaml_rewrites")
 
 
 def find_requirements_file() -> Any:
@@ -380,39 +1928,142 @@ def find_requirements_file() -> Any:
         The pathlib.Path object to the derived requirement file.
     """
     logger.debug("starting **** find_requirements_file function ****")
-    logger.debug("root requirement: %s", ROOT_REQUIREMENT)
+    result = find_requirements_chain()[-1]
+    filename = "".join([result.stem, result.suffix])
+    logger.debug("Found requirement file: %s", filename)
+    return result
+
+
+def _resolve_include(include: str, parent: Path) -> Path:
+    """Return the path of a requirements file referenced from another file.
+
+    The path is taken relative to the including file as pip does, falling back
+    to a project-wide partial path search.
+
+    Raises
+    ------
+    FileNotFoundError :
+        If no file matches the reference.
+    NameError :
+        If more than one file matches the reference.
+    """
+    candidate = parent.parent / include
+    if candidate.is_file():
+        return candidate
+    found = find_file_candidates(include)
+    if not found:
+        raise FileNotFoundError("No Files found")
+    if len(found) > 1:
+        logger.debug("found %s", found)
+        raise NameError(
+            f"Ambiguous result - more than one file found: {', '.join(map(str, found))}"
+        )
+    return found[0]
+
+
+def _read_text(file: Path) -> str:
+    """Return the text of a file, read from disk once per modification.
+
+    The text is cached under the file's modification time and size, so the
+    requirements graph, the run cache key and the parsers share a single read
+    of each file. ``main`` clears the cache at the start of a run.
+    """
+    status = os.stat(file)
+    return _read_text_version(Path(file), status.st_mtime_ns, status.st_size)
 
-    def next_file(req_file: Path) -> Any:
-        with open(req_file) as f:
-            lines = f.read()
-            if "autogenerated by pip-compile" in lines:
-                return req_file, 1
-        with open(req_file) as f:
-            lines = f.readlines()  # type: ignore
-            for line in lines:
-                if "-r " in line:
-                    _, next_req = line.split(" ")
-                    next_req = next_req.strip()
-                    next_req = _utility_find_file_path(next_req)  # type: ignore
-                    if next_req == 0:
-                        raise FileNotFoundError("No Files found")
-                    if next_req == 1:
-                        logger.debug("found %s", next_req)
-                        raise NameError("Ambiguous result - more than one file found")
-                    return next_req, 0
-                else:
-                    raise FileNotFoundError(
-                        "Requirement file generated by piptools " "Not found..."
-                    )
 
-    final = 0
-    result = ROOT_REQUIREMENT
-    while final == 0:
-        result, final = next_file(result)
-    if final == 1:
-        filename = "".join([result.stem, result.suffix])
-        logger.debug("Found requirement file: %s", filename)
-        return result
+@lru_cache(maxsize=64)
+def _read_text_version(file: Path, mtime_ns: int, size: int) -> str:
+    """Read the text of a file, cached by ``_read_text``."""
+    with open(file, encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+def build_requirements_graph(root: Union[Path, None] = None) -> dict[Path, dict]:
+    """Build the include graph of the requirements files below a root file.
+
+    Each file is read once through ``_read_text``, so later steps reuse the
+    text. Every -r/--requirement and -c/--constraint
+    reference is followed, except from pip-compile outputs which are leaves.
+
+    Parameters
+    ----------
+    root : Path
+        The root requirements file, defaults to ``ROOT_REQUIREMENT``.
+
+    Returns
+    -------
+    graph : dict
+        Dictionary mapping each file to its node, in discovery order.
+        e.g. {Path('requirements.txt'): {'includes': [Path('dev.txt')],
+        'compiled': False}, Path('dev.txt'): {'includes': [], 'compiled': True}}
+
+    Raises
+    ------
+    ValueError :
+        If the include references form a cycle.
+    """
+    logger.debug("starting **** build_requirements_graph function ****")
+    graph: dict[Path, dict] = {}
+    path: list[Path] = []
+
+    def visit(req_file: Path) -> None:
+        if req_file in path:
+            cycle = " -> ".join(str(node) for node in (*path, req_file))
+            raise ValueError(f"Cycle in requirements includes: {cycle}")
+        if req_file in graph:
+            return
+        text = _read_text(req_file)
+        node: dict = {"includes": [], "compiled": PIP_COMPILE_MARKER in text}
+        graph[req_file] = node
+        if node["compiled"]:
+            return
+        path.append(req_file)
+        for line in text.splitlines():
+            match = REQUIREMENT_INCLUDE.match(line)
+            if match:
+                include = _resolve_include(match.group(1), req_file)
+                node["includes"].append(include)
+                visit(include)
+        path.pop()
+
+    visit(Path(root or ROOT_REQUIREMENT))
+    return graph
+
+
+def find_compiled_leaves(graph: dict[Path, dict]) -> list[Path]:
+    """Return the pip-compile generated files of a requirements include graph."""
+    return [req_file for req_file, node in graph.items() if node["compiled"]]
+
+
+def find_requirements_chain() -> list[Path]:
+    """Find the chain of layered requirements files down to the piptools file.
+
+    The first reference of each file is followed from ``ROOT_REQUIREMENT``
+    through the include graph until a pip-tools generated file is reached.
+
+    Returns
+    -------
+    chain : list[Path]
+        The requirement files followed from ``ROOT_REQUIREMENT``, the last one
+        being the pip-tools generated file.
+
+    Raises
+    ------
+    FileNotFoundError :
+        If the chain ends before reaching a pip-tools generated file.
+    """
+    logger.debug("starting **** find_requirements_chain function ****")
+    logger.debug("root requirement: %s", ROOT_REQUIREMENT)
+    graph = build_requirements_graph(ROOT_REQUIREMENT)
+    chain = [Path(ROOT_REQUIREMENT)]
+    while not graph[chain[-1]]["compiled"]:
+        if not graph[chain[-1]]["includes"]:
+            raise FileNotFoundError(
+                "Requirement file generated by piptools " "Not found..."
+            )
+        chain.append(graph[chain[-1]]["includes"][0])
+    return chain
 
 
 def get_installed_version(package: str) -> Union[str, None]:
@@ -435,6 +2086,9 @@ def get_installed_version(package: str) -> Union[str, None]:
         if the package is not found
     """
     logger.debug("starting **** get_installed_version function ****")
+    # Core Library modules
+    from importlib.metadata import PackageNotFoundError, version as ver
+
     try:
         installed_version = ver(package)
         logger.debug("package version found: %s", installed_version)
@@ -444,6 +2098,45 @@ def get_installed_version(package: str) -> Union[str, None]:
         return None
 
 
+def _normalize_name(name: str) -> str:
+    """Return the PEP 503 normalized form of a project name."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def parse_requirements(req_file: Path) -> dict[str, str]:
+    """Parse a requirements file into a table of pinned versions.
+
+    The text comes from ``_read_text``, so a file already read by
+    ``build_requirements_graph`` is not read again. Comments, options (-r, -c,
+    --index-url ...) and continuation lines such as '--hash=' are skipped
+    without further work. Extras, environment markers and inline comments are
+    ignored.
+
+    Parameters
+    ----------
+    req_file : Path
+        pathlib.Path object for a requirements file.
+
+    Returns
+    -------
+    versions : dict
+        A Dictionary comprising key: PEP 503 normalized package name,
+        Value: the pinned version e.g. {'click': '8.1.3'}
+    """
+    versions = {}
+    continued = False
+    for line in _read_text(req_file).splitlines():
+        line = line.rstrip()
+        is_continuation, continued = continued, line.endswith("\\")
+        if is_continuation or not line or not line[0].isalnum():
+            continue
+        match = REQUIREMENT_PIN.match(line)
+        if match:
+            package, version = match.groups()
+            versions[_normalize_name(package)] = _utility_remove_vee(version)
+    return versions
+
+
 def get_requirement_versions(req_file: Path, req_list: list) -> dict:
     """Get the repo version from the requirements file.
 
@@ -461,26 +2154,629 @@ def get_requirement_versions(req_file: Path, req_list: list) -> dict:
         e.g. {'click': '8.1.3'}
     """
     logger.debug("starting **** get_requirement_versions function ****")
-    req_version_list = {}
-    with open(req_file) as f:
-        lines = f.readlines()
-        for line in lines:
-            if "==" in line:
-                package, version = line.split("==")
-                version = _utility_remove_vee(version)
-                if package in req_list:
-                    req_version_list[package.strip()] = version.strip()
-    return req_version_list
-
-
-def main() -> int:
+    return _select_versions(parse_requirements(req_file), req_list)
+
+
+def _select_versions(versions: dict[str, str], req_list: list) -> dict[str, str]:
+    """Return the pinned versions of the listed packages, keyed by those names."""
+    return {
+        package: versions[name]
+        for package in req_list
+        if package and (name := _normalize_name(package)) in versions
+    }
+
+
+def find_compiled_requirements() -> dict[str, Path]:
+    """Find every pip-tools generated requirements file in the project.
+
+    Files matching ``REQUIREMENTS_GLOBS`` below ``ROOT_DIR`` are kept if
+    their header carries the pip-compile marker. Each file is named after its
+    stem, which is taken as the environment name.
+
+    Returns
+    -------
+    req_files : dict
+        Dictionary mapping environment name to requirements file.
+        e.g. {'base': Path('.../requirements/base.txt'), ...}
+    """
+    logger.debug("starting **** find_compiled_requirements function ****")
+    req_files: dict[str, Path] = {}
+    for pattern in REQUIREMENTS_GLOBS:
+        for req_file in sorted(ROOT_DIR.glob(pattern)):
+            if not req_file.is_file() or req_file in req_files.values():
+                continue
+            if PIP_COMPILE_MARKER in _read_text(req_file)[:1024]:
+                env = req_file.stem
+                if env in req_files:
+                    env = req_file.relative_to(ROOT_DIR).with_suffix("").as_posix()
+                req_files[env] = req_file
+    logger.debug("compiled requirements files: %s", req_files)
+    return req_files
+
+
+def build_requirements_matrix(req_files: dict[str, Path]) -> dict[str, dict]:
+    """Read each requirements file once into a package version table.
+
+    Parameters
+    ----------
+    req_files : dict
+        Dictionary mapping environment name to requirements file, as returned
+        by ``find_compiled_requirements``.
+
+    Returns
+    -------
+    matrix : dict
+        Dictionary mapping normalized package name to a dictionary of
+        environment name to pinned version.
+        e.g. {'click': {'development': '8.1.3', 'test': '8.1.3'}}
+    """
+    logger.debug("starting **** build_requirements_matrix function ****")
+    matrix: dict[str, dict] = {}
+    for env, req_file in req_files.items():
+        for package, version in parse_requirements(req_file).items():
+            matrix.setdefault(package, {})[env] = version
+    return matrix
+
+
+def environment_versions(
+    matrix: dict[str, dict], env: str, packages: Union[list, None] = None
+) -> dict[str, str]:
+    """Return the pinned versions of one environment from the version table.
+
+    Parameters
+    ----------
+    matrix : dict
+        The table returned by ``build_requirements_matrix``.
+    env : str
+        The environment name e.g. 'development'.
+    packages : list
+        Optional list of packages to restrict the result to. The result is then
+        keyed by these names rather than by normalized names.
+
+    Returns
+    -------
+    req_version_list : dict
+        A Dictionary comprising key: package name, Value: the version
+
+    Raises
+    ------
+    NameError :
+        If no package is pinned in the given environment.
+    """
+    versions = {package: envs[env] for package, envs in matrix.items() if env in envs}
+    if not versions:
+        raise NameError(f"No compiled requirements found for environment {env!r}")
+    if packages is None:
+        return versions
+    return {
+        package: versions[name]
+        for package in packages
+        if package and (name := _normalize_name(package)) in versions
+    }
+
+
+def requirement_conflicts(
+    matrix: dict[str, dict], packages: Union[list, None] = None
+) -> dict[str, dict]:
+    """Return the packages pinned to different versions across environments.
+
+    Parameters
+    ----------
+    matrix : dict
+        The table returned by ``build_requirements_matrix``.
+    packages : list
+        Optional list of packages to restrict the check to.
+
+    Returns
+    -------
+    conflicts : dict
+        The entries of the table with more than one distinct version.
+    """
+    if packages is not None:
+        names = {_normalize_name(package) for package in packages if package}
+        matrix = {name: envs for name, envs in matrix.items() if name in names}
+    return {
+        package: envs for package, envs in matrix.items() if len(set(envs.values())) > 1
+    }
+
+
+def _run_cache_key(files: list[Path], settings: Union[dict, None] = None) -> str:
+    """Return a hash identifying the inputs of a run.
+
+    The key covers the package version, the contents of the given files (the
+    pre-commit config and the requirements chain), the settings that change
+    the result of a run (``RUN_CACHE_SETTINGS``) and the write counter of the
+    mapping store. The files are read through ``_read_text``.
+
+    Parameters
+    ----------
+    files : list[Path]
+        The input files of the run.
+    settings : dict
+        The settings of the run overriding the module ones, e.g.
+        {'LAZY_RESOLUTION': False}.
+
+    Returns
+    -------
+    key : str
+        Hex digest of the inputs.
+    """
+    digest = hashlib.blake2b(__version__.encode("utf-8"), digest_size=16)
+    for file in files:
+        digest.update(str(file).encode("utf-8"))
+        digest.update(_read_text(file).encode("utf-8"))
+    values = {name: globals()[name] for name in RUN_CACHE_SETTINGS}
+    values.update(settings or {})
+    digest.update(json.dumps(values, sort_keys=True, default=str).encode("utf-8"))
+    digest.update(f"store:{_store_version()}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _last_successful_run() -> Union[str, None]:
+    """Return the run key recorded by the last successful run in ``ROOT_DIR``."""
+    if not RESULT_CACHE_FILE.is_file():
+        return None
+    runs = json.loads(RESULT_CACHE_FILE.read_text(encoding="utf-8"))
+    return runs.get(str(ROOT_DIR))
+
+
+def _record_successful_run(key: str) -> None:
+    """Record the run key of a successful run in ``ROOT_DIR``."""
+    runs = {}
+    if RESULT_CACHE_FILE.is_file():
+        runs = json.loads(RESULT_CACHE_FILE.read_text(encoding="utf-8"))
+    runs[str(ROOT_DIR)] = key
+    RESULT_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = RESULT_CACHE_FILE.with_suffix(f".{os.getpid()}.tmp")
+    tmp_file.write_text(json.dumps(runs), encoding="utf-8")
+    os.replace(tmp_file, RESULT_CACHE_FILE)
+
+
+def new_async_session() -> aiohttp.ClientSession:
+    """Return an aiohttp session configured like ``get_session``.
+
+    The connector keeps up to ``MAX_WORKERS`` connections per host alive. The
+    session has to be closed by the caller, preferably with ``async with``.
+
+    Returns
+    -------
+    session : aiohttp.ClientSession
+        A new session, to be created inside a running event loop.
+    """
+    # Third party modules
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(limit_per_host=max(1, MAX_WORKERS))
+    timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+
+async def gather_bounded(coroutines: Iterable[Awaitable[T]], limit: int) -> list[T]:
+    """Run coroutines concurrently with at most ``limit`` of them at a time.
+
+    Parameters
+    ----------
+    coroutines : Iterable[Awaitable]
+        The coroutines to run.
+    limit : int
+        The maximum number of coroutines running at once. 1 runs them one
+        after the other.
+
+    Returns
+    -------
+    results : list
+        The results in the order of ``coroutines``.
+    """
+    # Core Library modules
+    import asyncio
+
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def bounded(coroutine: Awaitable[T]) -> T:
+        async with semaphore:
+            return await coroutine
+
+    return list(await asyncio.gather(*(bounded(c) for c in coroutines)))
+
+
+async def _async_get(
+    session: aiohttp.ClientSession, url: str, **kwargs: Any
+) -> aiohttp.ClientResponse:
+    """Perform a GET request with the retry policy of ``get_session``.
+
+    Connection errors, timeouts and ``HTTP_RETRY_STATUSES`` responses are
+    retried ``HTTP_RETRIES`` times with exponential backoff. The response has
+    to be released by the caller.
+    """
+    # Core Library modules
+    import asyncio
+
+    # Third party modules
+    import aiohttp
+
+    attempt = 0
+    while True:
+        start = time.perf_counter()
+        try:
+            response = await session.get(url, **kwargs)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt >= HTTP_RETRIES:
+                raise
+        else:
+            stats.record_request(url, response.status, time.perf_counter() - start)
+            if response.status not in HTTP_RETRY_STATUSES or attempt >= HTTP_RETRIES:
+                return response
+            response.release()
+        await asyncio.sleep(HTTP_BACKOFF * 2**attempt)
+        attempt += 1
+
+
+async def _revalidate_async(
+    session: aiohttp.ClientSession, url: str
+) -> Union[bytes, None]:
+    """Revalidate the cached copy of a URL, the asyncio ``_revalidate``."""
+    headers = _cache_validators(url)
+    async with await _async_get(session, url, headers=headers) as response:
+        if response.status == 304 and headers:
+            logger.debug("not modified - using cached copy of %s", url)
+            stats.record_cache("http", hits=1)
+            return None
+        response.raise_for_status()
+        body = await response.read()
+    stats.record_bytes(url, len(body))
+    stats.record_cache("http", misses=1)
+    _write_cached(url, body, response.headers)
+    return body
+
+
+async def get_precommit_repos_async(session: aiohttp.ClientSession) -> list[list]:
+    """Get a list of repos from pre-commit.com using the selected filters.
+
+    The asyncio version of ``get_precommit_repos``.
+
+    Parameters
+    ----------
+    session : aiohttp.ClientSession
+        The session to send the request with.
+
+    Returns
+    -------
+    pyrepos : list[list]
+        e.g. [['https://github.com/pre-commit/mirrors-mypy', 'mypy']]
+    """
+    body = await _revalidate_async(session, PRECOMMIT_REPOS_URL)
+    pyrepos = _hook_catalog(body).pyrepos(PRECOMMIT_FILTERS)
+    logger.debug("Number of pre-commit hooks found: %s", len(pyrepos))
+    return pyrepos
+
+
+async def _pypi_version_async(
+    session: aiohttp.ClientSession, name: str
+) -> Union[str, int]:
+    """Return the latest PyPI version of a project as selected by the fetch mode."""
+    if PYPI_FETCH_MODE == "simple":
+        url = f"{PYPI_INDEX_URL}/simple/{_normalize_name(name)}/"
+        accept = "application/vnd.pypi.simple.v1+json"
+    else:
+        url = f"{PYPI_INDEX_URL}/pypi/{name}/json"
+        accept = "application/json"
+    async with await _async_get(session, url, headers={"Accept": accept}) as r:
+        if r.status == 404:
+            return 0
+        r.raise_for_status()
+        if PYPI_FETCH_MODE != "stream":
+            body = await r.read()
+            stats.record_bytes(url, len(body))
+            if PYPI_FETCH_MODE == "simple":
+                return _simple_latest_version(json.loads(body))
+            return json.loads(body)["info"]["version"]
+        buffer = b""
+        async for chunk in r.content.iter_chunked(PYPI_STREAM_CHUNK):
+            buffer += chunk
+            match = PYPI_INFO_VERSION.search(buffer)
+            if match:
+                logger.debug("read %s bytes for %s", len(buffer), name)
+                if r.content_length and r.content_length <= PYPI_DRAIN_LIMIT:
+                    buffer += await r.content.read()
+                stats.record_bytes(url, len(buffer))
+                return json.loads(b'"' + match.group(1) + b'"')
+        stats.record_bytes(url, len(buffer))
+        return json.loads(buffer)["info"]["version"]
+
+
+async def get_latest_pypi_repo_version_async(
+    session: aiohttp.ClientSession, name: str
+) -> Union[str, int]:
+    """Given a repository name, find the latest version utilizing PyPI API.
+
+    The asyncio version of ``get_latest_pypi_repo_version``, honouring
+    ``PYPI_FETCH_MODE`` and ``PYPI_INDEX_URL`` in the same way.
+
+    Parameters
+    ----------
+    session : aiohttp.ClientSession
+        The session to send the request with.
+    name : str
+        Supplied project name. This is not the URL.
+
+    Returns
+    -------
+    version : str
+        The latest repository version.
+    0 :
+        Indicates the repository was not found.
+
+    Raises
+    ------
+    ConnectionError:
+        If the request fails, times out, or is answered with an error status
+        other than 404 or a malformed body. Unlike the synchronous version
+        this does not raise SystemExit, which would tear down the event loop
+        of the caller; ``main`` turns the error into an exit code.
+    """
+    # Core Library modules
+    import asyncio
+
+    # Third party modules
+    import aiohttp
+
+    try:
+        with stats.timed("pypi"):
+            version = await _pypi_version_async(session, name)
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        raise ConnectionError(f"PyPI lookup of {name} failed: {e!r}") from e
+    logger.debug("%s - for %s", version, name)
+    return version
+
+
+def _release_unused_token(acquired: asyncio.Future) -> None:
+    """Release the token of a scheduler acquire whose waiter was cancelled."""
+    if not acquired.cancelled() and acquired.exception() is None:
+        get_github_scheduler().release(acquired.result(), None)
+
+
+async def get_latest_github_repo_version_async(
+    session: aiohttp.ClientSession, url_src: str
+) -> Union[str, int]:
+    """Given a repo URL, return the latest version from GitHub utilizing API.
+
+    The asyncio version of ``get_latest_github_repo_version``. Requests share
+    the ``GitHubScheduler`` of the synchronous lookups, waiting for it in the
+    default executor so the event loop is never blocked. If the lookup is
+    cancelled while waiting, the token acquired afterwards is released.
+
+    Parameters
+    ----------
+    session : aiohttp.ClientSession
+        The session to send the request with.
+    url_src : str
+        The url of the GitHub repository.
+
+    Returns
+    -------
+    version : str
+        The name of the latest release, or its tag if the release is unnamed.
+    0 :
+        If the repository has no release or is not a GitHub repository, in
+        which case no request is sent.
+
+    Raises
+    ------
+    aiohttp.ClientError:
+        If the request fails, including when the rate limit still rejects it
+        after ``GITHUB_ATTEMPTS`` attempts.
+    """
+    # Core Library modules
+    import asyncio
+
+    dst_url = _github_release_url(url_src)
+    if dst_url is None:
+        logger.debug("0 - for %s, not a GitHub repository", url_src)
+        return 0
+    start = time.perf_counter()
+    scheduler = get_github_scheduler()
+    loop = asyncio.get_running_loop()
+    for attempt in range(1, GITHUB_ATTEMPTS + 1):
+        acquired = loop.run_in_executor(None, scheduler.acquire)
+        try:
+            token = await asyncio.shield(acquired)
+        except asyncio.CancelledError:
+            acquired.add_done_callback(_release_unused_token)
+            raise
+        headers = _github_headers(dst_url, token)
+        seen: Union[SimpleNamespace, None] = None
+        try:
+            r = await _async_get(session, dst_url, headers=headers)
+            seen = SimpleNamespace(status_code=r.status, headers=r.headers)
+            stats.record_bytes(dst_url, len(await r.read()))
+        finally:
+            retry = scheduler.release(token, seen)
+        if not retry:
+            break
+        logger.debug("rate limited on %s - attempt %s", url_src, attempt)
+    stats.observe("github", time.perf_counter() - start)
+    async with r:
+        if r.status == 404:
+            logger.debug("0 - for %s", url_src)
+            return 0
+        r.raise_for_status()
+        data = await r.json(content_type=None)
+    version = data.get("name") or data.get("tag_name") or 0
+    logger.debug("%s - for %s", version, url_src)
+    return version
+
+
+async def _probe_repos_async(
+    session: aiohttp.ClientSession,
+    repo_urls: list[str],
+    workers: int,
+    progress: Union[tqdm, None] = None,
+) -> dict[str, dict]:
+    """Resolve pre-commit repos to mapping store entries on the event loop.
+
+    The asyncio version of ``_probe_repos``, with at most ``workers`` PyPI
+    lookups in flight and the optional progress bar updated once per
+    resolved repo.
+    """
+
+    async def resolve(repo_url: str) -> dict:
+        *_, project = normalize_url(repo_url).split("/")
+        result = await get_latest_pypi_repo_version_async(session, project)
+        if progress is not None:
+            progress.update()
+        if result != 0:
+            return _probed_entry(project, str(result))
+        return _probed_entry("", "")
+
+    entries, pending = _manual_entries(repo_urls)
+    if progress is not None:
+        progress.update(len(entries) - len(pending))
+    probed = await gather_bounded((resolve(url) for url in pending), workers)
+    entries.update(_zip_strict(pending, probed))
+    return entries
+
+
+async def generate_db_async(
+    force: int = 0,
+    workers: int = MAX_WORKERS,
+    incremental: bool = INCREMENTAL_REGEN,
+    session: Union[aiohttp.ClientSession, None] = None,
+) -> dict[str, str]:
+    """Generate a mapping from pre-commit repo to PyPI repo.
+
+    The asyncio version of ``generate_db``, taking the same arguments and
+    keeping the same mapping store.
+
+    Parameters
+    ----------
+    force : int
+        When set to 1 the catalog is fetched again and the mapping
+        regenerated even if no entry has expired. With ``incremental`` the
+        unexpired entries are carried over, so only new and expired repos
+        are probed; pass ``incremental=False`` to probe every repo again.
+    workers : int
+        The maximum number of concurrent PyPI lookups.
+    incremental : bool
+        When True a regeneration reuses the unexpired entries of the existing
+        mapping. When False every repo is probed again.
+    session : aiohttp.ClientSession
+        Optional session to send the requests with. A session is created for
+        the call if none is given.
+
+    Returns
+    -------
+    mapping : dict
+        the mapping dictionary
+    """
+    logger.debug("starting **** generate_db_async ****")
+    # Third party modules
+    from tqdm import tqdm
+
+    if session is None:
+        async with new_async_session() as session:
+            return await generate_db_async(force, workers, incremental, session)
+    entries = _load_mapping()
+    previous = _regeneration_base(entries, force, incremental)
+    if previous is not None:
+        stats.increment("mapping_regenerations")
+        pyrepos = await get_precommit_repos_async(session)
+        plan, pending = _plan_regeneration(previous, pyrepos)
+        stats.record_cache("mapping", len(plan) - len(pending), len(pending))
+        with tqdm(total=len(plan)) as progress:
+            progress.update(len(plan) - len(pending))
+            probed = await _probe_repos_async(session, pending, workers, progress)
+        entries = _merge_plan(plan, probed)
+        _write_mapping(entries, replace=True)
+    return {repo_url: entry["project"] for repo_url, entry in entries.items()}
+
+
+async def resolve_repos_async(
+    repo_urls: list[str],
+    workers: int = MAX_WORKERS,
+    session: Union[aiohttp.ClientSession, None] = None,
+) -> dict[str, str]:
+    """Resolve only the given pre-commit repos to PyPI projects.
+
+    The asyncio version of ``resolve_repos``.
+
+    Parameters
+    ----------
+    repo_urls : list[str]
+        The URLs of the repos to resolve e.g. the keys from ``yaml_to_dict``.
+    workers : int
+        The maximum number of concurrent PyPI lookups.
+    session : aiohttp.ClientSession
+        Optional session to send the requests with. A session is created for
+        the call if any repo has to be looked up and none is given.
+
+    Returns
+    -------
+    mapping : dict
+        The mapping dictionary for the requested repos only.
+    """
+    logger.debug("starting **** resolve_repos_async ****")
+    keys = _mapping_keys(repo_urls)
+    store_urls = list(dict.fromkeys(keys.values()))
+    entries = _load_mapping(store_urls)
+    pending = _stale_repos(store_urls, entries)
+    if pending and session is None:
+        async with new_async_session() as session:
+            return await resolve_repos_async(repo_urls, workers, session)
+    stats.record_cache("mapping", len(store_urls) - len(pending), len(pending))
+    if pending:
+        logger.debug("resolving %s repos on demand", len(pending))
+        resolved = await _probe_repos_async(session, pending, workers)
+        _write_mapping(resolved)
+        entries.update(resolved)
+    return {repo_url: entries[key]["project"] for repo_url, key in keys.items()}
+
+
+def _compare_versions(
+    yaml_dict: dict, map_db: dict[str, str], req_versions: dict[str, str]
+) -> dict[str, str]:
+    """Log the pre-commit revisions differing from piptools and return them.
+
+    Returns
+    -------
+    updates : dict
+        Dictionary of repo URL to the piptools version to pin it to.
+    """
+    updates = {}
+    for repo in yaml_dict:
+        if (precommit_ver := yaml_dict[repo]) != (
+            piptools_ver := req_versions.get(pack := map_db.get(repo, ""), "-")
+        ):
+            if piptools_ver != "-":
+                logger.info(
+                    "%-15s - piptools: %-10s !=     pre-commit: %s",
+                    pack,
+                    piptools_ver,
+                    precommit_ver,
+                )
+                updates[repo] = piptools_ver
+    return updates
+
+
+async def main_async(
+    lazy: Union[bool, None] = None, env: Union[str, None] = None
+) -> int:
     """Check that pre-commit hook versions match piptools-locked package versions.
 
-    Loads settings, locates the pre-commit YAML config and the requirements
-    file, then cross-references each pre-commit repo's pinned revision
-    against the corresponding package version resolved by piptools. Any
-    mismatches are logged, and if ``UPDATE_PC_YAML_FILE`` is enabled, the
-    pre-commit config is updated in place to match the piptools version.
+    The asyncio pipeline behind ``main``. The requirements files are parsed in
+    the default executor while the repos are resolved on the event loop, and
+    with eager resolution the pre-commit config is parsed while the catalog
+    is downloaded and probed.
+
+    Parameters
+    ----------
+    lazy : bool
+        Look up only the repos of the pre-commit config (True) or build the
+        mapping of the whole catalog first (False). ``LAZY_RESOLUTION`` by
+        default.
+    env : str
+        The environment whose pip-compile generated requirements file the
+        versions are read from, ``REQUIREMENTS_ENV`` by default. Without an
+        environment the requirements chain of requirements.txt is used.
 
     Returns
     -------
@@ -488,40 +2784,231 @@ def main() -> int:
         0 if all pre-commit versions are in sync with piptools, 1 if any
         mismatches were found.
     """
+    # Core Library modules
+    import asyncio
+
+    if lazy is None:
+        lazy = LAZY_RESOLUTION
+    if env is None:
+        env = REQUIREMENTS_ENV
+    settings = {"LAZY_RESOLUTION": lazy, "REQUIREMENTS_ENV": env}
     load_settings()
+    get_file_index.cache_clear()
+    _read_text_version.cache_clear()
     logger.debug(
-        f"\nROOT_DIR: {'':20}{ROOT_DIR}\n" f"MAPPING_FILE: {'':20}{MAPPING_FILE}\n"
+        "\nROOT_DIR: %s\nMAPPING_FILE: %s\nSTORE_FILE: %s\n",
+        ROOT_DIR,
+        MAPPING_FILE,
+        STORE_FILE,
     )
-    config_file = find_yaml_config_file()
+    with stats.phase("config_discovery"):
+        config_file = find_yaml_config_file()
     logger.debug("yaml config file: %s", config_file)
-    yaml_dict = yaml_to_dict(config_file)
+    with stats.phase("requirements_discovery"):
+        req_files = find_compiled_requirements() if env else {}
+        require_chain = list(req_files.values()) or find_requirements_chain()
+    if RESULT_CACHE:
+        with stats.phase("run_cache"):
+            run_key = _run_cache_key([config_file, *require_chain], settings)
+            unchanged = run_key == _last_successful_run()
+        stats.record_cache("run_result", int(unchanged), int(not unchanged))
+        if unchanged:
+            logger.debug("inputs unchanged since last successful run")
+            logger.info("Success! - pre-commit is in sync with piptools")
+            return 0
+    loop = asyncio.get_running_loop()
+    parsed: asyncio.Future[dict]
+    if env:
+        parsed = loop.run_in_executor(
+            None, _timed, "requirements_parse", build_requirements_matrix, req_files
+        )
+    else:
+        parsed = loop.run_in_executor(
+            None, _timed, "requirements_parse", parse_requirements, require_chain[-1]
+        )
+    parsed_yaml = loop.run_in_executor(
+        None, _timed, "yaml_parse", yaml_to_dict, config_file
+    )
+    if lazy:
+        yaml_dict = await parsed_yaml
+        with stats.phase("mapping"):
+            map_db = await resolve_repos_async(list(yaml_dict))
+    else:
+        with stats.phase("mapping"):
+            map_db = await generate_db_async(force=0)
+        yaml_dict = await parsed_yaml
     logger.debug("yaml converted to dict: %s", yaml_dict)
-    require_file = find_requirements_file()
-    map_db = generate_db(force=0)
     pypi_repo_list = [map_db[repo] for repo in yaml_dict if map_db.get(repo, 0) != 0]
     logger.debug("PyPI repository list: %s", pypi_repo_list)
-    req_versions = get_requirement_versions(require_file, pypi_repo_list)
-    logger.debug("Requirement Version: %s", req_versions)
-
-    mismatch = 0
-    for repo in yaml_dict:
-        if (precommit_ver := yaml_dict[repo]) != (
-            piptools_ver := req_versions.get(pack := map_db.get(repo, ""), "-")
-        ):
-            if piptools_ver != "-":
-                mismatch += 1
-                logger.info(
-                    f"{pack:15} - piptools: {piptools_ver:10} !=     "
-                    f"pre-commit: {precommit_ver}"
-                )
-                if UPDATE_PC_YAML_FILE is True:
-                    update_yaml(config_file, repo, piptools_ver)
-    if mismatch > 0:
+    requirements = await parsed
+    with stats.phase("version_extraction"):
+        if env:
+            conflicts = requirement_conflicts(requirements, pypi_repo_list)
+            for pack, envs in conflicts.items():
+                logger.info("%-15s - environments disagree: %s", pack, envs)
+            req_versions = environment_versions(requirements, env, pypi_repo_list)
+        else:
+            req_versions = _select_versions(requirements, pypi_repo_list)
+        logger.debug("Requirement Version: %s", req_versions)
+        updates = _compare_versions(yaml_dict, map_db, req_versions)
+    if UPDATE_PC_YAML_FILE is True:
+        with stats.phase("yaml_update"):
+            update_yaml_batch(config_file, updates)
+    if updates:
         return 1
     else:
+        if RESULT_CACHE:
+            _record_successful_run(
+                _run_cache_key([config_file, *require_chain], settings)
+            )
         logger.info("Success! - pre-commit is in sync with piptools")
         return 0
 
 
+def _timed(name: str, func: Callable, *args: Any) -> Any:
+    """Call func in the named phase of the run statistics."""
+    with stats.phase(name):
+        return func(*args)
+
+
+def _parse_args(argv: Union[list[str], None]) -> argparse.Namespace:
+    """Parse the command line options, ignoring the file names from pre-commit."""
+    # Core Library modules
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="piptools_sync", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument(
+        "--timings",
+        nargs="?",
+        const="-",
+        metavar="FILE",
+        help="write per-phase timings, HTTP and cache statistics as JSON to "
+        "FILE, or to stderr if no FILE is given",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="write a cProfile dump to FILE, implies --timings",
+    )
+    parser.add_argument(
+        "--log-level",
+        type=str.upper,
+        choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+        help="the console log level, LOG_LEVEL by default",
+    )
+    parser.add_argument(
+        "--log-file",
+        metavar="FILE",
+        help="also log to FILE, written by a background thread at "
+        "LOG_FILE_LEVEL, LOG_FILE by default",
+    )
+    resolution = parser.add_mutually_exclusive_group()
+    resolution.add_argument(
+        "--lazy",
+        action="store_true",
+        default=None,
+        help="look up only the repos of the pre-commit config, "
+        "LAZY_RESOLUTION by default",
+    )
+    resolution.add_argument(
+        "--eager",
+        action="store_false",
+        dest="lazy",
+        help="build the mapping of the whole hook catalog first",
+    )
+    parser.add_argument(
+        "--requirements-env",
+        metavar="ENV",
+        help="read the versions from the pip-compile generated requirements "
+        "file of ENV, e.g. 'development', REQUIREMENTS_ENV by default",
+    )
+    args, _ = parser.parse_known_args(argv)
+    if args.profile and not args.timings:
+        args.timings = "-"
+    return args
+
+
+def _write_timings(destination: str) -> None:
+    """Write the run statistics as JSON to a file, or to stderr for '-'."""
+    document = stats.dumps()
+    if destination == "-":
+        print(document, file=sys.stderr)
+    else:
+        Path(destination).write_text(document + "\n", encoding="utf-8")
+
+
+def main(argv: Union[list[str], None] = None) -> int:
+    """Check that pre-commit hook versions match piptools-locked package versions.
+
+    Loads settings, locates the pre-commit YAML config and the requirements
+    file, then cross-references each pre-commit repo's pinned revision
+    against the corresponding package version resolved by piptools. Any
+    mismatches are logged, and if ``UPDATE_PC_YAML_FILE`` is enabled, the
+    pre-commit config is updated in place to match the piptools version.
+
+    If ``RESULT_CACHE`` is enabled and the config, requirements chain and
+    mapping are unchanged since the last successful run, returns at once.
+
+    This runs ``main_async`` in a new event loop. With ``--timings`` the wall
+    and CPU time of each phase, the HTTP requests and bytes per host and the
+    cache hits and misses are written as JSON once the run ends, and with
+    ``--profile FILE`` the run is also profiled into a cProfile dump. Unless
+    ``METRICS_FORMAT`` is 'none' the metrics of the run are then written to
+    ``METRICS_PATH``, also when the run fails. A failed lookup is logged and
+    the run exits with 1. ``--log-level`` and ``--log-file`` override the
+    LOGGING settings of config.toml, ``--lazy`` or ``--eager`` override
+    ``LAZY_RESOLUTION`` and ``--requirements-env`` overrides
+    ``REQUIREMENTS_ENV``.
+
+    Parameters
+    ----------
+    argv : list[str]
+        The command line arguments, ``sys.argv[1:]`` by default. File names
+        passed by pre-commit are ignored.
+
+    Returns
+    -------
+    int
+        0 if all pre-commit versions are in sync with piptools, 1 if any
+        mismatches were found.
+    """
+    # Core Library modules
+    import asyncio
+
+    args = _parse_args(argv)
+    if args.log_level or args.log_file is not None:
+        configure_logging(args.log_level, args.log_file)
+    stats.reset_stats()
+    exit_code = 1
+    try:
+        if args.profile:
+            # Core Library modules
+            import cProfile
+
+            profiler = cProfile.Profile()
+            try:
+                exit_code = profiler.runcall(
+                    asyncio.run, main_async(args.lazy, args.requirements_env)
+                )
+            finally:
+                profiler.dump_stats(args.profile)
+        else:
+            exit_code = asyncio.run(main_async(args.lazy, args.requirements_env))
+        return exit_code
+    except ConnectionError as e:
+        logger.error("%s", e)
+        return exit_code
+    finally:
+        if args.timings:
+            _write_timings(args.timings)
+        if METRICS_FORMAT != "none":
+            # Local modules
+            from .metrics import write_metrics
+
+            write_metrics(METRICS_FORMAT, METRICS_PATH, exit_code)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Statistics of a piptools_sync run: phase timings, HTTP traffic and caches.
+
+The counters are always collected, they cost a lock and a few additions per
+event. ``main`` resets them at the start of a run and reports them with the
+``--timings`` and ``--profile`` options.
+"""
+
+# Core Library modules
+import copy
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+from urllib.parse import urlsplit
+
+_LOCK = threading.Lock()
+RUN_STATS: dict[str, Any] = {}
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def reset_stats() -> None:
+    """Clear the statistics and start timing a new run."""
+    with _LOCK:
+        RUN_STATS.clear()
+        RUN_STATS.update(
+            {
+                "started": time.time(),
+                "phases": {},
+                "http": {"requests": 0, "bytes": 0, "hosts": {}},
+                "cache": {},
+                "counters": {},
+                "histograms": {},
+            }
+        )
+
+
+reset_stats()
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a phase of the run, adding to any earlier time of the same phase.
+
+    The wall time and the CPU time of the calling thread are recorded, so
+    phases overlapping in different threads are each charged their own CPU.
+
+    Parameters
+    ----------
+    name : str
+        The phase name e.g. 'yaml_parse'.
+    """
+    wall = time.perf_counter()
+    cpu = time.thread_time()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - wall
+        cpu = time.thread_time() - cpu
+        with _LOCK:
+            timing = RUN_STATS["phases"].setdefault(
+                name, {"calls": 0, "wall": 0.0, "cpu": 0.0}
+            )
+            timing["calls"] += 1
+            timing["wall"] += wall
+            timing["cpu"] += cpu
+
+
+def _host_stats(url: str) -> dict:
+    """Return the HTTP counters of the host of a URL, creating them if needed."""
+    host = urlsplit(url).netloc or "unknown"
+    return RUN_STATS["http"]["hosts"].setdefault(
+        host, {"requests": 0, "bytes": 0, "seconds": 0.0, "status": {}}
+    )
+
+
+def record_request(url: str, status: int, seconds: float) -> None:
+    """Count an HTTP response and the seconds taken to receive its headers."""
+    with _LOCK:
+        host = _host_stats(url)
+        host["requests"] += 1
+        host["seconds"] += seconds
+        host["status"][str(status)] = host["status"].get(str(status), 0) + 1
+        RUN_STATS["http"]["requests"] += 1
+
+
+def record_bytes(url: str, count: int) -> None:
+    """Count response body bytes read from a URL."""
+    with _LOCK:
+        _host_stats(url)["bytes"] += count
+        RUN_STATS["http"]["bytes"] += count
+
+
+def record_cache(name: str, hits: int = 0, misses: int = 0) -> None:
+    """Count hits and misses of one of the caches.
+
+    Parameters
+    ----------
+    name : str
+        The cache e.g. 'mapping' or 'http'.
+    hits : int
+        Lookups answered from the cache.
+    misses : int
+        Lookups that had to be fetched or computed.
+    """
+    with _LOCK:
+        cache = RUN_STATS["cache"].setdefault(name, {"hits": 0, "misses": 0})
+        cache["hits"] += hits
+        cache["misses"] += misses
+
+
+def increment(name: str, count: int = 1) -> None:
+    """Add to a named event counter e.g. 'yaml_rewrites'."""
+    with _LOCK:
+        RUN_STATS["counters"][name] = RUN_STATS["counters"].get(name, 0) + count
+
+
+def observe(name: str, seconds: float) -> None:
+    """Record a duration in a named histogram with ``LATENCY_BUCKETS`` bounds.
+
+    Each bucket counts the observations up to its bound that did not fit a
+    smaller bucket, the last one those above every bound.
+    """
+    with _LOCK:
+        histogram = RUN_STATS["histograms"].setdefault(
+            name, {"buckets": [0] * (len(LATENCY_BUCKETS) + 1), "count": 0, "sum": 0.0}
+        )
+        index = next(
+            (i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound),
+            len(LATENCY_BUCKETS),
+        )
+        histogram["buckets"][index] += 1
+        histogram["count"] += 1
+        histogram["sum"] += seconds
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Observe the duration of the block in the named histogram."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start)
+
+
+def snapshot() -> dict[str, Any]:
+    """Return a copy of the statistics with the run duration so far."""
+    with _LOCK:
+        stats = copy.deepcopy(RUN_STATS)
+    stats["duration"] = time.time() - stats["started"]
+    return stats
+
+
+def dumps() -> str:
+    """Return the statistics as an indented JSON document."""
+    return json.dumps(snapshot(), indent=2, sort_keys=True)
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""Pytest fixtures shared by the test suite and the benchmarks.
+
+Load the module as a plugin from a conftest.py::
+
+    pytest_plugins = ["piptools_sync.testing"]
+
+``isolated_cache`` is autouse, so every test gets an empty cache directory
+and never touches the user's cache or mapping.
+"""
+
+# Core Library modules
+from pathlib import Path
+from typing import Any
+
+# Third party modules
+import pytest
+
+# Local modules
+from . import piptools_sync
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(monkeypatch: Any, tmp_path: Path) -> Path:
+    """Point the caches, store and mapping of piptools_sync at tmp_path/cache."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(piptools_sync, "CACHE_DIR", cache_dir)
+    monkeypatch.setattr(piptools_sync, "STORE_FILE", cache_dir / "piptools_sync.db")
+    monkeypatch.setattr(piptools_sync, "MAPPING_FILE", cache_dir / "mapping.json")
+    monkeypatch.setattr(
+        piptools_sync, "RESULT_CACHE_FILE", cache_dir / "last_runs.json"
+    )
+    piptools_sync.get_github_scheduler.cache_clear()
+    return cache_dir
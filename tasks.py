@@ -24,6 +24,7 @@
 DOCS_INDEX = "".join(['"', str(ROOT_DIR / "docs" / "_build" / "index.html"), '"'])
 LOG_DIR = ROOT_DIR.joinpath("logs")
 TEST_DIR = ROOT_DIR.joinpath("tests")
+BENCH_DIR = ROOT_DIR.joinpath("benchmarks")
 SRC_DIR = ROOT_DIR.joinpath("src")
 PKG_DIR = SRC_DIR.joinpath("piptools_sync")
 PYTHON_FILES_ALL = list(ROOT_DIR.rglob("*.py"))
@@ -372,6 +373,27 @@ def tests(c, open_browser=False):
         webbrowser.open(cov_path)
 
 
+@task(
+    help={
+        "save": "Store the results in benchmarks/results for later comparison",
+        "compare": "Compare with the latest stored results, failing on regressions",
+    },
+)
+def benchmark(c, save=False, compare=False):
+    """Run the synthetic-scale benchmarks using pytest-benchmark."""
+    options = [
+        "--no-cov",
+        "-p no:randomly",
+        f'--benchmark-storage="{str(BENCH_DIR / "results")}"',
+        "--benchmark-columns=min,mean,max,rounds",
+    ]
+    if save:
+        options.append("--benchmark-autosave")
+    if compare:
+        options.extend(["--benchmark-compare", "--benchmark-compare-fail=mean:15%"])
+    c.run(f'pytest "{str(BENCH_DIR)}" {" ".join(options)}')
+
+
 @task(
     help={
         "open_browser": "Open  the docs in the web browser",
@@ -8,6 +8,8 @@
 # First party modules
 from piptools_sync import piptools_sync
 
+pytest_plugins = ["piptools_sync.testing"]
+
 
 def pytest_configure() -> None:
     pytest.TEST_DIR = Path(__file__).parent
@@ -24,7 +26,7 @@ def mock_get_precommitrepos() -> list[list]:
 
 @pytest.fixture
 def mock_get_latest_github_repo_version(monkeypatch: Any) -> None:
-    def mock_get_latestgithubrepoversion() -> str:
+    def mock_get_latestgithubrepoversion(url_src: str) -> str:
         version = "0.1.0"
         return version
 
@@ -37,7 +39,7 @@ def mock_get_latestgithubrepoversion() -> str:
 
 @pytest.fixture
 def mock_get_latest_pypi_repo_version(monkeypatch: Any) -> None:
-    def mock_get_latestpypirepoversion() -> str:
+    def mock_get_latestpypirepoversion(name: str) -> str:
         version = "0.1.0"
         return version
 
@@ -0,0 +1,84 @@
+# Core Library modules
+from typing import Any
+
+# Third party modules
+import pytest
+import requests
+
+# First party modules
+from piptools_sync import piptools_sync
+
+TEST_DIR = pytest.TEST_DIR
+
+
+class RecordedSession:
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+        self.calls: list[dict] = []
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        self.calls.append({"method": method, "url": url, **kwargs})
+        response = requests.Response()
+        response.status_code = 200
+        response._content = self.body
+        return response
+
+
+@pytest.fixture
+def recorded_session(monkeypatch: Any) -> RecordedSession:
+    session = RecordedSession((TEST_DIR / "github_graphql.json").read_bytes())
+    monkeypatch.setattr(piptools_sync, "get_session", lambda: session)
+    monkeypatch.setattr(piptools_sync, "GITHUB_TOKENS", ["secret"])
+    return session
+
+
+def test_graphql_latest_versions(recorded_session: RecordedSession) -> None:
+    repo_urls = [
+        "https://github.com/asottile/pyupgrade",
+        "https://github.com/psf/black.git",
+        "https://github.com/pre-commit/pre-commit-hooks",
+        "https://github.com/owner/gone",
+        "https://gitlab.com/pycqa/flake8",
+    ]
+    versions = piptools_sync.get_latest_github_versions(repo_urls)
+    assert versions == {
+        "https://github.com/asottile/pyupgrade": "v1.5.1",
+        "https://github.com/psf/black.git": "23.10.0",
+        "https://github.com/pre-commit/pre-commit-hooks": "v4.5.0",
+        "https://github.com/owner/gone": 0,
+        "https://gitlab.com/pycqa/flake8": 0,
+    }
+    (call,) = recorded_session.calls
+    assert call["method"] == "POST"
+    assert call["url"] == piptools_sync.GITHUB_GRAPHQL_URL
+    assert call["headers"]["Authorization"] == "Bearer secret"
+    assert call["json"]["variables"]["o1"] == "psf"
+    assert call["json"]["variables"]["n1"] == "black"
+    assert "n4" not in call["json"]["variables"]
+
+    cached = piptools_sync.get_latest_github_versions(repo_urls[:2])
+    assert cached == {
+        "https://github.com/asottile/pyupgrade": "v1.5.1",
+        "https://github.com/psf/black.git": "23.10.0",
+    }
+    assert len(recorded_session.calls) == 1
+
+
+def test_graphql_latest_versions_batches(
+    monkeypatch: Any, recorded_session: RecordedSession
+) -> None:
+    monkeypatch.setattr(piptools_sync, "GITHUB_BATCH_SIZE", 2)
+    repo_urls = [f"https://github.com/owner/repo-{i}" for i in range(5)]
+    piptools_sync.get_latest_github_versions(repo_urls)
+    sizes = sorted(
+        len(call["json"]["variables"]) // 2 for call in recorded_session.calls
+    )
+    assert sizes == [1, 2, 2]
+
+
+def test_graphql_latest_versions_incomplete(
+    recorded_session: RecordedSession,
+) -> None:
+    repo_urls = [f"https://github.com/owner/repo-{i}" for i in range(6)]
+    with pytest.raises(requests.HTTPError, match="lacks 2 of 6 repos"):
+        piptools_sync._graphql_latest_versions(repo_urls)
@@ -0,0 +1,14 @@
+# Third party modules
+import pytest
+
+# First party modules
+import piptools_sync
+
+
+def test_zip_strict() -> None:
+    assert list(piptools_sync._zip_strict("ab", [1, 2])) == [("a", 1), ("b", 2)]
+    assert list(piptools_sync._zip_strict([], ())) == []
+    with pytest.raises(ValueError, match="different lengths"):
+        list(piptools_sync._zip_strict("abc", [1, 2]))
+    with pytest.raises(ValueError, match="different lengths"):
+        list(piptools_sync._zip_strict("a", [1, 2]))
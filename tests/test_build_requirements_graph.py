@@ -0,0 +1,75 @@
+# Core Library modules
+from typing import Any
+
+# Third party modules
+import pytest
+
+# First party modules
+from piptools_sync import piptools_sync
+
+TEST_DIR = pytest.TEST_DIR
+COMPILED = "#\n# This file is autogenerated by pip-compile with Python 3.11\n#\n"
+
+
+def test_build_requirements_graph(tmp_path: Any) -> None:
+    (tmp_path / "reqs").mkdir()
+    root = tmp_path / "requirements.txt"
+    root.write_text("-r reqs/dev.in.txt\n--constraint=reqs/constraints.txt\n")
+    (tmp_path / "reqs" / "dev.in.txt").write_text("-rbase.txt\n-r test.txt\n")
+    (tmp_path / "reqs" / "base.txt").write_text(COMPILED + "click==8.1.3\n")
+    (tmp_path / "reqs" / "test.txt").write_text(
+        COMPILED + "pytest==7.2.0\n    # via -r test.in\n"
+    )
+    (tmp_path / "reqs" / "constraints.txt").write_text("-r base.txt\n")
+
+    graph = piptools_sync.build_requirements_graph(root)
+
+    assert list(graph) == [
+        root,
+        tmp_path / "reqs" / "dev.in.txt",
+        tmp_path / "reqs" / "base.txt",
+        tmp_path / "reqs" / "test.txt",
+        tmp_path / "reqs" / "constraints.txt",
+    ]
+    assert graph[tmp_path / "reqs" / "constraints.txt"]["includes"] == [
+        tmp_path / "reqs" / "base.txt"
+    ]
+    assert piptools_sync.find_compiled_leaves(graph) == [
+        tmp_path / "reqs" / "base.txt",
+        tmp_path / "reqs" / "test.txt",
+    ]
+
+
+def test_build_requirements_graph_reads_once(monkeypatch: Any, tmp_path: Any) -> None:
+    root = tmp_path / "requirements.txt"
+    root.write_text("-r dev.txt\n")
+    (tmp_path / "dev.txt").write_text(COMPILED + "click==8.1.3\n")
+    opened = []
+    real_open = open
+
+    def counting_open(file: Any, *args: Any, **kwargs: Any) -> Any:
+        opened.append(file)
+        return real_open(file, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", counting_open)
+    piptools_sync._read_text_version.cache_clear()
+    graph = piptools_sync.build_requirements_graph(root)
+    chain = list(graph)
+    piptools_sync._run_cache_key(chain)
+    assert piptools_sync.parse_requirements(chain[-1]) == {"click": "8.1.3"}
+    assert sorted(opened) == sorted(chain)
+    (tmp_path / "dev.txt").write_text(COMPILED + "click==8.1.4\n")
+    assert piptools_sync.parse_requirements(chain[-1]) == {"click": "8.1.4"}
+
+
+def test_build_requirements_graph_cycle(tmp_path: Any) -> None:
+    (tmp_path / "a.txt").write_text("-r b.txt\n")
+    (tmp_path / "b.txt").write_text("-c a.txt\n")
+    with pytest.raises(ValueError, match="Cycle"):
+        piptools_sync.build_requirements_graph(tmp_path / "a.txt")
+
+
+def test_find_requirements_chain(monkeypatch: pytest) -> None:
+    monkeypatch.setattr(piptools_sync, "ROOT_REQUIREMENT", TEST_DIR / "req.txt")
+    chain = piptools_sync.find_requirements_chain()
+    assert [req_file.name for req_file in chain] == ["req.txt", "dev.txt"]
@@ -0,0 +1,36 @@
+# Core Library modules
+from typing import Any
+
+# Third party modules
+import pytest
+
+# First party modules
+from piptools_sync import piptools_sync
+
+TEST_DIR = pytest.TEST_DIR
+
+
+def test_find_compiled_requirements(monkeypatch: pytest) -> None:
+    monkeypatch.setattr(piptools_sync, "ROOT_DIR", TEST_DIR)
+    monkeypatch.setattr(piptools_sync, "REQUIREMENTS_GLOBS", ["reqs_matrix/*.txt"])
+    result = piptools_sync.find_compiled_requirements()
+    assert list(result) == ["base", "development", "test"]
+
+
+def test_build_requirements_matrix(monkeypatch: pytest) -> None:
+    monkeypatch.setattr(piptools_sync, "ROOT_DIR", TEST_DIR)
+    monkeypatch.setattr(piptools_sync, "REQUIREMENTS_GLOBS", ["reqs_matrix/*.txt"])
+    matrix = piptools_sync.build_requirements_matrix(
+        piptools_sync.find_compiled_requirements()
+    )
+    assert matrix["click"] == {"base": "8.1.3", "development": "8.1.3", "test": "8.1.3"}
+    assert piptools_sync.environment_versions(matrix, "test") == {
+        "black": "22.12.0",
+        "click": "8.1.3",
+    }
+    assert piptools_sync.requirement_conflicts(matrix) == {
+        "black": {"development": "23.1.0", "test": "22.12.0"}
+    }
+    assert piptools_sync.requirement_conflicts(matrix, ["click", "flake8"]) == {}
+    with pytest.raises(NameError):
+        piptools_sync.environment_versions(matrix, "production")
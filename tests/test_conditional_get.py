@@ -0,0 +1,44 @@
+# Core Library modules
+from typing import Any
+
+# Third party modules
+import pytest
+
+# First party modules
+from piptools_sync import piptools_sync
+
+TEST_DIR = pytest.TEST_DIR
+URL = "https://pre-commit.com/all-hooks.json"
+
+
+class MockResponse:
+    def __init__(self, status_code: int, content: bytes, headers: dict) -> None:
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+def test_conditional_get(monkeypatch: pytest, tmp_path: Any) -> None:
+    sent_headers = []
+    responses = [
+        MockResponse(200, b'{"repo": []}', {"ETag": '"abc"', "Last-Modified": "x"}),
+        MockResponse(304, b"", {}),
+    ]
+
+    def mock_http_get(url: str, headers: dict) -> MockResponse:
+        sent_headers.append(headers)
+        return responses.pop(0)
+
+    monkeypatch.setattr(piptools_sync, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(piptools_sync, "_http_get", mock_http_get)
+
+    assert piptools_sync._conditional_get(URL) == b'{"repo": []}'
+    assert len(list(tmp_path.glob("*.gz"))) == 1
+    assert piptools_sync._conditional_get(URL) == b'{"repo": []}'
+    assert sent_headers == [
+        {},
+        {"If-None-Match": '"abc"', "If-Modified-Since": "x"},
+    ]
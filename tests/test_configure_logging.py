@@ -0,0 +1,59 @@
+# Core Library modules
+import logging
+import threading
+from logging.handlers import QueueHandler
+from pathlib import Path
+from typing import Any, Iterator
+
+# Third party modules
+import pytest
+
+# First party modules
+import piptools_sync
+
+
+@pytest.fixture
+def restore_logging() -> Iterator[None]:
+    yield
+    piptools_sync.configure_logging()
+
+
+def test_configure_logging_default(restore_logging: Any) -> None:
+    logger = piptools_sync.configure_logging()
+    assert len(logger.handlers) == 1
+    assert not any(isinstance(h, QueueHandler) for h in logger.handlers)
+    assert not logger.isEnabledFor(logging.DEBUG)
+    assert logger.isEnabledFor(logging.INFO)
+
+
+def test_configure_logging_file(restore_logging: Any, tmp_path: Path) -> None:
+    log_file = tmp_path / "run.log"
+    logger = piptools_sync.configure_logging("WARNING", str(log_file))
+    assert isinstance(logger.handlers[1], QueueHandler)
+    assert logger.isEnabledFor(logging.DEBUG)
+    writers = []
+
+    class Recorder(logging.Handler):
+        def emit(self, record: logging.LogRecord) -> None:
+            writers.append(threading.current_thread())
+
+    piptools_sync._listener.handlers += (Recorder(),)
+    logger.debug("payload: %s", [1, 2, 3])
+    piptools_sync.configure_logging()
+    assert "DEBUG - init - payload: [1, 2, 3]" in log_file.read_text()
+    assert writers and threading.main_thread() not in writers
+
+
+def test_configure_logging_environment(
+    restore_logging: Any, monkeypatch: Any, tmp_path: Path
+) -> None:
+    log_file = tmp_path / "env.log"
+    monkeypatch.setenv("PIPTOOLS_SYNC_LOG_LEVEL", "error")
+    monkeypatch.setenv("PIPTOOLS_SYNC_LOG_FILE", str(log_file))
+    monkeypatch.setenv("PIPTOOLS_SYNC_LOG_FILE_LEVEL", "warning")
+    logger = piptools_sync.configure_logging()
+    logger.info("skipped")
+    logger.warning("kept")
+    piptools_sync.configure_logging()
+    assert log_file.read_text().splitlines()[-1].endswith("kept")
+    assert "skipped" not in log_file.read_text()
@@ -0,0 +1,63 @@
+# Core Library modules
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+# Third party modules
+import pytest
+
+# First party modules
+from piptools_sync import piptools_sync
+
+TEST_DIR = pytest.TEST_DIR
+
+
+def test_connect_store(monkeypatch: pytest, tmp_path: Any) -> None:
+    mapping = tmp_path / "mapping.json"
+    mapping.write_text('{"https://github.com/psf/black": "black"}')
+    monkeypatch.setattr(piptools_sync, "MAPPING_FILE", mapping)
+
+    connection = piptools_sync._connect_store()
+    try:
+        mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+    finally:
+        connection.close()
+    assert mode == "wal"
+    entries = piptools_sync._load_mapping()
+    assert entries["https://github.com/psf/black"]["source"] == "heuristic"
+
+    mapping.write_text('{"https://github.com/pycqa/flake8": "flake8"}')
+    assert list(piptools_sync._load_mapping()) == ["https://github.com/psf/black"]
+
+
+def test_import_mapping_file(tmp_path: Any) -> None:
+    mapping = tmp_path / "mapping.json"
+    entry = piptools_sync._mapping_entry("flake8", "pypi", 1700000000)
+    mapping.write_text(json.dumps({"https://github.com/pycqa/flake8": entry}))
+    version = piptools_sync._store_version()
+
+    assert piptools_sync.import_mapping_file(mapping) == 1
+    assert piptools_sync._load_mapping(["https://github.com/pycqa/flake8"]) == {
+        "https://github.com/pycqa/flake8": entry
+    }
+    assert piptools_sync._store_version() > version
+
+
+def test_write_mapping_concurrent() -> None:
+    def write(i: int) -> None:
+        entry = piptools_sync._mapping_entry(f"project-{i}", "pypi")
+        entry["version"] = f"{i}.0"
+        piptools_sync._write_mapping({f"https://github.com/owner/project-{i}": entry})
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(write, range(40)))
+
+    assert len(piptools_sync._load_mapping()) == 40
+    connection = piptools_sync._connect_store()
+    try:
+        versions = connection.execute(
+            "SELECT COUNT(*) FROM latest_versions WHERE kind = 'pypi'"
+        ).fetchone()[0]
+    finally:
+        connection.close()
+    assert versions == 40
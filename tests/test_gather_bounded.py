@@ -0,0 +1,22 @@
+# Core Library modules
+import asyncio
+
+# First party modules
+from piptools_sync import piptools_sync
+
+
+def test_gather_bounded() -> None:
+    running = []
+    peak = []
+
+    async def work(value: int) -> int:
+        running.append(value)
+        peak.append(len(running))
+        await asyncio.sleep(0.01 * (5 - value))
+        running.remove(value)
+        return value * 2
+
+    coroutines = (work(value) for value in range(5))
+    result = asyncio.run(piptools_sync.gather_bounded(coroutines, 2))
+    assert result == [0, 2, 4, 6, 8]
+    assert max(peak) == 2
@@ -1,4 +1,6 @@
 # Core Library modules
+import json
+import time
 from typing import Any
 
 # Third party modules
@@ -19,3 +21,112 @@ def test_generate_db(
     monkeypatch.setattr(piptools_sync, "MAPPING_FILE", mapping)
     result = piptools_sync.generate_db()
     assert result == {"https://github.com/pre-commit/mirrors-mypy": "mypy"}
+
+
+def test_generate_db_concurrent_matches_serial(
+    monkeypatch: pytest, tmp_path: Any
+) -> None:
+    repos = [[f"https://github.com/Owner/Project-{i}", "hook"] for i in range(50)]
+    repos.append(["https://github.com/pre-commit/mirrors-mypy", "mypy"])
+
+    def mock_get_latestpypirepoversion(name: str) -> Any:
+        return 0 if name.endswith(("3", "7")) else "1.0.0"
+
+    monkeypatch.setattr(piptools_sync, "get_precommit_repos", lambda: repos)
+    monkeypatch.setattr(
+        piptools_sync, "get_latest_pypi_repo_version", mock_get_latestpypirepoversion
+    )
+    mapping = tmp_path / "mapping.json"
+    monkeypatch.setattr(piptools_sync, "MAPPING_FILE", mapping)
+
+    serial = piptools_sync.generate_db(force=1, workers=1, incremental=False)
+    serial_entries = piptools_sync._load_mapping()
+    concurrent = piptools_sync.generate_db(force=1, workers=8, incremental=False)
+    concurrent_entries = piptools_sync._load_mapping()
+
+    assert list(concurrent.items()) == list(serial.items())
+    assert list(concurrent_entries) == list(serial_entries)
+    for entry in (*serial_entries.values(), *concurrent_entries.values()):
+        del entry["resolved"]
+    assert concurrent_entries == serial_entries
+    assert serial["https://github.com/pre-commit/mirrors-mypy"] == "mypy"
+    assert serial["https://github.com/owner/project-3"] == ""
+    assert serial["https://github.com/owner/project-4"] == "project-4"
+
+
+def test_generate_db_incremental(monkeypatch: pytest, tmp_path: Any) -> None:
+    repos = [
+        ["https://github.com/owner/kept", "hook"],
+        ["https://github.com/owner/unresolved", "hook"],
+        ["https://github.com/owner/added", "hook"],
+    ]
+    probed = []
+
+    def mock_get_latestpypirepoversion(name: str) -> str:
+        probed.append(name)
+        return "1.0.0"
+
+    monkeypatch.setattr(piptools_sync, "get_precommit_repos", lambda: repos)
+    monkeypatch.setattr(
+        piptools_sync, "get_latest_pypi_repo_version", mock_get_latestpypirepoversion
+    )
+    mapping = tmp_path / "mapping.json"
+    mapping.write_text(
+        '{"https://github.com/owner/kept": "kept-project", '
+        '"https://github.com/owner/unresolved": "", '
+        '"https://github.com/owner/removed": "removed"}'
+    )
+    monkeypatch.setattr(piptools_sync, "MAPPING_FILE", mapping)
+    monkeypatch.setattr(piptools_sync, "MISS_TTL", 0)
+
+    result = piptools_sync.generate_db(force=1)
+    assert sorted(probed) == ["added", "unresolved"]
+    assert result == {
+        "https://github.com/owner/kept": "kept-project",
+        "https://github.com/owner/unresolved": "unresolved",
+        "https://github.com/owner/added": "added",
+    }
+
+
+def test_generate_db_entry_ttl(monkeypatch: pytest, tmp_path: Any) -> None:
+    now = int(time.time())
+    repos = [
+        ["https://github.com/owner/fresh-hit", "hook"],
+        ["https://github.com/owner/fresh-miss", "hook"],
+        ["https://github.com/owner/stale-miss", "hook"],
+    ]
+    probed = []
+
+    def mock_get_latestpypirepoversion(name: str) -> Any:
+        probed.append(name)
+        return 0
+
+    monkeypatch.setattr(piptools_sync, "get_precommit_repos", lambda: repos)
+    monkeypatch.setattr(
+        piptools_sync, "get_latest_pypi_repo_version", mock_get_latestpypirepoversion
+    )
+    mapping = tmp_path / "mapping.json"
+    entries = {
+        "https://github.com/owner/fresh-hit": piptools_sync._mapping_entry(
+            "fresh-hit", "pypi", now - 86400
+        ),
+        "https://github.com/owner/fresh-miss": piptools_sync._mapping_entry(
+            "", "pypi", now - 86400
+        ),
+        "https://github.com/owner/stale-miss": piptools_sync._mapping_entry(
+            "", "pypi", now - piptools_sync.MISS_TTL - 1
+        ),
+    }
+    mapping.write_text(json.dumps(entries))
+    monkeypatch.setattr(piptools_sync, "MAPPING_FILE", mapping)
+
+    result = piptools_sync.generate_db()
+    assert probed == ["stale-miss"]
+    assert result == {
+        "https://github.com/owner/fresh-hit": "fresh-hit",
+        "https://github.com/owner/fresh-miss": "",
+        "https://github.com/owner/stale-miss": "",
+    }
+    stored = piptools_sync._load_mapping()
+    assert stored["https://github.com/owner/stale-miss"]["resolved"] >= now
+    assert stored["https://github.com/owner/fresh-miss"]["result"] == "miss"
@@ -0,0 +1,145 @@
+# Core Library modules
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+
+# Third party modules
+import pytest
+
+# First party modules
+from piptools_sync import fakeserver, piptools_sync
+
+
+@pytest.fixture
+def fake_server(monkeypatch: Any) -> Iterator[Any]:
+    server = fakeserver.start_server(repos=20, releases=5, miss_every=4)
+    base_url = fakeserver.server_url(server)
+    monkeypatch.setattr(
+        piptools_sync, "PRECOMMIT_REPOS_URL", f"{base_url}/all-hooks.json"
+    )
+    monkeypatch.setattr(piptools_sync, "PYPI_INDEX_URL", base_url)
+    monkeypatch.setattr(piptools_sync, "GITHUB_API_URL", base_url)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("fetch_mode", ["stream", "json", "simple"])
+def test_generate_db_async(
+    monkeypatch: Any, capsys: Any, fake_server: Any, fetch_mode: str
+) -> None:
+    monkeypatch.setattr(piptools_sync, "PYPI_FETCH_MODE", fetch_mode)
+    result = asyncio.run(piptools_sync.generate_db_async(force=1, workers=4))
+    assert "20/20" in capsys.readouterr().err
+    stored = piptools_sync._load_mapping()
+    assert result == piptools_sync.generate_db(force=1, workers=4)
+    assert list(result) == [
+        f"https://github.com/fake-owner/project-{i}" for i in range(20)
+    ]
+    assert result["https://github.com/fake-owner/project-0"] == ""
+    assert result["https://github.com/fake-owner/project-1"] == "project-1"
+    assert stored["https://github.com/fake-owner/project-1"]["source"] == "pypi"
+
+
+def test_resolve_repos_async(fake_server: Any) -> None:
+    repo_urls = [
+        "https://github.com/fake-owner/project-4",
+        "https://github.com/fake-owner/Project-5",
+        "https://github.com/pre-commit/mirrors-mypy",
+    ]
+    result = asyncio.run(piptools_sync.resolve_repos_async(repo_urls))
+    assert result == {
+        "https://github.com/fake-owner/project-4": "",
+        "https://github.com/fake-owner/project-5": "project-5",
+        "https://github.com/pre-commit/mirrors-mypy": "mypy",
+    }
+
+
+def test_get_latest_github_repo_version_async(fake_server: Any) -> None:
+    async def lookup() -> list:
+        async with piptools_sync.new_async_session() as session:
+            return await piptools_sync.gather_bounded(
+                (
+                    piptools_sync.get_latest_github_repo_version_async(
+                        session, f"https://github.com/fake-owner/project-{i}"
+                    )
+                    for i in range(3)
+                ),
+                2,
+            )
+
+    assert asyncio.run(lookup()) == ["v1.0.0"] * 3
+
+
+class ErrorHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        pass
+
+    def do_GET(self) -> None:  # noqa: N802
+        status, body = (503, b"down") if "down" in self.path else (200, b"<html>")
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.mark.parametrize("fetch_mode", ["stream", "json", "simple"])
+@pytest.mark.parametrize("name", ["down", "garbled"])
+def test_get_latest_pypi_repo_version_async_errors(
+    monkeypatch: Any, fetch_mode: str, name: str
+) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ErrorHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(piptools_sync, "PYPI_INDEX_URL", fakeserver.server_url(server))
+    monkeypatch.setattr(piptools_sync, "PYPI_FETCH_MODE", fetch_mode)
+    monkeypatch.setattr(piptools_sync, "HTTP_RETRIES", 0)
+
+    async def lookup() -> Any:
+        async with piptools_sync.new_async_session() as session:
+            return await piptools_sync.get_latest_pypi_repo_version_async(session, name)
+
+    try:
+        with pytest.raises(ConnectionError, match=f"PyPI lookup of {name} failed"):
+            asyncio.run(lookup())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_get_latest_github_repo_version_async_cancelled(monkeypatch: Any) -> None:
+    gate = threading.Event()
+    released = []
+
+    class BlockedScheduler:
+        def acquire(self) -> str:
+            gate.wait(5)
+            return "secret"
+
+        def release(self, token: str, response: Any) -> bool:
+            released.append((token, response))
+            return False
+
+    scheduler = BlockedScheduler()
+    monkeypatch.setattr(piptools_sync, "get_github_scheduler", lambda: scheduler)
+
+    async def cancel_waiting_lookup() -> None:
+        task = asyncio.create_task(
+            piptools_sync.get_latest_github_repo_version_async(
+                None, "https://github.com/o/n"
+            )
+        )
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        gate.set()
+        for _ in range(100):
+            if released:
+                break
+            await asyncio.sleep(0.01)
+
+    asyncio.run(cancel_waiting_lookup())
+    assert released == [("secret", None)]
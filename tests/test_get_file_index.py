@@ -0,0 +1,55 @@
+# Core Library modules
+from typing import Any
+
+# Third party modules
+import pytest
+
+# First party modules
+from piptools_sync import piptools_sync
+
+TEST_DIR = pytest.TEST_DIR
+
+
+@pytest.fixture
+def project(monkeypatch: pytest, tmp_path: Any) -> Any:
+    for name in (
+        "requirements/dev.txt",
+        "requirements/base.txt",
+        "tests/reqs/dev.txt",
+        "node_modules/pkg/requirements/base.txt",
+        "ignored/requirements/base.txt",
+        "build.log",
+    ):
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text("")
+    (tmp_path / ".gitignore").write_text("# comment\n/ignored/\n*.log\n")
+    monkeypatch.setattr(piptools_sync, "ROOT_DIR", tmp_path)
+    monkeypatch.setattr(piptools_sync, "INDEX_SOURCE", "scan")
+    piptools_sync.get_file_index.cache_clear()
+    yield tmp_path
+    piptools_sync.get_file_index.cache_clear()
+
+
+def test_get_file_index(project: Any) -> None:
+    index = piptools_sync.get_file_index(project)
+    assert index["requirements/base.txt"] == [project / "requirements" / "base.txt"]
+    assert "build.log" not in index
+    assert piptools_sync.get_file_index(project) is index
+
+
+def test_find_file_candidates(project: Any) -> None:
+    assert piptools_sync.find_file_candidates(r"requirements\base.txt") == [
+        project / "requirements" / "base.txt"
+    ]
+    assert piptools_sync.find_file_candidates("dev.txt") == [
+        project / "requirements" / "dev.txt",
+        project / "tests" / "reqs" / "dev.txt",
+    ]
+    assert piptools_sync.find_file_candidates("requirements/*.txt") == [
+        project / "requirements" / "base.txt",
+        project / "requirements" / "dev.txt",
+    ]
+    assert piptools_sync._utility_find_file_path("dev.txt") == 1
+    assert piptools_sync._utility_find_file_path("reqs/dev.txt") == (
+        project / "tests" / "reqs" / "dev.txt"
+    )
@@ -0,0 +1,75 @@
+# Core Library modules
+import json
+from pathlib import Path
+from typing import Any
+
+# First party modules
+from piptools_sync import fakeserver, piptools_sync, stats
+from piptools_sync.catalog import HookCatalog
+
+CATALOG = {
+    "https://github.com/PyCQA/flake8": [
+        {"id": "flake8", "name": "flake8", "entry": "flake8", "language": "python"}
+    ],
+    "https://github.com/pre-commit/pre-commit-hooks": [
+        {"id": "check-yaml", "name": "check yaml", "entry": "cy", "language": "python"},
+        {"id": "no-commit", "name": "no commit", "entry": "nc", "language": "system"},
+    ],
+    "https://github.com/rust-lang/rustfmt": [
+        {"id": "fmt", "name": "rustfmt", "entry": "rustfmt", "language": "rust"}
+    ],
+}
+
+
+def test_get_hook_catalog_indexes(monkeypatch: Any) -> None:
+    body = json.dumps(CATALOG).encode("utf-8")
+    monkeypatch.setattr(piptools_sync, "_revalidate", lambda url: body)
+    catalog = piptools_sync.get_hook_catalog()
+    assert len(catalog) == 3
+    assert catalog.get("https://github.com/pycqa/FLAKE8.git/").hook_ids == ("flake8",)
+    assert catalog.get("https://github.com/nobody/nothing") is None
+    assert "https://github.com/rust-lang/rustfmt/" in catalog
+    assert "https://github.com/nobody/nothing" not in catalog
+    assert [repo.url for repo in catalog.with_language("rust")] == [
+        "https://github.com/rust-lang/rustfmt"
+    ]
+    assert catalog.with_language("system")[0].entries == ("cy", "nc")
+    assert catalog.with_hook_id("check-yaml")[0].hook_ids == ("check-yaml", "no-commit")
+    assert catalog.with_hook_id("missing") == []
+    assert piptools_sync.get_precommit_repos() == [
+        ["https://github.com/PyCQA/flake8", "flake8"],
+        ["https://github.com/pre-commit/pre-commit-hooks", "check yaml"],
+    ]
+    assert piptools_sync.get_precommit_repos_2() == {
+        "https://github.com/PyCQA/flake8": "flake8",
+        "https://github.com/pre-commit/pre-commit-hooks": "pre-commit-hooks",
+    }
+
+
+def test_get_hook_catalog_reload(monkeypatch: Any, isolated_cache: Path) -> None:
+    server = fakeserver.start_server(repos=6)
+    monkeypatch.setattr(
+        piptools_sync,
+        "PRECOMMIT_REPOS_URL",
+        f"{fakeserver.server_url(server)}/all-hooks.json",
+    )
+    stats.reset_stats()
+    try:
+        built = piptools_sync.get_hook_catalog()
+
+        def no_read_cached(url: str) -> bytes:
+            raise AssertionError("the saved catalog must be reused")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(piptools_sync, "_read_cached", no_read_cached)
+            reloaded = piptools_sync.get_hook_catalog()
+        saved = isolated_cache / piptools_sync.HOOK_CATALOG_FILE
+        saved.write_bytes(b"not gzip")
+        assert HookCatalog.load(saved) is None
+        rebuilt = piptools_sync.get_hook_catalog()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert len(built) == 6
+    assert reloaded.repos == built.repos == rebuilt.repos
+    assert stats.snapshot()["cache"]["hook_catalog"] == {"hits": 1, "misses": 2}
@@ -0,0 +1,130 @@
+# Core Library modules
+import asyncio
+import time
+from typing import Any
+
+# Third party modules
+import pytest
+import requests
+
+# First party modules
+from piptools_sync import fakeserver, piptools_sync
+
+
+def _response(status: int, headers: dict, body: bytes = b"{}") -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers)
+    response._content = body
+    return response
+
+
+def test_get_latest_github_repo_version_waits_for_reset(monkeypatch: Any) -> None:
+    server = fakeserver.start_server(repos=8, rate_limit=3, rate_window=1)
+    base_url = fakeserver.server_url(server)
+    monkeypatch.setattr(piptools_sync, "GITHUB_API_URL", base_url)
+    monkeypatch.setattr(piptools_sync, "GITHUB_RESERVE", 0)
+    monkeypatch.setattr(piptools_sync, "GITHUB_RESET_SKEW", 0.05)
+    repo_urls = [f"https://github.com/fake-owner/project-{i}" for i in range(8)]
+    try:
+        versions = piptools_sync.get_latest_github_versions(repo_urls, workers=4)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert versions == dict.fromkeys(repo_urls, "v1.0.0")
+    cached = piptools_sync.get_latest_github_versions(repo_urls[:2])
+    assert cached == dict.fromkeys(repo_urls[:2], "v1.0.0")
+
+
+def test_get_latest_github_repo_version_errors(monkeypatch: Any) -> None:
+    responses = {
+        "https://api.example/repos/o/missing/releases/latest": _response(404, {}),
+        "https://api.example/repos/o/broken/releases/latest": _response(500, {}),
+        "https://api.example/repos/o/tagged/releases/latest": _response(
+            200, {}, b'{"name": "", "tag_name": "v2.0"}'
+        ),
+    }
+    sent_headers = []
+
+    class MockSession:
+        def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+            sent_headers.append(kwargs["headers"])
+            return responses[url]
+
+    monkeypatch.setattr(piptools_sync, "get_session", MockSession)
+    monkeypatch.setattr(piptools_sync, "GITHUB_API_URL", "https://api.example")
+    monkeypatch.setattr(piptools_sync, "GITHUB_TOKENS", ["secret"])
+    get_version = piptools_sync.get_latest_github_repo_version
+    assert get_version("https://github.com/o/missing") == 0
+    assert get_version("https://github.com/o/tagged") == "v2.0"
+    with pytest.raises(requests.HTTPError):
+        get_version("https://github.com/o/broken")
+    assert sent_headers[0]["Authorization"] == "Bearer secret"
+
+
+def test_get_latest_github_repo_version_rate_limited(monkeypatch: Any) -> None:
+    class MockSession:
+        def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+            return _response(429, {"Retry-After": "0"})
+
+    monkeypatch.setattr(piptools_sync, "get_session", MockSession)
+    monkeypatch.setattr(piptools_sync, "GITHUB_ATTEMPTS", 2)
+    with pytest.raises(requests.HTTPError, match="after 2 attempts"):
+        piptools_sync.get_latest_github_repo_version("https://github.com/o/limited")
+
+
+def test_github_scheduler_budgets() -> None:
+    scheduler = piptools_sync.GitHubScheduler(["one", "two"], reserve=0)
+    reset = str(int(time.time()) + 3600)
+    token = scheduler.acquire()
+    scheduler.release(
+        token,
+        _response(
+            200,
+            {
+                "X-RateLimit-Limit": "5000",
+                "X-RateLimit-Remaining": "10",
+                "X-RateLimit-Reset": reset,
+            },
+        ),
+    )
+    other = scheduler.acquire()
+    assert other != token
+    start = time.monotonic()
+    retry = scheduler.release(other, _response(429, {"Retry-After": "0.3"}))
+    assert retry is True
+    scheduler.budgets[token]["remaining"] = 0
+    scheduler.acquire()
+    assert time.monotonic() - start >= 0.25
+
+
+def test_get_latest_github_repo_version_token_hosts(monkeypatch: Any) -> None:
+    sent = []
+
+    class MockSession:
+        def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+            sent.append((url, kwargs["headers"]))
+            return _response(200, {}, b'{"name": "v1.0"}')
+
+    monkeypatch.setattr(piptools_sync, "get_session", MockSession)
+    monkeypatch.setattr(piptools_sync, "GITHUB_TOKENS", ["secret"])
+    get_version = piptools_sync.get_latest_github_repo_version
+    assert get_version("https://gitlab.com/pycqa/flake8") == 0
+    assert get_version("https://github.com/pycqa/flake8/extra") == 0
+    get_version_async = piptools_sync.get_latest_github_repo_version_async
+    assert asyncio.run(get_version_async(None, "https://gitlab.com/o/n")) == 0
+    assert sent == []
+
+    assert get_version("https://github.com/PyCQA/flake8.git") == "v1.0"
+    piptools_sync._github_request("GET", "https://gitlab.com/api/v4/projects")
+    piptools_sync._github_request("GET", "http://api.github.com/repos/o/n")
+    assert [url for url, _ in sent] == [
+        "https://api.github.com/repos/PyCQA/flake8/releases/latest",
+        "https://gitlab.com/api/v4/projects",
+        "http://api.github.com/repos/o/n",
+    ]
+    assert [headers.get("Authorization") for _, headers in sent] == [
+        "Bearer secret",
+        None,
+        None,
+    ]
@@ -0,0 +1,102 @@
+# Core Library modules
+import json
+from typing import Any, Iterator
+
+# Third party modules
+import pytest
+import requests
+
+# First party modules
+from piptools_sync import piptools_sync
+
+TEST_DIR = pytest.TEST_DIR
+
+
+class MockResponse:
+    def __init__(self, status_code: int, content: bytes, headers: Any = None) -> None:
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.read = 0
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]:
+        while self.read < len(self.content):
+            chunk = self.content[self.read : self.read + chunk_size]
+            self.read += len(chunk)
+            yield chunk
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error", response=self)
+
+    def close(self) -> None:
+        pass
+
+
+def mock_http_get(monkeypatch: pytest, response: MockResponse) -> list:
+    calls = []
+
+    def mock_get(url: str, **kwargs: Any) -> MockResponse:
+        calls.append((url, kwargs))
+        return response
+
+    monkeypatch.setattr(piptools_sync, "_http_get", mock_get)
+    return calls
+
+
+def test_get_latest_pypi_repo_version_stream(monkeypatch: pytest) -> None:
+    document = {
+        "info": {
+            "description": 'use "version": "0.0.1" in your config',
+            "python_version": None,
+            "version": "23.1.0",
+        },
+        "releases": {str(i): [{"python_version": "py3"}] for i in range(5000)},
+    }
+    response = MockResponse(200, json.dumps(document).encode("utf-8"))
+    calls = mock_http_get(monkeypatch, response)
+    monkeypatch.setattr(piptools_sync, "PYPI_FETCH_MODE", "stream")
+
+    assert piptools_sync.get_latest_pypi_repo_version("black") == "23.1.0"
+    assert calls[0][0] == "https://pypi.org/pypi/black/json"
+    assert response.read < len(response.content) / 10
+
+    response = MockResponse(404, b'{"message": "Not Found"}')
+    mock_http_get(monkeypatch, response)
+    assert piptools_sync.get_latest_pypi_repo_version("nothere") == 0
+
+
+def test_get_latest_pypi_repo_version_simple(monkeypatch: pytest) -> None:
+    document = {
+        "meta": {"api-version": "1.1"},
+        "name": "black",
+        "versions": ["22.12.0", "23.1.0", "23.2.0", "23.10.0", "24.1a1"],
+        "files": [
+            {"filename": "black-22.12.0.tar.gz", "yanked": False},
+            {"filename": "black-23.1.0-py3-none-any.whl", "yanked": False},
+            {"filename": "black-23.2.0.tar.gz", "yanked": False},
+            {"filename": "black-23.10.0.tar.gz", "yanked": "broken"},
+            {"filename": "black-24.1a1.tar.gz", "yanked": False},
+        ],
+    }
+    calls = mock_http_get(monkeypatch, MockResponse(200, json.dumps(document).encode()))
+    monkeypatch.setattr(piptools_sync, "PYPI_FETCH_MODE", "simple")
+    monkeypatch.setattr(piptools_sync, "PYPI_INDEX_URL", "https://devpi.local/root")
+
+    assert piptools_sync.get_latest_pypi_repo_version("Black") == "23.2.0"
+    assert calls[0][0] == "https://devpi.local/root/simple/black/"
+    assert calls[0][1]["headers"]["Accept"] == "application/vnd.pypi.simple.v1+json"
+
+
+@pytest.mark.parametrize("mode", ["json", "simple", "stream"])
+def test_get_latest_pypi_repo_version_status(monkeypatch: pytest, mode: str) -> None:
+    monkeypatch.setattr(piptools_sync, "PYPI_FETCH_MODE", mode)
+    mock_http_get(monkeypatch, MockResponse(404, b'{"message": "Not Found"}'))
+    assert piptools_sync.get_latest_pypi_repo_version("nothere") == 0
+
+    mock_http_get(monkeypatch, MockResponse(503, b"<html>Service Unavailable</html>"))
+    with pytest.raises(SystemExit, match="503"):
+        piptools_sync.get_latest_pypi_repo_version("black")
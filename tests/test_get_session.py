@@ -0,0 +1,36 @@
+# Core Library modules
+from typing import Any
+
+# Third party modules
+import pytest
+import requests
+
+# First party modules
+from piptools_sync import piptools_sync
+
+TEST_DIR = pytest.TEST_DIR
+
+
+def test_get_session() -> None:
+    session = piptools_sync.get_session()
+    assert session is piptools_sync.get_session()
+    adapter = session.get_adapter("https://pypi.org/pypi/black/json")
+    assert adapter._pool_maxsize == piptools_sync.MAX_WORKERS
+    assert adapter.max_retries.total == piptools_sync.HTTP_RETRIES
+    assert 503 in adapter.max_retries.status_forcelist
+
+
+def test_http_get_uses_session_timeout(monkeypatch: pytest) -> None:
+    calls = []
+
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b"{}"
+
+    def mock_get(url: str, **kwargs: Any) -> requests.Response:
+        calls.append((url, kwargs))
+        return response
+
+    monkeypatch.setattr(piptools_sync.get_session(), "get", mock_get)
+    assert piptools_sync._http_get("https://pypi.org") is response
+    assert calls == [("https://pypi.org", {"timeout": piptools_sync.HTTP_TIMEOUT})]
@@ -0,0 +1,59 @@
+# Core Library modules
+import os
+import subprocess  # nosec
+import sys
+from typing import Any
+
+# Third party modules
+import pytest
+
+TEST_DIR = pytest.TEST_DIR
+SRC_DIR = TEST_DIR.parent / "src"
+LAZY_MODULES = {
+    "aiohttp",
+    "argparse",
+    "asyncio",
+    "cProfile",
+    "git",
+    "importlib.metadata",
+    "logging.config",
+    "requests",
+    "tqdm",
+    "urllib3",
+    "yaml",
+}
+if sys.version_info >= (3, 11):
+    LAZY_MODULES.add("toml")
+IMPORT_BUDGET_US = 500_000
+
+
+def import_times(tmp_path: Any) -> dict:
+    env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+    result = subprocess.run(  # nosec
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "import piptools_sync.piptools_sync",
+        ],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_time(tmp_path: Any) -> None:
+    times = import_times(tmp_path)
+    assert LAZY_MODULES.isdisjoint(times)
+    assert times["piptools_sync.piptools_sync"] < IMPORT_BUDGET_US
+    assert not (tmp_path / "piptools_sync.log").exists()
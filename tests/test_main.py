@@ -0,0 +1,135 @@
+# Core Library modules
+import json
+import pstats
+import shutil
+from typing import Any
+
+# Third party modules
+import pytest
+
+# First party modules
+from piptools_sync import fakeserver, piptools_sync
+
+TEST_DIR = pytest.TEST_DIR
+
+
+def test_main_timings(monkeypatch: Any, tmp_path: Any) -> None:
+    config_file = tmp_path / ".pre-commit-config.yaml"
+    req_file = tmp_path / "dev.txt"
+    shutil.copy(TEST_DIR / "test.yaml", config_file)
+    shutil.copy(TEST_DIR / "reqs" / "dev.txt", req_file)
+    monkeypatch.setattr(piptools_sync, "find_yaml_config_file", lambda: config_file)
+    monkeypatch.setattr(piptools_sync, "find_requirements_chain", lambda: [req_file])
+    server = fakeserver.start_server(repos=5)
+    monkeypatch.setattr(piptools_sync, "PYPI_INDEX_URL", fakeserver.server_url(server))
+    monkeypatch.setattr(piptools_sync, "METRICS_FORMAT", "jsonl")
+    monkeypatch.setattr(piptools_sync, "METRICS_PATH", tmp_path / "runs.jsonl")
+    timings = tmp_path / "timings.json"
+    profile = tmp_path / "run.prof"
+    try:
+        piptools_sync.main(
+            ["--timings", str(timings), "--profile", str(profile), "a.py"]
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    report = json.loads(timings.read_text())
+    for name in ("config_discovery", "yaml_parse", "mapping", "requirements_parse"):
+        assert report["phases"][name]["calls"] == 1
+        assert report["phases"][name]["wall"] > 0
+        assert report["phases"][name]["cpu"] >= 0
+    host = fakeserver.server_url(server).split("//")[1]
+    assert report["http"]["hosts"][host]["requests"] == report["http"]["requests"]
+    assert report["http"]["requests"] > 0
+    assert report["cache"]["run_result"] == {"hits": 0, "misses": 1}
+    assert report["cache"]["mapping"]["misses"] == report["http"]["requests"]
+    assert report["duration"] > 0
+    assert pstats.Stats(str(profile)).total_calls > 0
+    (run,) = (tmp_path / "runs.jsonl").read_text().splitlines()
+    assert json.loads(run)["exit_code"] == 0
+    assert json.loads(run)["histograms"]["pypi"]["count"] == 2
+
+
+def test_main_lookup_timeout(monkeypatch: Any, tmp_path: Any) -> None:
+    config_file = tmp_path / ".pre-commit-config.yaml"
+    req_file = tmp_path / "dev.txt"
+    shutil.copy(TEST_DIR / "test.yaml", config_file)
+    shutil.copy(TEST_DIR / "reqs" / "dev.txt", req_file)
+    monkeypatch.setattr(piptools_sync, "find_yaml_config_file", lambda: config_file)
+    monkeypatch.setattr(piptools_sync, "find_requirements_chain", lambda: [req_file])
+    server = fakeserver.start_server(repos=5, latency=1.0)
+    monkeypatch.setattr(piptools_sync, "PYPI_INDEX_URL", fakeserver.server_url(server))
+    monkeypatch.setattr(piptools_sync, "HTTP_TIMEOUT", 0.05)
+    monkeypatch.setattr(piptools_sync, "HTTP_RETRIES", 0)
+    monkeypatch.setattr(piptools_sync, "METRICS_FORMAT", "jsonl")
+    monkeypatch.setattr(piptools_sync, "METRICS_PATH", tmp_path / "runs.jsonl")
+    try:
+        assert piptools_sync.main([]) == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+    (run,) = (tmp_path / "runs.jsonl").read_text().splitlines()
+    assert json.loads(run)["exit_code"] == 1
+
+
+@pytest.mark.parametrize(
+    "argv, default, expected",
+    [
+        ([], True, "lazy"),
+        ([], False, "eager"),
+        (["--eager"], True, "eager"),
+        (["--lazy"], False, "lazy"),
+    ],
+)
+def test_main_resolution(
+    monkeypatch: Any, tmp_path: Any, argv: list, default: bool, expected: str
+) -> None:
+    config_file = tmp_path / ".pre-commit-config.yaml"
+    req_file = tmp_path / "dev.txt"
+    shutil.copy(TEST_DIR / "test.yaml", config_file)
+    shutil.copy(TEST_DIR / "reqs" / "dev.txt", req_file)
+    monkeypatch.setattr(piptools_sync, "find_yaml_config_file", lambda: config_file)
+    monkeypatch.setattr(piptools_sync, "find_requirements_chain", lambda: [req_file])
+    monkeypatch.setattr(piptools_sync, "LAZY_RESOLUTION", default)
+    calls = []
+
+    async def resolve_repos_async(repos: list) -> dict:
+        calls.append("lazy")
+        return {}
+
+    async def generate_db_async(force: int = 0) -> dict:
+        calls.append("eager")
+        return {}
+
+    monkeypatch.setattr(piptools_sync, "resolve_repos_async", resolve_repos_async)
+    monkeypatch.setattr(piptools_sync, "generate_db_async", generate_db_async)
+    assert piptools_sync.main(argv) == 0
+    assert calls == [expected]
+
+
+def test_main_resolution_environment(monkeypatch: Any) -> None:
+    assert piptools_sync._flag("RESOLUTION", "LAZY_RESOLUTION") is True
+    monkeypatch.setenv("PIPTOOLS_SYNC_LAZY_RESOLUTION", "false")
+    assert piptools_sync._flag("RESOLUTION", "LAZY_RESOLUTION") is False
+    monkeypatch.setenv("PIPTOOLS_SYNC_LAZY_RESOLUTION", "Yes")
+    assert piptools_sync._flag("RESOLUTION", "LAZY_RESOLUTION") is True
+
+
+def test_main_requirements_env(monkeypatch: Any, tmp_path: Any) -> None:
+    config_file = tmp_path / ".pre-commit-config.yaml"
+    shutil.copy(TEST_DIR / "test.yaml", config_file)
+    monkeypatch.setattr(piptools_sync, "find_yaml_config_file", lambda: config_file)
+    monkeypatch.setattr(piptools_sync, "ROOT_DIR", TEST_DIR)
+    monkeypatch.setattr(piptools_sync, "REQUIREMENTS_GLOBS", ["reqs_matrix/*.txt"])
+    monkeypatch.setattr(piptools_sync, "REQUIREMENTS_ENV", "test")
+
+    async def resolve_repos_async(repos: list) -> dict:
+        return {"https://github.com/psf/black": "black"}
+
+    monkeypatch.setattr(piptools_sync, "resolve_repos_async", resolve_repos_async)
+    assert piptools_sync.main([]) == 1
+    assert "rev: 22.12.0" in config_file.read_text()
+    assert piptools_sync.main(["--requirements-env", "development"]) == 1
+    assert "rev: 23.1.0" in config_file.read_text()
+    assert piptools_sync.main(["--requirements-env", "development"]) == 0
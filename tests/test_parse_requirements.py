@@ -0,0 +1,58 @@
+# Core Library modules
+import time
+from typing import Any
+
+# Third party modules
+import pytest
+
+# First party modules
+from piptools_sync import piptools_sync
+
+TEST_DIR = pytest.TEST_DIR
+HASH = "--hash=sha256:" + "0" * 64
+PARSE_BUDGET_SECONDS = 1.0
+
+
+def test_parse_requirements(tmp_path: Any) -> None:
+    req_file = tmp_path / "requirements.txt"
+    req_file.write_text(
+        "# header comment\n"
+        "-r base.txt\n"
+        "--index-url https://pypi.org/simple\n"
+        "Flake8_Bugbear==23.1.20 \\\n"
+        f"    {HASH} \\\n"
+        f"    {HASH}\n"
+        "    # via -r development.in\n"
+        "uvicorn[standard]==0.20.0  # inline comment\n"
+        'tomli==2.0.1 ; python_version < "3.11"\n'
+        "ruamel.yaml===0.17.21\n"
+        "pip>=22.0\n"
+    )
+    assert piptools_sync.parse_requirements(req_file) == {
+        "flake8-bugbear": "23.1.20",
+        "uvicorn": "0.20.0",
+        "tomli": "2.0.1",
+        "ruamel-yaml": "0.17.21",
+    }
+    assert piptools_sync.get_requirement_versions(
+        req_file, ["flake8_bugbear", "uvicorn", "black"]
+    ) == {"flake8_bugbear": "23.1.20", "uvicorn": "0.20.0"}
+
+
+def test_parse_requirements_hashed_20k_lines(tmp_path: Any) -> None:
+    req_file = tmp_path / "requirements.txt"
+    lines = []
+    for i in range(4000):
+        lines.append(f"package-{i}==1.{i}.0 \\")
+        lines.extend([f"    {HASH} \\", f"    {HASH}"])
+        lines.extend(["    # via", f"    #   parent-{i}"])
+    req_file.write_text("\n".join(lines) + "\n")
+    assert len(lines) == 20000
+
+    start = time.perf_counter()
+    versions = piptools_sync.parse_requirements(req_file)
+    elapsed = time.perf_counter() - start
+
+    assert len(versions) == 4000
+    assert versions["package-3999"] == "1.3999.0"
+    assert elapsed < PARSE_BUDGET_SECONDS
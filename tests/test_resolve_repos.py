@@ -0,0 +1,78 @@
+# Core Library modules
+from typing import Any
+
+# Third party modules
+import pytest
+
+# First party modules
+from piptools_sync import piptools_sync
+from piptools_sync.catalog import HookCatalog
+
+TEST_DIR = pytest.TEST_DIR
+
+
+def test_resolve_repos(monkeypatch: pytest, tmp_path: Any) -> None:
+    probed = []
+
+    def mock_get_precommitrepos() -> list[list]:
+        raise AssertionError("catalog must not be downloaded")
+
+    def mock_get_latestpypirepoversion(name: str) -> Any:
+        probed.append(name)
+        return 0 if name == "mirrors-prettier" else "1.0.0"
+
+    monkeypatch.setattr(piptools_sync, "get_precommit_repos", mock_get_precommitrepos)
+    monkeypatch.setattr(
+        piptools_sync, "get_latest_pypi_repo_version", mock_get_latestpypirepoversion
+    )
+    mapping = tmp_path / "mapping.json"
+    mapping.write_text('{"https://github.com/psf/black": "black"}')
+    monkeypatch.setattr(piptools_sync, "MAPPING_FILE", mapping)
+
+    result = piptools_sync.resolve_repos(
+        [
+            "https://github.com/psf/black",
+            "https://github.com/PyCQA/flake8",
+            "https://github.com/pre-commit/mirrors-prettier",
+            "https://github.com/pre-commit/mirrors-mypy",
+        ]
+    )
+    assert sorted(probed) == ["flake8", "mirrors-prettier"]
+    assert result == {
+        "https://github.com/psf/black": "black",
+        "https://github.com/pycqa/flake8": "flake8",
+        "https://github.com/pre-commit/mirrors-prettier": "",
+        "https://github.com/pre-commit/mirrors-mypy": "mypy",
+    }
+    stored = piptools_sync._load_mapping()
+    assert stored["https://github.com/pre-commit/mirrors-mypy"]["source"] == "manual"
+    assert len(stored) == 4
+
+
+def test_resolve_repos_saved_catalog(monkeypatch: pytest, isolated_cache: Any) -> None:
+    catalog = {
+        "https://github.com/PSF/black.git": [{"id": "black", "language": "python"}],
+    }
+    HookCatalog.from_catalog(catalog).dump(
+        isolated_cache / piptools_sync.HOOK_CATALOG_FILE
+    )
+    probed = []
+
+    def mock_get_latestpypirepoversion(name: str) -> Any:
+        probed.append(name)
+        return "1.0.0"
+
+    monkeypatch.setattr(
+        piptools_sync, "get_latest_pypi_repo_version", mock_get_latestpypirepoversion
+    )
+    first = piptools_sync.resolve_repos(["https://github.com/psf/black"])
+    second = piptools_sync.resolve_repos(
+        ["https://github.com/psf/black.git", "https://github.com/PSF/Black/"]
+    )
+    assert first == {"https://github.com/psf/black": "black"}
+    assert second == {
+        "https://github.com/psf/black.git": "black",
+        "https://github.com/psf/black/": "black",
+    }
+    assert probed == ["black"]
+    assert list(piptools_sync._load_mapping()) == ["https://github.com/psf/black.git"]
@@ -0,0 +1,81 @@
+# Core Library modules
+import shutil
+from typing import Any
+
+# Third party modules
+import pytest
+
+# First party modules
+from piptools_sync import piptools_sync
+
+TEST_DIR = pytest.TEST_DIR
+
+
+@pytest.fixture
+def run_inputs(monkeypatch: pytest, tmp_path: Any) -> tuple:
+    config_file = tmp_path / ".pre-commit-config.yaml"
+    req_file = tmp_path / "dev.txt"
+    shutil.copy(TEST_DIR / "test.yaml", config_file)
+    shutil.copy(TEST_DIR / "reqs" / "dev.txt", req_file)
+    monkeypatch.setattr(piptools_sync, "MAPPING_FILE", tmp_path / "mapping.json")
+    monkeypatch.setattr(piptools_sync, "RESULT_CACHE_FILE", tmp_path / "runs.json")
+    return config_file, req_file
+
+
+def test_run_cache_key(run_inputs: tuple) -> None:
+    config_file, req_file = run_inputs
+    key = piptools_sync._run_cache_key([config_file, req_file])
+    assert key == piptools_sync._run_cache_key([config_file, req_file])
+
+    req_file.write_text(req_file.read_text().replace("8.1.3", "8.1.4"))
+    assert key != piptools_sync._run_cache_key([config_file, req_file])
+
+
+def test_main_short_circuit(monkeypatch: pytest, run_inputs: tuple) -> None:
+    config_file, req_file = run_inputs
+    monkeypatch.setattr(piptools_sync, "find_yaml_config_file", lambda: config_file)
+    monkeypatch.setattr(piptools_sync, "find_requirements_chain", lambda: [req_file])
+
+    async def mock_resolve_repos_async(repos: list) -> dict:
+        return {}
+
+    monkeypatch.setattr(piptools_sync, "resolve_repos_async", mock_resolve_repos_async)
+
+    assert piptools_sync._last_successful_run() is None
+    assert piptools_sync.main([]) == 0
+    assert piptools_sync._last_successful_run() is not None
+
+    def mock_yaml_to_dict(yaml_file: Any) -> dict:
+        raise AssertionError("unchanged inputs must not be parsed")
+
+    monkeypatch.setattr(piptools_sync, "yaml_to_dict", mock_yaml_to_dict)
+    assert piptools_sync.main([]) == 0
+
+
+@pytest.mark.parametrize(
+    "name, value",
+    [
+        ("REQUIREMENTS_ENV", "py311"),
+        ("UPDATE_PC_YAML_FILE", False),
+        ("PYPI_FETCH_MODE", "simple"),
+        ("GITHUB_FETCH_MODE", "graphql"),
+        ("PYPI_INDEX_URL", "https://mirror.example.com"),
+        ("LAZY_RESOLUTION", False),
+    ],
+)
+def test_run_cache_key_settings(
+    monkeypatch: pytest, run_inputs: tuple, name: str, value: Any
+) -> None:
+    key = piptools_sync._run_cache_key(list(run_inputs))
+    monkeypatch.setattr(piptools_sync, name, value)
+    assert key != piptools_sync._run_cache_key(list(run_inputs))
+
+
+def test_run_cache_key_overrides(monkeypatch: pytest, run_inputs: tuple) -> None:
+    monkeypatch.setattr(piptools_sync, "LAZY_RESOLUTION", True)
+    monkeypatch.setattr(piptools_sync, "REQUIREMENTS_ENV", None)
+    key = piptools_sync._run_cache_key(list(run_inputs))
+    settings = {"LAZY_RESOLUTION": True, "REQUIREMENTS_ENV": None}
+    assert key == piptools_sync._run_cache_key(list(run_inputs), settings)
+    settings["LAZY_RESOLUTION"] = False
+    assert key != piptools_sync._run_cache_key(list(run_inputs), settings)
@@ -0,0 +1,74 @@
+# Core Library modules
+from typing import Any, Iterator
+
+# Third party modules
+import pytest
+import requests
+
+# First party modules
+from piptools_sync import fakeserver, piptools_sync
+
+
+@pytest.fixture
+def fake_server(monkeypatch: Any) -> Iterator[Any]:
+    server = fakeserver.start_server(repos=20, releases=5, miss_every=4)
+    base_url = fakeserver.server_url(server)
+    monkeypatch.setattr(
+        piptools_sync, "PRECOMMIT_REPOS_URL", f"{base_url}/all-hooks.json"
+    )
+    monkeypatch.setattr(piptools_sync, "PYPI_INDEX_URL", base_url)
+    monkeypatch.setattr(piptools_sync, "GITHUB_API_URL", base_url)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("fetch_mode", ["stream", "json", "simple"])
+def test_start_server_generate_db(
+    monkeypatch: Any, fake_server: Any, fetch_mode: str
+) -> None:
+    monkeypatch.setattr(piptools_sync, "PYPI_FETCH_MODE", fetch_mode)
+    result = piptools_sync.generate_db(force=1, workers=4)
+    assert len(result) == 20
+    assert result["https://github.com/fake-owner/project-0"] == ""
+    assert result["https://github.com/fake-owner/project-1"] == "project-1"
+    assert sum(bool(project) for project in result.values()) == 15
+
+
+def test_start_server_github(fake_server: Any) -> None:
+    version = piptools_sync.get_latest_github_repo_version(
+        "https://github.com/fake-owner/project-1"
+    )
+    assert version == "v1.0.0"
+
+
+def test_start_server_catalog_not_modified(fake_server: Any) -> None:
+    first = piptools_sync.get_precommit_repos()
+    second = piptools_sync.get_precommit_repos()
+    assert first == second
+    assert first[0] == ["https://github.com/fake-owner/project-0", "project-0"]
+
+
+def test_start_server_github_graphql(monkeypatch: Any, fake_server: Any) -> None:
+    base_url = fakeserver.server_url(fake_server)
+    monkeypatch.setattr(piptools_sync, "GITHUB_GRAPHQL_URL", f"{base_url}/graphql")
+    monkeypatch.setattr(piptools_sync, "GITHUB_FETCH_MODE", "graphql")
+    monkeypatch.setattr(piptools_sync, "GITHUB_BATCH_SIZE", 3)
+    monkeypatch.setattr(piptools_sync, "GITHUB_TOKENS", ["secret"])
+    repo_urls = [f"https://github.com/fake-owner/project-{i}" for i in range(5)]
+    repo_urls += [
+        "https://github.com/fake-owner/project-99",
+        "https://gitlab.com/fake-owner/project-1",
+    ]
+    versions = piptools_sync.get_latest_github_versions(repo_urls, workers=2)
+    assert versions == {
+        **dict.fromkeys(repo_urls[:5], "v1.0.0"),
+        "https://github.com/fake-owner/project-99": 0,
+        "https://gitlab.com/fake-owner/project-1": 0,
+    }
+    assert fake_server.rate_state["used"] == 2
+
+    monkeypatch.setattr(piptools_sync, "GITHUB_TOKENS", [])
+    piptools_sync.get_github_scheduler.cache_clear()
+    with pytest.raises(requests.HTTPError, match="401"):
+        piptools_sync._graphql_latest_versions(repo_urls[:1])
@@ -0,0 +1,121 @@
+# Core Library modules
+import shutil
+from typing import Any
+
+# Third party modules
+import pytest
+
+# First party modules
+from piptools_sync import piptools_sync
+
+TEST_DIR = pytest.TEST_DIR
+
+
+def test_update_yaml_batch(tmp_path: Any) -> None:
+    dst_file = tmp_path / "dst.yaml"
+    shutil.copy(TEST_DIR / "test.yaml", dst_file)
+
+    piptools_sync.update_yaml_batch(
+        dst_file,
+        {
+            "https://github.com/psf/black": "23.0.0",
+            "https://github.com/commitizen-tools/commitizen": "v3.0.0",
+        },
+    )
+
+    result = piptools_sync.yaml_to_dict(dst_file)
+    assert result == {
+        "https://github.com/commitizen-tools/commitizen": "3.0.0",
+        "https://github.com/psf/black": "23.0.0",
+    }
+    assert list(tmp_path.iterdir()) == [dst_file]
+
+
+def test_update_yaml_batch_unknown_repo(tmp_path: Any) -> None:
+    dst_file = tmp_path / "dst.yaml"
+    shutil.copy(TEST_DIR / "test.yaml", dst_file)
+    original = dst_file.read_text()
+
+    with pytest.raises(NameError):
+        piptools_sync.update_yaml_batch(
+            dst_file, {"https://github.com/psf/black": "23.0.0", "nothere": "1.0"}
+        )
+    assert dst_file.read_text() == original
+
+
+def test_update_yaml_batch_preserves_formatting(tmp_path: Any) -> None:
+    dst_file = tmp_path / "dst.yaml"
+    dst_file.write_text(
+        "# pre-commit config\n"
+        "repos:\n"
+        "  - repo: local  # local hooks\n"
+        "    hooks: [{id: x, name: x, entry: x, language: system}]\n"
+        "  - repo: https://github.com/psf/black\n"
+        "    rev: 22.6.0   # pinned\n"
+        "    hooks:\n"
+        "      - id: black\n"
+        "  - repo: https://github.com/PyCQA/flake8\n"
+        '    rev: "5.0.4"\n'
+        "    hooks:\n"
+        "      - id: flake8\n"
+    )
+
+    piptools_sync.update_yaml_batch(
+        dst_file,
+        {
+            "https://github.com/pycqa/flake8": "4.0.1",
+            "https://github.com/psf/black": "23.1",
+        },
+    )
+
+    assert dst_file.read_text() == (
+        "# pre-commit config\n"
+        "repos:\n"
+        "  - repo: local  # local hooks\n"
+        "    hooks: [{id: x, name: x, entry: x, language: system}]\n"
+        "  - repo: https://github.com/psf/black\n"
+        "    rev: '23.1'   # pinned\n"
+        "    hooks:\n"
+        "      - id: black\n"
+        "  - repo: https://github.com/PyCQA/flake8\n"
+        '    rev: "4.0.1"\n'
+        "    hooks:\n"
+        "      - id: flake8\n"
+    )
+
+
+def test_update_yaml_batch_overlapping_urls(tmp_path: Any) -> None:
+    dst_file = tmp_path / "dst.yaml"
+    dst_file.write_text(
+        "repos:\n"
+        "  - repo: https://github.com/psf/black-pre-commit-mirror\n"
+        "    rev: 22.6.0\n"
+        "    hooks:\n"
+        "      - id: black\n"
+        "  - repo: https://github.com/psf/black\n"
+        "    rev: 22.6.0\n"
+        "    hooks:\n"
+        "      - id: black\n"
+    )
+
+    piptools_sync.update_yaml_batch(
+        dst_file,
+        {
+            "https://github.com/psf/black-pre-commit-mirror": "23.1",
+            "https://github.com/psf/black": "23.3.0",
+            "https://github.com/PSF/black.git": "23.3.0",
+        },
+    )
+
+    assert piptools_sync.yaml_to_dict(dst_file) == {
+        "https://github.com/psf/black-pre-commit-mirror": "23.1",
+        "https://github.com/psf/black": "23.3.0",
+    }
+    with pytest.raises(ValueError):
+        piptools_sync.update_yaml_batch(
+            dst_file,
+            {
+                "https://github.com/psf/black": "23.3.0",
+                "https://github.com/psf/black/": "23.4.0",
+            },
+        )
@@ -0,0 +1,98 @@
+# Core Library modules
+import json
+import threading
+from typing import Any
+
+# Third party modules
+import pytest
+
+# First party modules
+from piptools_sync import metrics, stats
+
+
+@pytest.fixture
+def run_stats() -> None:
+    stats.reset_stats()
+    stats.record_request("https://pypi.org/pypi/black/json", 200, 0.2)
+    stats.record_request("https://pypi.org/pypi/nope/json", 404, 0.1)
+    stats.record_bytes("https://pypi.org/pypi/black/json", 1024)
+    stats.observe("pypi", 0.07)
+    stats.observe("pypi", 12.0)
+    stats.record_cache("mapping", hits=3, misses=1)
+    stats.increment("yaml_rewrites")
+
+
+def test_write_metrics_prometheus(run_stats: None, tmp_path: Any) -> None:
+    path = tmp_path / "textfile" / "piptools_sync.prom"
+    metrics.write_metrics("prometheus", path, 1)
+    lines = path.read_text().splitlines()
+    assert 'piptools_sync_http_requests_total{host="pypi.org",status="404"} 1' in lines
+    assert 'piptools_sync_http_response_bytes_total{host="pypi.org"} 1024' in lines
+    assert (
+        'piptools_sync_lookup_duration_seconds_bucket{lookup="pypi",le="0.05"} 0'
+        in lines
+    )
+    assert (
+        'piptools_sync_lookup_duration_seconds_bucket{lookup="pypi",le="0.1"} 1'
+        in lines
+    )
+    assert (
+        'piptools_sync_lookup_duration_seconds_bucket{lookup="pypi",le="+Inf"} 2'
+        in lines
+    )
+    assert 'piptools_sync_cache_hits_total{cache="mapping"} 3' in lines
+    assert "piptools_sync_yaml_rewrites_total 1" in lines
+    assert "piptools_sync_mapping_regenerations_total 0" in lines
+    assert "piptools_sync_run_exit_code 1" in lines
+    assert [file.name for file in path.parent.glob("*.tmp")] == []
+
+
+def test_write_metrics_prometheus_accumulates(run_stats: None, tmp_path: Any) -> None:
+    path = tmp_path / "piptools_sync.prom"
+    metrics.write_metrics("prometheus", path, 0)
+    stats.reset_stats()
+    stats.record_request("https://api.github.com/repos/o/r", 200, 0.3)
+    stats.observe("pypi", 0.2)
+    metrics.write_metrics("prometheus", path, 1)
+    lines = path.read_text().splitlines()
+    assert 'piptools_sync_http_requests_total{host="pypi.org",status="404"} 1' in lines
+    assert (
+        'piptools_sync_http_requests_total{host="api.github.com",status="200"} 1'
+        in lines
+    )
+    assert (
+        'piptools_sync_lookup_duration_seconds_bucket{lookup="pypi",le="+Inf"} 3'
+        in lines
+    )
+    assert 'piptools_sync_lookup_duration_seconds_sum{lookup="pypi"} 12.27' in lines
+    assert "piptools_sync_yaml_rewrites_total 1" in lines
+    assert "piptools_sync_run_exit_code 1" in lines
+    assert len(lines) == len(set(lines))
+
+
+def test_write_metrics_prometheus_concurrent(run_stats: None, tmp_path: Any) -> None:
+    path = tmp_path / "piptools_sync.prom"
+    writers = [
+        threading.Thread(target=metrics.write_metrics, args=("prometheus", path, 0))
+        for _ in range(8)
+    ]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+    assert "piptools_sync_yaml_rewrites_total 8" in path.read_text().splitlines()
+
+
+def test_write_metrics_labels() -> None:
+    assert metrics._labels(host='a"b\\c\nd') == '{host="a\\"b\\\\c\\nd"}'
+
+
+def test_write_metrics_jsonl(run_stats: None, tmp_path: Any) -> None:
+    path = tmp_path / "runs.jsonl"
+    metrics.write_metrics("jsonl", path, 0)
+    metrics.write_metrics("jsonl", path, 1)
+    runs = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [run["exit_code"] for run in runs] == [0, 1]
+    assert runs[0]["http"]["hosts"]["pypi.org"]["status"] == {"200": 1, "404": 1}
+    with pytest.raises(ValueError):
+        metrics.write_metrics("statsd", path, 0)